@@ -0,0 +1,34 @@
+"""Add keyset pagination indexes
+
+Revision ID: 8109a2f212eb
+Revises: 534f9202b700
+Create Date: 2026-10-18 09:12:41.318204
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8109a2f212eb"
+down_revision: str | Sequence[str] | None = "534f9202b700"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_movie_title_uuid", "movie", ["title", "uuid"], unique=False)
+    op.create_index("ix_movie_release_year_key_uuid", "movie", [sa.text("coalesce(release_year, 2147483647)"), "uuid"], unique=False)
+    op.create_index("ix_director_name_uuid", "director", ["name", "uuid"], unique=False)
+    op.create_index("ix_genre_name_uuid", "genre", ["name", "uuid"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_genre_name_uuid", table_name="genre")
+    op.drop_index("ix_director_name_uuid", table_name="director")
+    op.drop_index("ix_movie_release_year_key_uuid", table_name="movie")
+    op.drop_index("ix_movie_title_uuid", table_name="movie")
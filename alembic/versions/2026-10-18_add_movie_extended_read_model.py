@@ -0,0 +1,48 @@
+"""Add movie_extended read model
+
+Revision ID: 8c3e5f1a7b24
+Revises: 5d9a61c0f2b8
+Create Date: 2026-10-18 21:12:37.405118
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "8c3e5f1a7b24"
+down_revision: str | Sequence[str] | None = "5d9a61c0f2b8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "movie_extended",
+        sa.Column("movie_id", sa.UUID(), nullable=False),
+        sa.Column("director", sa.String(), nullable=True),
+        sa.Column("genres", postgresql.ARRAY(sa.String()), nullable=True),
+        sa.ForeignKeyConstraint(["movie_id"], ["movie.uuid"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("movie_id"),
+    )
+    # the same rows MovieCRUD.refresh_extended writes, for the movies already in the catalog
+    op.execute(
+        """
+        INSERT INTO movie_extended (movie_id, director, genres)
+        SELECT movie.uuid, director.name, (
+            SELECT array_agg(genre.name)
+            FROM genre JOIN moviegenreassociation ON moviegenreassociation.genre_id = genre.uuid
+            WHERE moviegenreassociation.movie_id = movie.uuid
+        )
+        FROM movie LEFT OUTER JOIN director ON director.uuid = movie.director_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("movie_extended")
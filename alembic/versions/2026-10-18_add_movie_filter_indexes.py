@@ -0,0 +1,31 @@
+"""Add movie filter indexes
+
+Revision ID: 5d9a61c0f2b8
+Revises: b7e4d2a9c513
+Create Date: 2026-10-18 19:26:53.840127
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d9a61c0f2b8"
+down_revision: str | Sequence[str] | None = "b7e4d2a9c513"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_movie_director_id_release_year", "movie", ["director_id", "release_year"], unique=False)
+    op.create_index("ix_movie_title_pattern", "movie", ["title"], unique=False, postgresql_ops={"title": "varchar_pattern_ops"})
+    op.create_index("ix_moviegenreassociation_genre_id_movie_id", "moviegenreassociation", ["genre_id", "movie_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_moviegenreassociation_genre_id_movie_id", table_name="moviegenreassociation")
+    op.drop_index("ix_movie_title_pattern", table_name="movie")
+    op.drop_index("ix_movie_director_id_release_year", table_name="movie")
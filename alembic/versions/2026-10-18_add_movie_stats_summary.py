@@ -0,0 +1,55 @@
+"""Add movie stats summary
+
+Revision ID: e41f9b6d2c07
+Revises: 8c3e5f1a7b24
+Create Date: 2026-10-18 22:03:51.618204
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e41f9b6d2c07"
+down_revision: str | Sequence[str] | None = "8c3e5f1a7b24"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "moviestats",
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("movie_count", sa.Integer(), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("kind", "key"),
+    )
+    op.create_index("ix_moviestats_kind_movie_count", "moviestats", ["kind", "movie_count"], unique=False)
+    # the first counts, StatsCRUD.refresh keeps them current afterwards
+    op.execute(
+        """
+        INSERT INTO moviestats (kind, key, name, movie_count)
+        SELECT 'genre', genre.uuid::text, genre.name, count(moviegenreassociation.movie_id)
+        FROM genre LEFT OUTER JOIN moviegenreassociation ON moviegenreassociation.genre_id = genre.uuid
+        GROUP BY genre.uuid
+        UNION ALL
+        SELECT 'director', director.uuid::text, director.name, count(movie.uuid)
+        FROM director LEFT OUTER JOIN movie ON movie.director_id = director.uuid
+        GROUP BY director.uuid
+        UNION ALL
+        SELECT 'decade', coalesce((release_year / 10 * 10)::text, ''), (release_year / 10 * 10)::text || 's', count(*)
+        FROM movie
+        GROUP BY release_year / 10 * 10
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_moviestats_kind_movie_count", table_name="moviestats")
+    op.drop_table("moviestats")
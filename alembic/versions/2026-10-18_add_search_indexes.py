@@ -0,0 +1,40 @@
+"""Add search indexes
+
+Revision ID: b7e4d2a9c513
+Revises: 3f2b7c91d4e6
+Create Date: 2026-10-18 16:41:09.207315
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e4d2a9c513"
+down_revision: str | Sequence[str] | None = "3f2b7c91d4e6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# table, searched column and text search configuration, titles are stemmed while names are matched as written
+SEARCHED_COLUMNS = (("director", "name", "simple"), ("genre", "name", "simple"), ("movie", "title", "english"))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, column, config in SEARCHED_COLUMNS:
+        op.add_column(table, sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(f"to_tsvector('{config}', {column})", persisted=True), nullable=True))
+        op.create_index(f"ix_{table}_search_vector", table, ["search_vector"], unique=False, postgresql_using="gin")
+        op.create_index(f"ix_{table}_{column}_trgm", table, [column], unique=False, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # pg_trgm stays installed, other objects of the database may use it
+    for table, column, _ in reversed(SEARCHED_COLUMNS):
+        op.drop_index(f"ix_{table}_{column}_trgm", table_name=table)
+        op.drop_index(f"ix_{table}_search_vector", table_name=table)
+        op.drop_column(table, "search_vector")
@@ -0,0 +1,34 @@
+"""Add updated_at columns
+
+Revision ID: 3f2b7c91d4e6
+Revises: 8109a2f212eb
+Create Date: 2026-10-18 14:03:27.584112
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f2b7c91d4e6"
+down_revision: str | Sequence[str] | None = "8109a2f212eb"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLES = ("director", "genre", "movie")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False))
+        op.create_index(op.f(f"ix_{table}_updated_at"), table, ["updated_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        op.drop_index(op.f(f"ix_{table}_updated_at"), table_name=table)
+        op.drop_column(table, "updated_at")
@@ -0,0 +1,51 @@
+"""Add version columns
+
+Revision ID: a6d3c8e15f92
+Revises: e41f9b6d2c07
+Create Date: 2026-10-18 23:41:09.274518
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a6d3c8e15f92"
+down_revision: str | Sequence[str] | None = "e41f9b6d2c07"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLES = ("director", "genre", "movie")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column("version", sa.Integer(), server_default=sa.text("1"), nullable=False))
+
+    # the keyset indexes carry the version, so the ETag of a page is computed from the index alone
+    op.drop_index("ix_movie_title_uuid", table_name="movie")
+    op.create_index("ix_movie_title_uuid", "movie", ["title", "uuid"], unique=False, postgresql_include=["version"])
+    op.drop_index("ix_movie_release_year_key_uuid", table_name="movie")
+    op.create_index("ix_movie_release_year_key_uuid", "movie", [sa.text("coalesce(release_year, 2147483647)"), "uuid"], unique=False, postgresql_include=["version", "release_year"])
+    op.drop_index("ix_director_name_uuid", table_name="director")
+    op.create_index("ix_director_name_uuid", "director", ["name", "uuid"], unique=False, postgresql_include=["version"])
+    op.drop_index("ix_genre_name_uuid", table_name="genre")
+    op.create_index("ix_genre_name_uuid", "genre", ["name", "uuid"], unique=False, postgresql_include=["version"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_genre_name_uuid", table_name="genre")
+    op.create_index("ix_genre_name_uuid", "genre", ["name", "uuid"], unique=False)
+    op.drop_index("ix_director_name_uuid", table_name="director")
+    op.create_index("ix_director_name_uuid", "director", ["name", "uuid"], unique=False)
+    op.drop_index("ix_movie_release_year_key_uuid", table_name="movie")
+    op.create_index("ix_movie_release_year_key_uuid", "movie", [sa.text("coalesce(release_year, 2147483647)"), "uuid"], unique=False)
+    op.drop_index("ix_movie_title_uuid", table_name="movie")
+    op.create_index("ix_movie_title_uuid", "movie", ["title", "uuid"], unique=False)
+
+    for table in reversed(TABLES):
+        op.drop_column(table, "version")
@@ -4,47 +4,114 @@ import strawberry
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from strawberry import field
-from strawberry.dataloader import DataLoader
+from strawberry.dataloader import DataLoader, DefaultCache
 from strawberry.fastapi import BaseContext, GraphQLRouter
 
 from app.auth.security import get_current_user
+from app.cache.loader_cache import LoaderCache
+from app.cache.result_cache import entity_tag, list_tag, result_cache
+from app.core.config import settings
+from app.core.metrics import registry
 from app.db.session import get_db
+from app.graphql.extensions.metrics import GraphQLMetrics
+from app.graphql.extensions.persisted_queries import PersistedQueries
+from app.graphql.extensions.query_cost import QueryCostLimiter
+from app.graphql.extensions.query_stats import QueryStatsExtension
+from app.graphql.extensions.session_routing import SessionRouting
 from app.graphql.modules.director.mutations import DirectorMutation
 from app.graphql.modules.director.queries import DirectorQuery
 from app.graphql.modules.genre.mutations import GenreMutation
 from app.graphql.modules.genre.queries import GenreQuery
 from app.graphql.modules.movie.mutations import MovieMutation
 from app.graphql.modules.movie.queries import MovieQuery
+from app.graphql.modules.search.queries import SearchQuery
+from app.graphql.modules.stats.queries import StatsQuery
 from app.rest.schemas.movies import MovieInDB, MovieInDirector
 from app.rest.services.directors import DirectorsService
 from app.rest.services.genres import GenresService
 from app.rest.services.movies import MovieService
+from app.rest.services.search import SearchService
+from app.rest.services.stats import StatsService
+
+
+def director_movies_tags(director_id: UUID, movies: list[MovieInDirector]) -> list[str]:
+    return [entity_tag("director", director_id), *(entity_tag("movie", movie.uuid) for movie in movies)]
+
+
+def genre_movies_tags(genre_id: UUID, movies: list[MovieInDB]) -> list[str]:
+    return [entity_tag("genre", genre_id), *(entity_tag("movie", movie.uuid) for movie in movies)]
+
+
+def movie_detail_tags(movie_id: UUID, details: dict) -> list[str]:
+    # details embed director and genre names, which any rename can change
+    return [entity_tag("movie", movie_id), list_tag("director"), list_tag("genre")]
+
+
+director_movies_cache = LoaderCache(max_entries=settings.LOADER_CACHE_MAX_ENTRIES, ttl=settings.LOADER_CACHE_TTL, tags=director_movies_tags)
+genre_movies_cache = LoaderCache(max_entries=settings.LOADER_CACHE_MAX_ENTRIES, ttl=settings.LOADER_CACHE_TTL, tags=genre_movies_tags)
+movie_detail_cache = LoaderCache(max_entries=settings.LOADER_CACHE_MAX_ENTRIES, ttl=settings.LOADER_CACHE_TTL, tags=movie_detail_tags)
+
+loader_caches = {"director_movies": director_movies_cache, "genre_movies": genre_movies_cache, "movie_detail": movie_detail_cache}
+for loader_cache in loader_caches.values():
+    result_cache.add_invalidation_listener(loader_cache.invalidate_tags)
+
+# loader caches only hear the invalidations of their own worker, so with a cache shared between workers each request keeps its own
+SHARED_LOADER_CACHES = settings.CACHE_BACKEND != "redis"
+
+LOADER_BATCH_SIZE = registry.histogram("dataloader_batch_size", "Keys per DataLoader batch", labels=("loader",), buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000))
+registry.counter_callback("dataloader_cache_hits_total", "Shared DataLoader cache hits", lambda: [((name,), cache.hits) for name, cache in loader_caches.items()], labels=("loader",))
+registry.counter_callback("dataloader_cache_misses_total", "Shared DataLoader cache misses", lambda: [((name,), cache.misses) for name, cache in loader_caches.items()], labels=("loader",))
 
 
 class Context(BaseContext):
-    def __init__(self, db: AsyncSession, director_service: DirectorsService, genre_service: GenresService, movie_service: MovieService, current_user: dict | None = None):
+    def __init__(
+        self,
+        db: AsyncSession,
+        director_service: DirectorsService,
+        genre_service: GenresService,
+        movie_service: MovieService,
+        search_service: SearchService,
+        stats_service: StatsService,
+        current_user: dict | None = None,
+    ):
         super().__init__()
         self.db = db
         self.current_user = current_user
 
         self.director_service = director_service
-        self.director_movies_loader = DataLoader(load_fn=self._load_movies_for_directors)
+        self.director_movies_loader = DataLoader(load_fn=self._load_movies_for_directors, cache_map=director_movies_cache if SHARED_LOADER_CACHES else None)
 
         self.genre_service = genre_service
-        self.genre_movies_loader = DataLoader(load_fn=self._load_movies_for_genres)
+        self.genre_movies_loader = DataLoader(load_fn=self._load_movies_for_genres, cache_map=genre_movies_cache if SHARED_LOADER_CACHES else None)
 
         self.movie_service = movie_service
-        self.movie_detail_loader = DataLoader(load_fn=self._load_movies_with_details)
+        self.movie_detail_loader = DataLoader(load_fn=self._load_movies_with_details, cache_map=movie_detail_cache if SHARED_LOADER_CACHES else None)
+
+        self.search_service = search_service
+        self.stats_service = stats_service
+
+    def invalidate_loaders(self, *tags: str) -> None:
+        """
+        Called by mutation resolvers. Evicts the tagged entries from the shared loader caches and gives this request private caches,
+        so data read through the uncommitted transaction never reaches other requests. Other requests drop the same tags again once the commit lands.
+        """
+        for loader in (self.director_movies_loader, self.genre_movies_loader, self.movie_detail_loader):
+            if isinstance(loader.cache_map, LoaderCache):
+                loader.cache_map.invalidate_tags(*tags)
+            loader.cache_map = DefaultCache()
 
     async def _load_movies_for_directors(self, director_ids: list[UUID]) -> list[list[MovieInDirector]]:
+        LOADER_BATCH_SIZE.observe(len(director_ids), "director_movies")
         movies_map: dict = await self.director_service.get_director_movies(director_ids)
         return [movies_map.get(director_id, []) for director_id in director_ids]
 
     async def _load_movies_for_genres(self, genre_ids: list[UUID]) -> list[list[MovieInDB]]:
+        LOADER_BATCH_SIZE.observe(len(genre_ids), "genre_movies")
         movies_map: dict = await self.genre_service.get_genre_movies(genre_ids)
         return [movies_map.get(genre_id, []) for genre_id in genre_ids]
 
     async def _load_movies_with_details(self, movie_ids: list[UUID]) -> list[dict]:
+        LOADER_BATCH_SIZE.observe(len(movie_ids), "movie_detail")
         movies_map: dict = await self.movie_service.get_movie_details(movie_ids)
         return [movies_map.get(movie_id, {}) for movie_id in movie_ids]
 
@@ -54,13 +121,23 @@ async def get_graphql_context(
     director_service: DirectorsService = Depends(DirectorsService),
     genre_service: GenresService = Depends(GenresService),
     movie_service: MovieService = Depends(MovieService),
+    search_service: SearchService = Depends(SearchService),
+    stats_service: StatsService = Depends(StatsService),
     current_user: dict | None = Depends(get_current_user),
 ) -> Context:
-    return Context(db=db, director_service=director_service, genre_service=genre_service, movie_service=movie_service, current_user=current_user)
+    return Context(
+        db=db,
+        director_service=director_service,
+        genre_service=genre_service,
+        movie_service=movie_service,
+        search_service=search_service,
+        stats_service=stats_service,
+        current_user=current_user,
+    )
 
 
 @strawberry.type
-class Query(DirectorQuery, GenreQuery, MovieQuery):
+class Query(DirectorQuery, GenreQuery, MovieQuery, SearchQuery, StatsQuery):
     @field
     def hello(self) -> str:
         return "Hello GraphQL!"
@@ -71,7 +148,13 @@ class Mutation(DirectorMutation, GenreMutation, MovieMutation):
     pass
 
 
-schema = strawberry.Schema(query=Query, mutation=Mutation)
+extensions: list = [PersistedQueries, QueryCostLimiter, SessionRouting]
+if settings.SQL_INSTRUMENTATION:
+    extensions.append(QueryStatsExtension)
+if settings.METRICS_ENABLED:
+    extensions.append(GraphQLMetrics)
+
+schema = strawberry.Schema(query=Query, mutation=Mutation, extensions=extensions)
 
 graphql_app = GraphQLRouter(
     schema,
@@ -0,0 +1,42 @@
+import time
+from typing import Any
+
+import fastapi.routing
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import registry
+
+SERIALIZATION_DURATION = registry.histogram("http_response_serialization_duration_seconds", "Time FastAPI spends validating and serializing response models", labels=("route",))
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Metrics in the Prometheus text format
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+def instrument_serialization() -> None:
+    """
+    Times the pydantic validation and serialization of response models. FastAPI looks `serialize_response` up
+    as a module global on every request, so wrapping it covers every route.
+    """
+    serialize_response = fastapi.routing.serialize_response
+    if getattr(serialize_response, "instrumented", False):
+        return
+
+    async def timed_serialize_response(**kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return await serialize_response(**kwargs)
+        finally:
+            # response fields are named after the route's unique id
+            field = kwargs.get("field")
+            SERIALIZATION_DURATION.observe(time.perf_counter() - started, field.name.removeprefix("Response_") if field else "none")
+
+    timed_serialize_response.instrumented = True  # type: ignore[attr-defined]
+    fastapi.routing.serialize_response = timed_serialize_response  # type: ignore[assignment]
@@ -0,0 +1,295 @@
+import asyncio
+import json
+import math
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.status import HTTP_413_REQUEST_ENTITY_TOO_LARGE, HTTP_429_TOO_MANY_REQUESTS, HTTP_503_SERVICE_UNAVAILABLE
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.auth.security import principal
+from app.core.config import settings
+from app.core.logging_setup import logger
+from app.core.metrics import registry
+from app.db.instrumentation import QueryStats, query_stats
+from app.graphql.extensions.persisted_queries import CachedDocument, persisted_query_store, query_hash
+from graphql import GraphQLError, OperationType, get_operation_ast, parse
+
+# requests with these methods don't write
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+# requests admission control applies to, health checks always get through
+ADMITTED_PREFIXES = ("/rest", "/graphql")
+EXEMPT_PREFIXES = ("/rest/status",)
+
+REQUEST_DURATION = registry.histogram("http_request_duration_seconds", "HTTP request latency", labels=("method", "route", "status"))
+REQUESTS_SHED = registry.counter("http_requests_shed_total", "Requests turned away by admission control", labels=("budget", "reason"))
+
+
+class QueryStatsMiddleware:
+    """
+    Collects the SQL statements of every HTTP request, reports their count and time in a `Server-Timing` header
+    and warns when one statement shape repeats more than `threshold` times, which usually means an N+1 loop
+    """
+
+    def __init__(self, app: ASGIApp, threshold: int = settings.SQL_REPEATED_STATEMENT_THRESHOLD):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(label=f"{scope['method']} {scope['path']}")
+        token = query_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", f"{stats.server_timing()}, total;dur={(time.perf_counter() - started) * 1000:.2f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            query_stats.reset(token)
+            for statement, count in stats.repeated(self.threshold):
+                logger.warning(f"{stats.label} ran the same statement {count} times, possible N+1 - {statement[:300]}")
+
+
+class MetricsMiddleware:
+    """
+    Records the latency of every HTTP request per method, route template and status code
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # the route template, not the path, so ids don't create a series per request
+            route = scope.get("route")
+            REQUEST_DURATION.observe(time.perf_counter() - started, scope["method"], getattr(route, "path", "unmatched"), status)
+
+
+@dataclass
+class TokenBucket:
+    rate: float
+    capacity: float
+    tokens: float
+    updated: float = field(default_factory=time.monotonic)
+
+    def take(self) -> float:
+        """
+        Spends a token. Returns 0 when there was one, otherwise the seconds until the next one.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class Admission:
+    """
+    Slots for requests running at once: `capacity` overall and `budget_capacity` per budget. Up to `max_waiting` requests
+    queue for one, in arrival order, for at most `timeout` seconds.
+    """
+
+    def __init__(self, capacity: int, budget_capacity: int, max_waiting: int, timeout: float):
+        self.slots = asyncio.Semaphore(capacity)
+        self.budgets: defaultdict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(budget_capacity))
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self.waiting = 0
+
+    async def acquire(self, budget: str) -> str | None:
+        """
+        Takes a slot of the budget and an overall one. Returns None once admitted, otherwise why the request is shed.
+        """
+        budget_slots = self.budgets[budget]
+        if (budget_slots.locked() or self.slots.locked()) and self.waiting >= self.max_waiting:
+            return "queue_full"
+
+        self.waiting += 1
+        try:
+            async with asyncio.timeout(self.timeout):
+                await budget_slots.acquire()
+                try:
+                    await self.slots.acquire()
+                except BaseException:
+                    budget_slots.release()
+                    raise
+            return None
+        except TimeoutError:
+            return "queue_timeout"
+        finally:
+            self.waiting -= 1
+
+    def release(self, budget: str) -> None:
+        self.slots.release()
+        self.budgets[budget].release()
+
+
+def is_graphql_mutation(body: bytes) -> bool:
+    """
+    Whether a GraphQL POST body runs a mutation. Persisted queries sent by hash and documents parsed before come from
+    the persisted query store, and a document parsed here goes into it so the GraphQL pipeline doesn't parse it again.
+    Anything unreadable counts as a query and fails later in the GraphQL pipeline.
+    """
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return False
+    if not isinstance(payload, dict):
+        return False
+
+    query = payload.get("query")
+    if query is None:
+        persisted_query = (payload.get("extensions") or {}).get("persistedQuery") or {}
+        query = persisted_query_store.get_query(str(persisted_query.get("sha256Hash", "")))
+    if not isinstance(query, str):
+        return False
+
+    # documents the pipeline rejects before parsing are never parsed here either
+    sha256_hash = query_hash(query)
+    if len(query) > settings.GRAPHQL_MAX_QUERY_LENGTH or not persisted_query_store.is_allowed(sha256_hash):
+        return False
+
+    cached = persisted_query_store.documents.get(sha256_hash)
+    if cached is None:
+        try:
+            cached = CachedDocument(parse(query))
+        except GraphQLError:
+            return False
+        persisted_query_store.documents.set(sha256_hash, cached)
+
+    operation = get_operation_ast(cached.document, payload.get("operationName"))
+    return operation is not None and operation.operation == OperationType.MUTATION
+
+
+class AdmissionMiddleware:
+    """
+    Admission control in front of the database pool. REST and GraphQL reads and writes are separate budgets: each one
+    rate limits every token with a token bucket and may hold only part of the concurrency slots, which are sized to the
+    pool. Requests over their rate get a 429, the ones that can't get a slot from the bounded queue in time a 503.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_concurrent: int = settings.MAX_CONCURRENT_REQUESTS,
+        budget_share: float = settings.ADMISSION_BUDGET_SHARE,
+        max_queued: int = settings.MAX_QUEUED_REQUESTS,
+        queue_timeout: float = settings.ADMISSION_QUEUE_TIMEOUT,
+        read_rate: float = settings.RATE_LIMIT_READS,
+        write_rate: float = settings.RATE_LIMIT_WRITES,
+        burst: int = settings.RATE_LIMIT_BURST,
+        max_body_size: int = settings.GRAPHQL_MAX_BODY_SIZE,
+    ):
+        self.app = app
+        self.max_body_size = max_body_size
+        # SQLAlchemy's own defaults when the pool settings are left empty
+        capacity = max_concurrent or (settings.POOL_SIZE or 5) + (settings.MAX_OVERFLOW or 10)
+        self.admission = Admission(capacity, max(1, int(capacity * budget_share)), max_queued, queue_timeout)
+        self.rates = {"read": read_rate, "write": write_rate}
+        self.burst = burst
+        self.buckets: dict[tuple[str, str], TokenBucket] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if scope["type"] != "http" or not path.startswith(ADMITTED_PREFIXES) or path.startswith(EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        api = "graphql" if path.startswith("/graphql") else "rest"
+        kind = "read" if scope["method"] in READ_METHODS else "write"
+        headers = Headers(scope=scope)
+        if api == "graphql" and kind == "write":
+            # GraphQL queries are POSTed too, the operation in the body tells them from mutations. The body is read
+            # before a slot is taken, so it is capped to keep waiting requests from holding unbounded memory.
+            buffered = await buffer_body(receive, self.max_body_size, headers.get("content-length"))
+            if buffered is None:
+                REQUESTS_SHED.inc("graphql_write", "body_too_large")
+                await shed(scope, receive, send, HTTP_413_REQUEST_ENTITY_TOO_LARGE, f"Request body exceeds {self.max_body_size} bytes")
+                return
+            receive, body = buffered
+            kind = "write" if is_graphql_mutation(body) else "read"
+        budget = f"{api}_{kind}"
+
+        retry_after = self.take_token(principal(headers.get("authorization")), budget, kind)
+        if retry_after:
+            REQUESTS_SHED.inc(budget, "rate_limited")
+            await shed(scope, receive, send, HTTP_429_TOO_MANY_REQUESTS, "Rate limit exceeded", retry_after)
+            return
+
+        reason = await self.admission.acquire(budget)
+        if reason:
+            REQUESTS_SHED.inc(budget, reason)
+            await shed(scope, receive, send, HTTP_503_SERVICE_UNAVAILABLE, "Server is busy, try again later", 1)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.admission.release(budget)
+
+    def take_token(self, user: str, budget: str, kind: str) -> float:
+        rate = self.rates[kind]
+        if rate <= 0:
+            return 0.0
+        bucket = self.buckets.get((user, budget))
+        if bucket is None:
+            bucket = self.buckets[(user, budget)] = TokenBucket(rate=rate, capacity=rate + self.burst, tokens=rate + self.burst)
+        return bucket.take()
+
+
+async def buffer_body(receive: Receive, max_size: int, content_length: str | None = None) -> tuple[Receive, bytes] | None:
+    """
+    Reads the whole request body, returns a receive callable that replays it to the app.
+    None when the body is larger than `max_size` bytes, stopping as soon as the declared or read length exceeds it.
+    """
+    if content_length and content_length.isdigit() and int(content_length) > max_size:
+        return None
+
+    messages: list[Message] = []
+    size = 0
+    while True:
+        message = await receive()
+        messages.append(message)
+        size += len(message.get("body", b""))
+        if size > max_size:
+            return None
+        if message["type"] != "http.request" or not message.get("more_body", False):
+            break
+
+    async def replay() -> Message:
+        return messages.pop(0) if messages else await receive()
+
+    return replay, b"".join(message.get("body", b"") for message in messages)
+
+
+async def shed(scope: Scope, receive: Receive, send: Send, status_code: int, detail: str, retry_after: float | None = None) -> None:
+    headers = {"Retry-After": str(max(1, math.ceil(retry_after)))} if retry_after is not None else None
+    response = JSONResponse({"detail": detail}, status_code=status_code, headers=headers)
+    await response(scope, receive, send)
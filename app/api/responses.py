@@ -0,0 +1,45 @@
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:
+    # optional, installed with the orjson extra
+    orjson = None  # type: ignore[assignment]
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered by orjson when it is installed, by pydantic-core's encoder otherwise.
+    Content already serialized to bytes is sent as is.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return to_json(content)
+
+
+def json_list_response(response: Response, adapter: TypeAdapter, items: list[Any]) -> ORJSONResponse:
+    """
+    Serializes a whole list of models in one call, skipping the per-item validation FastAPI runs on return values.
+    Headers set on the injected `response` are carried over, FastAPI drops them when a route returns its own response.
+    """
+    json_response = ORJSONResponse(adapter.dump_json(items))
+    json_response.headers.raw.extend(response.headers.raw)
+    return json_response
+
+
+def json_documents_response(response: Response, documents: list[str]) -> ORJSONResponse:
+    """
+    Joins JSON documents rendered by the database into an array, without decoding them
+    """
+    json_response = ORJSONResponse(f"[{','.join(documents)}]".encode())
+    json_response.headers.raw.extend(response.headers.raw)
+    return json_response
@@ -1,11 +1,14 @@
 from fastapi import APIRouter
 
 from app.api import status
-from app.api.rest import directors, genres, movies
+from app.api.responses import ORJSONResponse
+from app.api.rest import directors, genres, movies, search, stats
 
-rest_router = APIRouter(prefix="/rest")
+rest_router = APIRouter(prefix="/rest", default_response_class=ORJSONResponse)
 
 rest_router.include_router(status.router, prefix="/status", tags=["Server Status"])
 rest_router.include_router(directors.router, prefix="/directors", tags=["Directors"])
 rest_router.include_router(movies.router, prefix="/movies", tags=["Movies"])
 rest_router.include_router(genres.router, prefix="/genres", tags=["Genres"])
+rest_router.include_router(search.router, prefix="/search", tags=["Search"])
+rest_router.include_router(stats.router, prefix="/stats", tags=["Stats"])
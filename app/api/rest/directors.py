@@ -1,29 +1,91 @@
-from typing import Sequence
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
 
+from app.api.responses import json_documents_response, json_list_response
 from app.auth.security import get_current_user, require_scope
-from app.rest.schemas.directors import DirectorCreate, DirectorExtended, DirectorInDB, DirectorUpdate
+from app.core.config import settings
+from app.rest.schemas.base_schema import TotalMode
+from app.rest.schemas.directors import DIRECTOR_PAGE, DirectorCreate, DirectorExtended, DirectorInDB, DirectorUpdate
+from app.rest.schemas.exports import ExportFormat
+from app.rest.services.conditional import conditional_response
 from app.rest.services.directors import DirectorsService
+from app.rest.services.exports import ExportService, export_response, parse_http_date
 
 router = APIRouter()
 
 
-@router.get("/")
+@router.api_route("/", methods=["GET", "HEAD"], response_model=list[DirectorInDB | DirectorExtended])
 async def get_all_directors(
-    with_movies: bool = False, skip: int = 0, limit: int = 20, service: DirectorsService = Depends(DirectorsService), user: dict = Depends(get_current_user)
-) -> Sequence[DirectorInDB | DirectorExtended]:
-    return await service.get_all_directors(skip, limit, with_movies)
+    request: Request,
+    response: Response,
+    with_movies: bool = False,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: str | None = None,
+    total: TotalMode | None = None,
+    if_none_match: str | None = Header(None),
+    service: DirectorsService = Depends(DirectorsService),
+    user: dict = Depends(get_current_user),
+) -> Response:
+    """
+    `total` adds an `X-Total-Count` header, exact or estimated from the table statistics. HEAD only counts.
+    Pages carry an ETag, a matching `If-None-Match` is answered with a 304 before the page is fetched.
+    """
+    validators = await service.get_directors_page_validators(skip, limit, with_movies, cursor=cursor)
+    if not_modified := conditional_response(response, validators, if_none_match, None):
+        return not_modified
+    if total or request.method == "HEAD":
+        response.headers["X-Total-Count"] = str(await service.count_directors(total or TotalMode.exact))
+    if request.method == "HEAD":
+        return json_list_response(response, DIRECTOR_PAGE, [])
 
+    if with_movies and settings.SQL_JSON_LISTINGS:
+        documents = await service.get_director_documents(skip, limit, cursor=cursor)
+        if documents.next_cursor:
+            response.headers["X-Next-Cursor"] = documents.next_cursor
+        return json_documents_response(response, documents.items)
 
-@router.get("/director")
+    page = await service.get_all_directors(skip, limit, with_movies, cursor=cursor)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return json_list_response(response, DIRECTOR_PAGE, page.items)
+
+
+@router.get("/export")
+async def export_directors(
+    format: ExportFormat = ExportFormat.ndjson,
+    if_modified_since: str | None = Header(None),
+    service: ExportService = Depends(ExportService),
+    user: dict = Depends(get_current_user),
+) -> Response:
+    """
+    Streams every director as NDJSON or CSV, only the ones changed since `If-Modified-Since` when the header is set
+    """
+    export = await service.export_directors(format, parse_http_date(if_modified_since))
+    return export_response(export)
+
+
+@router.get("/director", response_model=DirectorInDB | DirectorExtended)
 async def get_director(
-    id: UUID | None = None, name: str | None = None, with_movies: bool = False, service: DirectorsService = Depends(DirectorsService), user: dict = Depends(get_current_user)
-) -> DirectorInDB | DirectorExtended:
+    response: Response,
+    id: UUID | None = None,
+    name: str | None = None,
+    with_movies: bool = False,
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
+    service: DirectorsService = Depends(DirectorsService),
+    user: dict = Depends(get_current_user),
+) -> DirectorInDB | DirectorExtended | Response:
+    """
+    Answers a matching `If-None-Match`, or `If-Modified-Since` without movies, with a 304 before the director is fetched
+    """
     if not name and not id:
         raise HTTPException(status_code=404, detail="Director id or name required")
 
+    if not_modified := conditional_response(response, await service.get_director_validators(id=id, name=name, with_movies=with_movies), if_none_match, if_modified_since):
+        return not_modified
+
     if id:
         return await service.get_director_by_id(id, with_movies)
 
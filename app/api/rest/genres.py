@@ -1,27 +1,83 @@
-from typing import Sequence
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
 
+from app.api.responses import json_list_response
 from app.auth.security import get_current_user, require_scope
-from app.rest.schemas.genres import GenreCreate, GenreExtended, GenreInDB, GenreUpdate
+from app.rest.schemas.base_schema import TotalMode
+from app.rest.schemas.exports import ExportFormat
+from app.rest.schemas.genres import GENRE_PAGE, GenreCreate, GenreExtended, GenreInDB, GenreUpdate
+from app.rest.services.conditional import conditional_response
+from app.rest.services.exports import ExportService, export_response, parse_http_date
 from app.rest.services.genres import GenresService
 
 router = APIRouter()
 
 
-@router.get("/")
-async def get_all_genres(skip: int = 0, limit: int = 20, service: GenresService = Depends(GenresService), user: dict = Depends(get_current_user)) -> Sequence[GenreInDB]:
-    return await service.get_all_genres(skip, limit)
+@router.api_route("/", methods=["GET", "HEAD"], response_model=list[GenreInDB])
+async def get_all_genres(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: str | None = None,
+    total: TotalMode | None = None,
+    if_none_match: str | None = Header(None),
+    service: GenresService = Depends(GenresService),
+    user: dict = Depends(get_current_user),
+) -> Response:
+    """
+    `total` adds an `X-Total-Count` header, exact or estimated from the table statistics. HEAD only counts.
+    Pages carry an ETag, a matching `If-None-Match` is answered with a 304 before the page is fetched.
+    """
+    validators = await service.get_genres_page_validators(skip, limit, cursor=cursor)
+    if not_modified := conditional_response(response, validators, if_none_match, None):
+        return not_modified
+    if total or request.method == "HEAD":
+        response.headers["X-Total-Count"] = str(await service.count_genres(total or TotalMode.exact))
+    if request.method == "HEAD":
+        return json_list_response(response, GENRE_PAGE, [])
 
+    page = await service.get_all_genres(skip, limit, cursor=cursor)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return json_list_response(response, GENRE_PAGE, page.items)
 
-@router.get("/genre")
+
+@router.get("/export")
+async def export_genres(
+    format: ExportFormat = ExportFormat.ndjson,
+    if_modified_since: str | None = Header(None),
+    service: ExportService = Depends(ExportService),
+    user: dict = Depends(get_current_user),
+) -> Response:
+    """
+    Streams every genre as NDJSON or CSV, only the ones changed since `If-Modified-Since` when the header is set
+    """
+    export = await service.export_genres(format, parse_http_date(if_modified_since))
+    return export_response(export)
+
+
+@router.get("/genre", response_model=GenreInDB | GenreExtended)
 async def get_genre(
-    id: UUID | None = None, name: str | None = None, with_movies: bool = False, service: GenresService = Depends(GenresService), user: dict = Depends(get_current_user)
-) -> GenreInDB | GenreExtended:
+    response: Response,
+    id: UUID | None = None,
+    name: str | None = None,
+    with_movies: bool = False,
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
+    service: GenresService = Depends(GenresService),
+    user: dict = Depends(get_current_user),
+) -> GenreInDB | GenreExtended | Response:
+    """
+    Answers a matching `If-None-Match`, or `If-Modified-Since` without movies, with a 304 before the genre is fetched
+    """
     if not name and not id:
         raise HTTPException(status_code=404, detail="Genre id or name required")
 
+    if not_modified := conditional_response(response, await service.get_genre_validators(id=id, name=name, with_movies=with_movies), if_none_match, if_modified_since):
+        return not_modified
+
     if id:
         return await service.get_genre_by_id(id, with_movies)
 
@@ -1,30 +1,98 @@
-from typing import Sequence
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
 
+from app.api.responses import json_documents_response, json_list_response
 from app.auth.security import get_current_user, require_scope
-from app.rest.schemas.movies import MovieCreate, MovieExtended, MovieInDB, MovieOrder, MovieSort, MovieUpdate
+from app.core.config import settings
+from app.rest.schemas.base_schema import TotalMode
+from app.rest.schemas.exports import ExportFormat
+from app.rest.schemas.imports import ImportFormat, ImportReport
+from app.rest.schemas.movies import MOVIE_PAGE, GenreMatch, MovieBatchResult, MovieCreate, MovieExtended, MovieFilter, MovieInDB, MovieOrder, MovieSort, MovieUpdate
+from app.rest.services.conditional import conditional_response
+from app.rest.services.exports import ExportService, export_response, parse_http_date
+from app.rest.services.imports import ImportService
 from app.rest.services.movies import MovieService
 
 router = APIRouter()
 
 
-@router.get("/")
+@router.api_route("/", methods=["GET", "HEAD"], response_model=list[MovieInDB | MovieExtended])
 async def get_all_directors(
+    request: Request,
+    response: Response,
     extended: bool = False,
     skip: int = 0,
     limit: int = 20,
     order_by: MovieOrder = MovieOrder.title,
     sort_by: MovieSort = MovieSort.asc,
+    cursor: str | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    director_ids: list[UUID] | None = Query(None, alias="director_id"),
+    genres: list[str] | None = Query(None, alias="genre"),
+    genre_match: GenreMatch = GenreMatch.any,
+    title_prefix: str | None = None,
+    total: TotalMode | None = None,
+    if_none_match: str | None = Header(None),
     service: MovieService = Depends(MovieService),
     user: str = Depends(get_current_user),
-) -> Sequence[MovieInDB | MovieExtended]:
-    return await service.get_all_movies(skip, limit, order_by=order_by, sort_by=sort_by, extended=extended)
+) -> Response:
+    """
+    Filters combine, repeat `director_id` or `genre` to match several. With `genre_match=all` a movie needs every listed genre.
+    `total` adds an `X-Total-Count` header, exact or, without filters, estimated from the table statistics. HEAD only counts.
+    Pages carry an ETag, a matching `If-None-Match` is answered with a 304 before the page is fetched.
+    """
+    filters = MovieFilter(year_from=year_from, year_to=year_to, director_ids=director_ids, genres=genres, genre_match=genre_match, title_prefix=title_prefix)
+    validators = await service.get_movies_page_validators(skip, limit, order_by=order_by, sort_by=sort_by, cursor=cursor, filters=filters)
+    if not_modified := conditional_response(response, validators, if_none_match, None):
+        return not_modified
+    if total or request.method == "HEAD":
+        response.headers["X-Total-Count"] = str(await service.count_movies(total or TotalMode.exact, filters))
+    if request.method == "HEAD":
+        return json_list_response(response, MOVIE_PAGE, [])
 
+    if extended and settings.SQL_JSON_LISTINGS:
+        documents = await service.get_movie_documents(skip, limit, order_by=order_by, sort_by=sort_by, cursor=cursor, filters=filters)
+        if documents.next_cursor:
+            response.headers["X-Next-Cursor"] = documents.next_cursor
+        return json_documents_response(response, documents.items)
 
-@router.get("/{id}")
-async def get_movie(id: UUID, extended: bool = False, service: MovieService = Depends(MovieService), user: dict = Depends(get_current_user)) -> MovieInDB | MovieExtended:
+    page = await service.get_all_movies(skip, limit, order_by=order_by, sort_by=sort_by, extended=extended, cursor=cursor, filters=filters)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return json_list_response(response, MOVIE_PAGE, page.items)
+
+
+@router.get("/export")
+async def export_movies(
+    format: ExportFormat = ExportFormat.ndjson,
+    if_modified_since: str | None = Header(None),
+    service: ExportService = Depends(ExportService),
+    user: dict = Depends(get_current_user),
+) -> Response:
+    """
+    Streams every movie as NDJSON or CSV, only the ones changed since `If-Modified-Since` when the header is set
+    """
+    export = await service.export_movies(format, parse_http_date(if_modified_since))
+    return export_response(export)
+
+
+@router.get("/{id}", response_model=MovieInDB | MovieExtended)
+async def get_movie(
+    id: UUID,
+    response: Response,
+    extended: bool = False,
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
+    service: MovieService = Depends(MovieService),
+    user: dict = Depends(get_current_user),
+) -> MovieInDB | MovieExtended | Response:
+    """
+    Answers a matching `If-None-Match` or `If-Modified-Since` with a 304 before the movie is fetched
+    """
+    if not_modified := conditional_response(response, await service.get_movie_validators(id), if_none_match, if_modified_since):
+        return not_modified
     return await service.get_movie_by_id(id, extended=extended)
 
 
@@ -33,11 +101,34 @@ async def create_movie(movie_data: MovieCreate, service: MovieService = Depends(
     return await service.create_movie(movie_data)
 
 
+@router.post("/batch")
+async def create_movies(movies_data: list[MovieCreate], service: MovieService = Depends(MovieService), user: dict = Depends(require_scope(["admin"]))) -> MovieBatchResult:
+    return await service.create_movies(movies_data)
+
+
+@router.post("/import")
+async def import_movies(request: Request, format: ImportFormat = ImportFormat.csv, service: ImportService = Depends(ImportService), user: dict = Depends(require_scope(["admin"]))) -> ImportReport:
+    """
+    Bulk loads a CSV (`movie_title,release_year,director_name,genres`) or NDJSON request body, streamed in chunks
+    """
+    return await service.import_catalog(request.stream(), format)
+
+
 @router.patch("/movie")
 async def update_movie(movie_data: MovieUpdate, service: MovieService = Depends(MovieService), user: dict = Depends(require_scope(["admin"]))) -> MovieInDB:
     return await service.update_movie(movie_data)
 
 
+@router.patch("/batch")
+async def update_movies(movies_data: list[MovieUpdate], service: MovieService = Depends(MovieService), user: dict = Depends(require_scope(["admin"]))) -> MovieBatchResult:
+    return await service.update_movies(movies_data)
+
+
 @router.delete("/movie/{id}")
 async def remove_movie(id: UUID, service: MovieService = Depends(MovieService), user: dict = Depends(require_scope(["admin"]))) -> MovieInDB:
     return await service.remove_movie(id)
+
+
+@router.delete("/batch")
+async def remove_movies(ids: list[UUID] = Query(alias="id"), service: MovieService = Depends(MovieService), user: dict = Depends(require_scope(["admin"]))) -> MovieBatchResult:
+    return await service.remove_movies(ids)
@@ -0,0 +1,28 @@
+from typing import Sequence
+
+from fastapi import APIRouter, Depends, Query, Response
+
+from app.auth.security import get_current_user
+from app.rest.schemas.search import SearchResult, SearchType
+from app.rest.services.search import SearchService
+
+router = APIRouter()
+
+
+@router.get("/")
+async def search(
+    response: Response,
+    q: str = Query(min_length=1),
+    types: list[SearchType] = Query(list(SearchType), alias="type"),
+    limit: int = 20,
+    cursor: str | None = None,
+    service: SearchService = Depends(SearchService),
+    user: dict = Depends(get_current_user),
+) -> Sequence[SearchResult]:
+    """
+    Movies, directors and genres matching `q`, best matches first. Repeat `type` to search only some of them.
+    """
+    page = await service.search(q, types, limit, cursor=cursor)
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.auth.security import get_current_user, require_scope
+from app.rest.schemas.stats import DecadeCount, DirectorCount, GenreCount, StatsRefreshReport
+from app.rest.services.stats import StatsService
+
+router = APIRouter()
+
+
+@router.get("/genres")
+async def get_genre_counts(service: StatsService = Depends(StatsService), user: dict = Depends(get_current_user)) -> list[GenreCount]:
+    """
+    Movies per genre, most movies first
+    """
+    return await service.get_genre_counts()
+
+
+@router.get("/directors")
+async def get_top_directors(
+    limit: int = Query(10, ge=1, le=1000),
+    service: StatsService = Depends(StatsService),
+    user: dict = Depends(get_current_user),
+) -> list[DirectorCount]:
+    """
+    The `limit` directors with the most movies
+    """
+    return await service.get_top_directors(limit)
+
+
+@router.get("/decades")
+async def get_decade_counts(service: StatsService = Depends(StatsService), user: dict = Depends(get_current_user)) -> list[DecadeCount]:
+    """
+    Movies per decade of their release year, movies without one last
+    """
+    return await service.get_decade_counts()
+
+
+@router.post("/refresh")
+async def refresh_stats(service: StatsService = Depends(StatsService), user: dict = Depends(require_scope(["admin"]))) -> StatsRefreshReport:
+    """
+    Recounts the catalog now instead of waiting for the next periodic refresh
+    """
+    return await service.refresh()
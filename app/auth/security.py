@@ -6,25 +6,22 @@ from app.core.config import settings
 bearer_scheme = HTTPBearer(auto_error=False)
 
 TOKEN_SCOPES = {settings.API_ADMIN_KEY: ["admin", "user"], settings.API_SECRET_KEY: ["user"]}
+TOKEN_USERNAMES = {settings.API_ADMIN_KEY: "admin_user", settings.API_SECRET_KEY: "normal_user"}
+ANONYMOUS = "anonymous"
 
 
 async def get_current_user(token: HTTPAuthorizationCredentials = Security(bearer_scheme)) -> dict:
     credentials = token.credentials
 
-    if credentials == settings.API_ADMIN_KEY:
-        username = "admin_user"
-        scopes = TOKEN_SCOPES[credentials]
-    elif credentials == settings.API_SECRET_KEY:
-        username = "normal_user"
-        scopes = TOKEN_SCOPES[credentials]
-    else:
+    username = TOKEN_USERNAMES.get(credentials)
+    if username is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return {"username": username, "scopes": scopes}
+    return {"username": username, "scopes": TOKEN_SCOPES[credentials]}
 
 
 def require_scope(required_scopes: list[str]):
@@ -36,3 +33,14 @@ def require_scope(required_scopes: list[str]):
         return current_user
 
     return scope_checker
+
+
+def principal(authorization: str | None) -> str:
+    """
+    Username `get_current_user` resolves the bearer token of an Authorization header to, for code running before the
+    dependency, e.g. middleware. Missing or unknown tokens are anonymous.
+    """
+    scheme, _, credentials = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not credentials:
+        return ANONYMOUS
+    return TOKEN_USERNAMES.get(credentials.strip()) or ANONYMOUS
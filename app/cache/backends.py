@@ -0,0 +1,191 @@
+import abc
+import builtins
+import pickle
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Protocol
+
+
+class CacheBackend(abc.ABC):
+    """
+    Every invalidation advances a generation. A value read before it may still be stored afterwards, so `set` with
+    `since` drops the value when any of its tags was invalidated after generation `since`.
+    """
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> Any | None:
+        pass
+
+    @abc.abstractmethod
+    async def generation(self) -> int:
+        pass
+
+    @abc.abstractmethod
+    async def set(self, key: str, value: Any, ttl: int, tags: Iterable[str] = (), since: int | None = None) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def delete(self, *keys: str) -> None:
+        pass
+
+    @abc.abstractmethod
+    async def invalidate_tags(self, *tags: str) -> None:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU cache with per-entry TTL and a tag index for targeted invalidation
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any, frozenset[str]]] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+        self._generation = 0
+        # generation of the last invalidation of each tag, tags dropped from it count as invalidated when the last one was dropped
+        self._tag_generations: OrderedDict[str, int] = OrderedDict()
+        self._dropped_generation = 0
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def generation(self) -> int:
+        return self._generation
+
+    async def set(self, key: str, value: Any, ttl: int, tags: Iterable[str] = (), since: int | None = None) -> None:
+        entry_tags = frozenset(tags)
+        if since is not None and any(self._tag_generations.get(tag, self._dropped_generation) > since for tag in entry_tags):
+            return
+
+        self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, value, entry_tags)
+        for tag in entry_tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._remove(key)
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        self._generation += 1
+        for tag in tags:
+            self._tag_generations[tag] = self._generation
+            self._tag_generations.move_to_end(tag)
+            for key in self._tags.pop(tag, set()):
+                self._remove(key)
+
+        while len(self._tag_generations) > self.max_entries:
+            _, self._dropped_generation = self._tag_generations.popitem(last=False)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisLikeClient(Protocol):
+    """
+    The subset of the `redis.asyncio.Redis` API used by `RedisCacheBackend`, small enough for a local fake to implement
+    """
+
+    async def get(self, name: str) -> bytes | None: ...
+
+    async def set(self, name: str, value: bytes | int, ex: int | None = None) -> Any: ...
+
+    async def mget(self, *names: str) -> list[bytes | None]: ...
+
+    async def incr(self, name: str) -> int: ...
+
+    async def delete(self, *names: str) -> Any: ...
+
+    async def sadd(self, name: str, *values: str) -> Any: ...
+
+    async def smembers(self, name: str) -> builtins.set[bytes]: ...
+
+    async def expire(self, name: str, time: int) -> Any: ...
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared cache for multi-process deployments. Values are pickled and every tag is a Redis set of the keys it covers.
+    The generation is a shared counter, the generation of a tag's last invalidation is kept for `generation_ttl` seconds.
+    """
+
+    def __init__(self, client: RedisLikeClient, prefix: str = "cache", generation_ttl: int = 3600):
+        self.client = client
+        self.prefix = prefix
+        self.generation_ttl = generation_ttl
+
+    async def get(self, key: str) -> Any | None:
+        raw = await self.client.get(self._value_key(key))
+        return pickle.loads(raw) if raw is not None else None
+
+    async def generation(self) -> int:
+        raw = await self.client.get(self._generation_key())
+        return int(raw) if raw is not None else 0
+
+    async def set(self, key: str, value: Any, ttl: int, tags: Iterable[str] = (), since: int | None = None) -> None:
+        entry_tags = list(tags)
+        if since is not None and await self._invalidated_since(entry_tags, since):
+            return
+
+        value_key = self._value_key(key)
+        await self.client.set(value_key, pickle.dumps(value), ex=ttl)
+        for tag in entry_tags:
+            tag_key = self._tag_key(tag)
+            await self.client.sadd(tag_key, value_key)
+            await self.client.expire(tag_key, ttl)
+
+        # an invalidation running since the check may have read the tag sets before the key was added to them
+        if since is not None and await self._invalidated_since(entry_tags, since):
+            await self.client.delete(value_key)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*[self._value_key(key) for key in keys])
+
+    async def invalidate_tags(self, *tags: str) -> None:
+        generation = await self.client.incr(self._generation_key())
+        for tag in tags:
+            await self.client.set(self._generation_key(tag), generation, ex=self.generation_ttl)
+            tag_key = self._tag_key(tag)
+            members = await self.client.smembers(tag_key)
+            keys = [m.decode() if isinstance(m, bytes) else m for m in members]
+            await self.client.delete(tag_key, *keys)
+
+    async def _invalidated_since(self, tags: list[str], since: int) -> bool:
+        if not tags:
+            return False
+        generations = await self.client.mget(*[self._generation_key(tag) for tag in tags])
+        return any(int(generation) > since for generation in generations if generation is not None)
+
+    def _value_key(self, key: str) -> str:
+        return f"{self.prefix}:v:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:t:{tag}"
+
+    def _generation_key(self, tag: str | None = None) -> str:
+        return f"{self.prefix}:g:{tag}" if tag is not None else f"{self.prefix}:g"
@@ -0,0 +1,97 @@
+import time
+from asyncio import Future
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable
+
+from strawberry.dataloader import AbstractCache
+
+
+class LoaderCache(AbstractCache):
+    """
+    Size-bounded, TTL-limited `cache_map` shared by the DataLoaders of every request.
+    Entries are tagged once their future resolves so writes can evict them by entity tag. Like the result cache backends, every
+    invalidation advances a generation, and an entry whose tags were invalidated while its load was pending is dropped when it resolves.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl: int = 60, tags: Callable[[Any, Any], Iterable[str]] | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.tags = tags
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Future]] = OrderedDict()
+        self._tag_index: dict[str, set[Hashable]] = {}
+        self._entry_tags: dict[Hashable, list[str]] = {}
+        # generation at which each pending entry was set
+        self._pending: dict[Hashable, int] = {}
+        self._generation = 0
+        # generation of the last invalidation of each tag, tags dropped from it count as invalidated when the last one was dropped
+        self._tag_generations: OrderedDict[str, int] = OrderedDict()
+        self._dropped_generation = 0
+
+    def get(self, key: Any) -> Future | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, future = entry
+            failed = future.done() and (future.cancelled() or future.exception() is not None)
+            if expires_at > time.monotonic() and not failed:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return future
+            self.delete(key)
+
+        self.misses += 1
+        return None
+
+    def set(self, key: Any, value: Future) -> None:
+        self.delete(key)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        if self.tags is not None:
+            self._pending[key] = self._generation
+            value.add_done_callback(lambda future: self._index(key, future))
+
+        while len(self._entries) > self.max_entries:
+            self.delete(next(iter(self._entries)))
+
+    def delete(self, key: Any) -> None:
+        self._entries.pop(key, None)
+        self._pending.pop(key, None)
+        for tag in self._entry_tags.pop(key, []):
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tag_index.clear()
+        self._entry_tags.clear()
+        self._pending.clear()
+
+    def invalidate_tags(self, *tags: str) -> None:
+        self._generation += 1
+        for tag in tags:
+            self._tag_generations[tag] = self._generation
+            self._tag_generations.move_to_end(tag)
+            for key in self._tag_index.pop(tag, set()):
+                self.delete(key)
+
+        while len(self._tag_generations) > self.max_entries:
+            _, self._dropped_generation = self._tag_generations.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def _index(self, key: Any, future: Future) -> None:
+        entry = self._entries.get(key)
+        if self.tags is None or entry is None or entry[1] is not future or future.cancelled() or future.exception() is not None:
+            return
+        since = self._pending.pop(key, self._generation)
+        tags = list(self.tags(key, future.result()))
+        if any(self._tag_generations.get(tag, self._dropped_generation) > since for tag in tags):
+            self.delete(key)
+            return
+        self._entry_tags[key] = tags
+        for tag in tags:
+            self._tag_index.setdefault(tag, set()).add(key)
@@ -0,0 +1,138 @@
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.backends import CacheBackend, MemoryCacheBackend, RedisCacheBackend
+from app.cache.single_flight import SingleFlight
+from app.core.config import settings
+from app.core.logging_setup import logger
+from app.core.metrics import registry
+
+PENDING_INVALIDATIONS = "cache_invalidations"
+
+
+def list_tag(entity: str) -> str:
+    return f"{entity}:list"
+
+
+def entity_tag(entity: str, id: Any) -> str:
+    return f"{entity}:{id}"
+
+
+class ResultCache:
+    """
+    Caches service read results across requests. Every entry carries entity tags, writes evict only the entries tagged with what they touched.
+    With `single_flight`, concurrent reads of the same key from read-only sessions share one call, with or without a backend.
+    """
+
+    def __init__(self, backend: CacheBackend | None, ttl: int = 60, single_flight: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.listeners: list[Callable[..., None]] = []
+        self.flights = SingleFlight() if single_flight else None
+
+    def add_invalidation_listener(self, listener: Callable[..., None]) -> None:
+        """
+        Registers an in-process cache that should drop the same tags whenever results are invalidated
+        """
+        self.listeners.append(listener)
+
+    @staticmethod
+    def key(namespace: str, **params: Any) -> str:
+        digest = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:32]
+        return f"{namespace}:{digest}"
+
+    async def get_or_set(self, db: AsyncSession, key: str, factory: Callable[[], Awaitable[Any]], tags: Callable[[Any], Iterable[str]]) -> Any:
+        """
+        Cached result of `factory`, which reads through `db`. Sessions that wrote, or may write, see their own
+        uncommitted rows, so they neither use the cache nor share their reads with other requests.
+        """
+        if db.info.get("primary") or PENDING_INVALIDATIONS in db.info:
+            return await factory()
+
+        try:
+            # read before the factory, so a write committed while it runs keeps its result out of the cache
+            generation = await self.backend.generation() if self.backend is not None else None
+        except Exception as e:
+            logger.error(f"Cache lookup failed for {key} - details: {e}", exc_info=e)
+            return await factory()
+
+        if self.flights is None:
+            return await self._get_or_set(key, factory, tags, generation)
+        # reads started before an invalidation another worker committed don't take in later callers either
+        return await self.flights.do(f"{key}:{generation}", lambda: self._get_or_set(key, factory, tags, generation))
+
+    async def _get_or_set(self, key: str, factory: Callable[[], Awaitable[Any]], tags: Callable[[Any], Iterable[str]], generation: int | None) -> Any:
+        if self.backend is None or generation is None:
+            return await factory()
+
+        try:
+            cached = await self.backend.get(key)
+        except Exception as e:
+            logger.error(f"Cache lookup failed for {key} - details: {e}", exc_info=e)
+            return await factory()
+        if cached is not None:
+            return cached
+
+        result = await factory()
+        try:
+            await self.backend.set(key, result, self.ttl, tags=tags(result), since=generation)
+        except Exception as e:
+            logger.error(f"Cache store failed for {key} - details: {e}", exc_info=e)
+        return result
+
+    async def invalidate(self, *tags: str) -> None:
+        if not tags:
+            return
+        # reads started before the write may return what it replaced, later ones mustn't join them
+        if self.flights is not None:
+            self.flights.forget_all()
+        for listener in self.listeners:
+            listener(*tags)
+
+        if self.backend is None:
+            return
+        try:
+            await self.backend.invalidate_tags(*tags)
+        except Exception as e:
+            logger.error(f"Cache invalidation failed for {tags} - details: {e}", exc_info=e)
+
+    def invalidate_on_commit(self, db: AsyncSession, *tags: str) -> None:
+        """
+        Defers invalidation until the session commits, so concurrent readers can't re-cache rows that are about to change
+        """
+        db.info.setdefault(PENDING_INVALIDATIONS, set()).update(tags)
+
+    async def flush_invalidations(self, db: AsyncSession) -> None:
+        tags = db.info.pop(PENDING_INVALIDATIONS, None)
+        if tags:
+            await self.invalidate(*tags)
+
+    def discard_invalidations(self, db: AsyncSession) -> None:
+        db.info.pop(PENDING_INVALIDATIONS, None)
+
+
+def build_backend() -> CacheBackend | None:
+    if settings.CACHE_BACKEND == "none":
+        return None
+
+    if settings.CACHE_BACKEND == "redis":
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package to be installed") from e
+        return RedisCacheBackend(Redis.from_url(settings.REDIS_URL or "redis://localhost:6379/0"))
+
+    return MemoryCacheBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+
+
+result_cache = ResultCache(build_backend(), ttl=settings.CACHE_TTL, single_flight=settings.SINGLE_FLIGHT)
+registry.counter_callback(
+    "result_cache_coalesced_total", "Service reads that awaited an identical read already running", lambda: [((), result_cache.flights.coalesced)] if result_cache.flights else []
+)
+
+
+def get_result_cache() -> ResultCache:
+    return result_cache
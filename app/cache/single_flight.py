@@ -0,0 +1,44 @@
+import asyncio
+from functools import partial
+from typing import Any, Awaitable, Callable
+
+
+class SingleFlight:
+    """
+    Runs one call per key at a time, concurrent callers with the same key await the running call and share its result
+    or exception. The call runs on the session of the caller that started it, so it is cancelled with that caller,
+    and the callers still waiting start over.
+    """
+
+    def __init__(self) -> None:
+        self.calls: dict[str, asyncio.Task] = {}
+        self.coalesced = 0
+
+    async def do(self, key: str, function: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            call = self.calls.get(key)
+            if call is None:
+                call = asyncio.ensure_future(function())
+                self.calls[key] = call
+                call.add_done_callback(partial(self._forget, key))
+                # cancelling this caller cancels the call it awaits
+                return await call
+
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(call)
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if call.cancelled() and current is not None and not current.cancelling():
+                    continue
+                raise
+
+    def forget_all(self) -> None:
+        """
+        Detaches the running calls, callers arriving from now on start their own
+        """
+        self.calls.clear()
+
+    def _forget(self, key: str, call: asyncio.Task) -> None:
+        if self.calls.get(key) is call:
+            del self.calls[key]
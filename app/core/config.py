@@ -3,12 +3,77 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     DATABASE_URL: str | None = None
+    # comma separated read replica URLs, in the DATABASE_URL format
+    DATABASE_REPLICA_URLS: str | None = None
+    # "round_robin" or "least_busy"
+    REPLICA_SELECTION: str = "round_robin"
+    # autocommit | transaction | off, how sessions of read-only requests run their statements
+    READ_ONLY_SESSIONS: str = "autocommit"
     POOL_SIZE: int | None = None
     ECHO: bool | None = None
     MAX_OVERFLOW: int | None = None
+    # compiled statements kept per engine and prepared statements kept per connection
+    QUERY_CACHE_SIZE: int = 1000
+    PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    # optional postgres plan_cache_mode, force_generic_plan lets prepared statements skip planning entirely
+    PLAN_CACHE_MODE: str | None = None
+    # extended and with_movies REST listings are rendered to JSON by Postgres and sent without decoding them
+    SQL_JSON_LISTINGS: bool = False
     API_SECRET_KEY: str | None = None
     API_ADMIN_KEY: str | None = None
 
+    # "memory", "redis" or "none"
+    CACHE_BACKEND: str = "memory"
+    CACHE_TTL: int = 60
+    CACHE_MAX_ENTRIES: int = 2048
+    REDIS_URL: str | None = None
+    # concurrent identical service reads share one database call, even without a cache backend
+    SINGLE_FLIGHT: bool = True
+    LOADER_CACHE_TTL: int = 30
+    LOADER_CACHE_MAX_ENTRIES: int = 4096
+
+    GRAPHQL_DOCUMENT_CACHE_SIZE: int = 512
+    GRAPHQL_MAX_QUERY_LENGTH: int = 20_000
+    GRAPHQL_PERSISTED_QUERIES_ONLY: bool = False
+    # JSON object mapping sha256 hashes to pre-registered query documents
+    GRAPHQL_PERSISTED_QUERIES_FILE: str | None = None
+    GRAPHQL_MAX_QUERY_COST: int = 5_000
+    GRAPHQL_MAX_QUERY_DEPTH: int = 8
+    # multiplier for list fields without a first/limit argument
+    GRAPHQL_DEFAULT_LIST_SIZE: int = 20
+
+    IMPORT_CHUNK_SIZE: int = 10_000
+    BATCH_MAX_SIZE: int = 500
+    # rows fetched per round trip by the export cursors
+    EXPORT_BATCH_SIZE: int = 1_000
+    # seconds between recounts of the stats summary, 0 leaves refreshing to POST /rest/stats/refresh
+    STATS_REFRESH_INTERVAL: int = 300
+
+    # admission control of /rest and /graphql requests, per worker process
+    ADMISSION_CONTROL: bool = True
+    # requests running at once, 0 sizes it to the primary pool (POOL_SIZE + MAX_OVERFLOW) so none waits for a connection
+    MAX_CONCURRENT_REQUESTS: int = 0
+    # largest share of those slots the REST or GraphQL reads or writes may hold, so neither starves the others
+    ADMISSION_BUDGET_SHARE: float = 0.75
+    # requests waiting for a slot, the ones beyond are answered with a 503 right away
+    MAX_QUEUED_REQUESTS: int = 100
+    # seconds a request waits for a slot before a 503
+    ADMISSION_QUEUE_TIMEOUT: float = 2.0
+    # requests per second per token, for reads and for writes of each API, 0 disables the limit
+    RATE_LIMIT_READS: float = 0
+    RATE_LIMIT_WRITES: float = 0
+    # requests a token may send at once on top of its rate
+    RATE_LIMIT_BURST: int = 50
+    # bytes of a GraphQL POST body read to tell queries from mutations, larger bodies are answered with a 413
+    GRAPHQL_MAX_BODY_SIZE: int = 1_048_576
+
+    SQL_INSTRUMENTATION: bool = True
+    # statements repeated more often than this within one request are logged as a possible N+1
+    SQL_REPEATED_STATEMENT_THRESHOLD: int = 5
+    METRICS_ENABLED: bool = True
+    # comma separated GraphQL operation names reported under their own label, besides those of pre-registered persisted queries
+    GRAPHQL_METRIC_OPERATIONS: str | None = None
+
     model_config = SettingsConfigDict(env_file=".env")
 
 
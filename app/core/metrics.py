@@ -0,0 +1,131 @@
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator
+
+# seconds, from a cached read to a slow export page
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = tuple[str, ...]
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, description: str, labels: Labels = ()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        return "\n".join([f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.type}", *self.samples()])
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, description: str, labels: Labels = ()):
+        super().__init__(name, description, labels)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterator[str]:
+        for labels, value in list(self._values.items()):
+            yield f"{self.name}{format_labels(self.labels, labels)} {format_value(value)}"
+
+
+class Histogram(Metric):
+    """
+    Observations only increment one bucket, buckets are made cumulative when rendered
+    """
+
+    type = "histogram"
+
+    def __init__(self, name: str, description: str, labels: Labels = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, description, labels)
+        self.buckets = buckets
+        # per label set, one count per bucket plus +Inf, followed by the sum
+        self._series: dict[Labels, list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self) -> Iterator[str]:
+        for labels, series in list(self._series.items()):
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, "+Inf"), series):
+                cumulative += count
+                bucket_labels = format_labels(self.labels, labels, f'le="{bound}"')
+                yield f"{self.name}_bucket{bucket_labels} {format_value(cumulative)}"
+            yield f"{self.name}_sum{format_labels(self.labels, labels)} {format_value(series[-1])}"
+            yield f"{self.name}_count{format_labels(self.labels, labels)} {format_value(cumulative)}"
+
+
+class CallbackMetric(Metric):
+    """
+    Gauge or counter read from its source at scrape time, so nothing is recorded on the request path
+    """
+
+    def __init__(self, name: str, description: str, type: str, collect: Callable[[], Iterable[tuple[Labels, float]]], labels: Labels = ()):
+        super().__init__(name, description, labels)
+        self.type = type
+        self.collect = collect
+
+    def samples(self) -> Iterator[str]:
+        for labels, value in self.collect():
+            yield f"{self.name}{format_labels(self.labels, labels)} {format_value(value)}"
+
+
+class MetricsRegistry:
+    """
+    In-process registry rendered in the Prometheus text format
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, description: str, labels: Labels = ()) -> Counter:
+        return self.register(Counter(name, description, labels))  # type: ignore[return-value]
+
+    def histogram(self, name: str, description: str, labels: Labels = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, description, labels, buckets))  # type: ignore[return-value]
+
+    def gauge_callback(self, name: str, description: str, collect: Callable[[], Iterable[tuple[Labels, float]]], labels: Labels = ()) -> Metric:
+        return self.register(CallbackMetric(name, description, "gauge", collect, labels))
+
+    def counter_callback(self, name: str, description: str, collect: Callable[[], Iterable[tuple[Labels, float]]], labels: Labels = ()) -> Metric:
+        return self.register(CallbackMetric(name, description, "counter", collect, labels))
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = MetricsRegistry()
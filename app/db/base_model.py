@@ -10,6 +10,6 @@ class BaseDBModel(DeclarativeBase):
 
     __abstract__ = True
 
-    @declared_attr
-    def __tablename__(cls):
+    @declared_attr.directive
+    def __tablename__(cls) -> str:
         return cls.__name__.lower()
@@ -0,0 +1,96 @@
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, QueuePool
+
+from app.core.metrics import registry
+
+PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|\?")
+PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+WHITESPACE = re.compile(r"\s+")
+
+POOL_CHECKOUT_DURATION = registry.histogram("db_pool_checkout_duration_seconds", "Time spent waiting for a pooled connection, including new connections")
+
+
+@dataclass
+class QueryStats:
+    """
+    Statements a single request sent to the database
+    """
+
+    label: str = ""
+    statements: int = 0
+    duration: float = 0.0
+    fingerprints: Counter[str] = field(default_factory=Counter)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [(statement, count) for statement, count in self.fingerprints.most_common() if count > threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.2f};desc="{self.statements} queries"'
+
+
+query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> str:
+    """
+    Shape of a statement, parameter values and the length of IN lists don't change it
+    """
+    shape = PLACEHOLDER_LIST.sub("?", PLACEHOLDER.sub("?", statement))
+    return WHITESPACE.sub(" ", shape).strip()
+
+
+def instrument(engine: Engine) -> None:
+    """
+    Adds every statement the engine executes to the `QueryStats` of the current request, if there is one
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        started = conn.info["query_started"].pop()
+        stats = query_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.duration += time.perf_counter() - started
+            stats.fingerprints[fingerprint(statement)] += 1
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context: Any) -> None:
+        if context.connection is not None and context.connection.info.get("query_started"):
+            context.connection.info["query_started"].pop()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Records how long each checkout waits for a free or new connection
+    """
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_DURATION.observe(time.perf_counter() - started)
+
+
+def register_pool_metrics(pools: dict[str, QueuePool]) -> None:
+    def collect(read: Callable[[QueuePool], int]) -> Callable[[], list[tuple[tuple[str, ...], float]]]:
+        return lambda: [((name,), read(pool)) for name, pool in pools.items()]
+
+    registry.gauge_callback("db_pool_size", "Configured number of pooled connections", collect(QueuePool.size), labels=("pool",))
+    registry.gauge_callback("db_pool_checked_out", "Connections currently in use", collect(QueuePool.checkedout), labels=("pool",))
+    registry.gauge_callback("db_pool_checked_in", "Idle connections in the pool", collect(QueuePool.checkedin), labels=("pool",))
+    registry.gauge_callback("db_pool_overflow", "Connections opened beyond the pool size, negative while the pool isn't full", collect(QueuePool.overflow), labels=("pool",))
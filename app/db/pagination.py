@@ -0,0 +1,83 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Integer, Select, bindparam, tuple_
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """
+    Position of the last row of a page: the value of the active order key plus the uuid tiebreaker
+    """
+
+    key: Any
+    uuid: UUID
+    order: str
+
+
+def encode_cursor(key: Any, uuid: UUID, order: str) -> str:
+    payload = json.dumps({"k": key, "u": str(uuid), "o": order}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(value: str, order: str) -> Cursor:
+    """
+    Decodes an opaque cursor, rejecting cursors issued for a different ordering
+    """
+    try:
+        padded = value + "=" * (-len(value) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        cursor = Cursor(key=payload["k"], uuid=UUID(payload["u"]), order=payload["o"])
+    except (binascii.Error, json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError, ValueError) as e:
+        raise InvalidCursorError("Malformed pagination cursor") from e
+
+    if cursor.order != order:
+        raise InvalidCursorError(f"Cursor was issued for ordering '{cursor.order}', not '{order}'")
+    return cursor
+
+
+def keyset_order(key_column: Any, uuid_column: Any, descending: bool = False) -> list:
+    """
+    Total ordering used by keyset pages, the order key followed by the uuid tiebreaker
+    """
+    if descending:
+        return [key_column.desc(), uuid_column.desc()]
+    return [key_column.asc(), uuid_column.asc()]
+
+
+def keyset_filter(key_column: Any, uuid_column: Any, descending: bool = False) -> ColumnElement[bool]:
+    """
+    Rows strictly after the cursor bound to `after_key` and `after_uuid`, in the ordering produced by `keyset_order`.
+    The row-value comparison lets Postgres seek directly into a (key, uuid) index, so deep pages cost the same as the first one.
+    The key column must not be NULL, coalesce nullable columns before paginating on them.
+    """
+    position = tuple_(key_column, uuid_column)
+    cursor = tuple_(bindparam("after_key", type_=key_column.type), bindparam("after_uuid", type_=uuid_column.type))
+    if descending:
+        return position < cursor
+    return position > cursor
+
+
+def paginate(query: Select, key_column: Any, uuid_column: Any, keyset: bool, descending: bool = False) -> Select:
+    """
+    Orders and limits a page query, starting after a keyset cursor or at an offset.
+    Every value is a bound parameter filled by `page_params`, so the statement can be built once and reused for every page.
+    """
+    query = query.order_by(*keyset_order(key_column, uuid_column, descending)).limit(bindparam("limit", type_=Integer))
+    if keyset:
+        return query.where(keyset_filter(key_column, uuid_column, descending))
+    return query.offset(bindparam("skip", type_=Integer))
+
+
+def page_params(skip: int, limit: int, after: Cursor | None) -> dict[str, Any]:
+    if after:
+        return {"limit": limit, "after_key": after.key, "after_uuid": after.uuid}
+    return {"limit": limit, "skip": skip}
@@ -0,0 +1,23 @@
+from dataclasses import dataclass, replace
+from typing import Iterable
+
+
+@dataclass(frozen=True)
+class Projection:
+    """
+    Optional columns and relations a caller actually reads, so repositories can leave the others out of the query
+    """
+
+    columns: frozenset[str] = frozenset()
+    relations: frozenset[str] = frozenset()
+
+    @classmethod
+    def from_fields(cls, fields: Iterable[str], columns: Iterable[str], relations: Iterable[str]) -> "Projection":
+        selected = set(fields)
+        return cls(columns=frozenset(selected.intersection(columns)), relations=frozenset(selected.intersection(relations)))
+
+    def with_columns(self, *columns: str) -> "Projection":
+        return replace(self, columns=self.columns.union(columns))
+
+    def cache_key(self) -> str:
+        return f"{','.join(sorted(self.columns))}|{','.join(sorted(self.relations))}"
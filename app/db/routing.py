@@ -0,0 +1,81 @@
+from itertools import count
+from typing import Any
+
+from sqlalchemy import Engine, Select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+# replica selection strategies
+ROUND_ROBIN = "round_robin"
+LEAST_BUSY = "least_busy"
+
+# how read-only sessions run their statements: without BEGIN/COMMIT, in one READ ONLY transaction, or in a regular transaction
+AUTOCOMMIT = "autocommit"
+READ_ONLY_TRANSACTION = "transaction"
+READ_ONLY_OFF = "off"
+
+READ_ONLY_OPTIONS: dict[str, dict[str, Any]] = {
+    AUTOCOMMIT: {"isolation_level": "AUTOCOMMIT"},
+    READ_ONLY_TRANSACTION: {"postgresql_readonly": True},
+    READ_ONLY_OFF: {},
+}
+
+
+class EngineRouter:
+    """
+    The primary engine and the engines read-only sessions pick from, the read replicas or the primary itself.
+    Read engines share the pool of the engine they derive from and only differ in their execution options.
+    """
+
+    def __init__(self, primary: AsyncEngine, replicas: list[AsyncEngine], strategy: str = ROUND_ROBIN, read_only_mode: str = AUTOCOMMIT):
+        self.primary = primary
+        self.replicas = replicas
+        self.strategy = strategy
+        self.read_only_mode = read_only_mode
+        self.read_engines = {mode: [engine.execution_options(**options) for engine in replicas or [primary]] for mode, options in READ_ONLY_OPTIONS.items()}
+        self._turns = count()
+
+    def reader(self, mode: str | None = None) -> AsyncEngine:
+        engines = self.read_engines[mode or self.read_only_mode]
+        if self.strategy == LEAST_BUSY:
+            return min(engines, key=lambda engine: engine.pool.checkedout())  # type: ignore[attr-defined]
+        return engines[next(self._turns) % len(engines)]
+
+
+def is_read(clause: Any) -> bool:
+    return isinstance(clause, Select) and clause._for_update_arg is None
+
+
+class RoutingSession(Session):
+    """
+    Sends plain SELECTs to one read engine per session and everything else to the primary.
+    Once the session writes, or `info["primary"]` is set for a request that will, it sticks to the primary,
+    so it always reads its own writes.
+    """
+
+    def __init__(self, router: EngineRouter, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.router = router
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Engine:
+        if self.info.get("primary") or self._flushing or not is_read(clause):
+            self.info["primary"] = True
+            return self.router.primary.sync_engine
+
+        if "reader" not in self.info:
+            self.info["reader"] = self.router.reader(self.info.get("read_only_mode"))
+        return self.info["reader"].sync_engine
+
+
+def use_primary(session: Any, primary: bool = True) -> None:
+    """
+    Pins a session to the primary, or releases it for a read-only request before it ran any statement
+    """
+    session.info["primary"] = primary
+
+
+def use_read_only_mode(session: Any, mode: str) -> None:
+    """
+    Overrides `READ_ONLY_SESSIONS` for a session before it ran any statement
+    """
+    session.info["read_only_mode"] = mode
@@ -1,34 +1,72 @@
 from collections.abc import AsyncGenerator
+from typing import cast
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
+from app.cache.result_cache import result_cache
 from app.core.config import settings
 from app.core.logging_setup import logger
+from app.db.instrumentation import TimedQueuePool, instrument, register_pool_metrics
+from app.db.routing import EngineRouter, RoutingSession, use_primary
 
-engine = create_async_engine(
-    settings.DATABASE_URL or "",
-    echo=settings.ECHO,
-    pool_size=settings.POOL_SIZE,
-    max_overflow=settings.MAX_OVERFLOW,
-    pool_recycle=600,
-    pool_pre_ping=True,
-)
+# requests with these methods can't write, so their sessions only read, possibly from a replica
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
 
-AsyncSessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
 
+def create_engine(url: str) -> AsyncEngine:
+    connect_args: dict = {"prepared_statement_cache_size": settings.PREPARED_STATEMENT_CACHE_SIZE}
+    if settings.PLAN_CACHE_MODE:
+        connect_args["server_settings"] = {"plan_cache_mode": settings.PLAN_CACHE_MODE}
 
-async def get_db() -> AsyncGenerator:
+    return create_async_engine(
+        url,
+        echo=settings.ECHO,
+        pool_size=settings.POOL_SIZE,
+        max_overflow=settings.MAX_OVERFLOW,
+        pool_recycle=600,
+        pool_pre_ping=True,
+        poolclass=TimedQueuePool,
+        query_cache_size=settings.QUERY_CACHE_SIZE,
+        connect_args=connect_args,
+    )
+
+
+engine = create_engine(settings.DATABASE_URL or "")
+replica_engines = [create_engine(url.strip()) for url in (settings.DATABASE_REPLICA_URLS or "").split(",") if url.strip()]
+router = EngineRouter(engine, replica_engines, settings.REPLICA_SELECTION, settings.READ_ONLY_SESSIONS)
+
+# every engine is created with poolclass=TimedQueuePool
+engines = {"primary": engine, **{f"replica_{index}": replica for index, replica in enumerate(replica_engines)}}
+register_pool_metrics({name: cast(TimedQueuePool, pooled_engine.pool) for name, pooled_engine in engines.items()})
+
+if settings.SQL_INSTRUMENTATION:
+    for instrumented_engine in (engine, *replica_engines):
+        instrument(instrumented_engine.sync_engine)
+
+# sessions check out a connection on their first statement, requests that never query don't touch the pool
+AsyncSessionLocal = async_sessionmaker(class_=AsyncSession, sync_session_class=RoutingSession, router=router, expire_on_commit=False, autoflush=False)
+
+
+async def get_db(request: Request) -> AsyncGenerator:
     """
-    Dependency to get an async database session
+    Dependency to get an async database session. Sessions of GET requests are read-only: they may be served by a replica
+    and skip the commit, so with `READ_ONLY_SESSIONS=autocommit` they never send BEGIN or COMMIT.
     """
     async with AsyncSessionLocal() as session:
+        if request.method not in READ_METHODS:
+            use_primary(session)
         try:
             yield session
         except Exception as e:
             await session.rollback()
+            result_cache.discard_invalidations(session)
             logger.error(e, exc_info=e)
             raise e
         else:
-            await session.commit()
+            # sessions that wrote are on the primary, read-only ones have nothing to commit
+            if session.info.get("primary"):
+                await session.commit()
+                await result_cache.flush_invalidations(session)
         finally:
             await session.close()
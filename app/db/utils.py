@@ -1,20 +1,67 @@
 from typing import Any, Sequence
 
-from sqlalchemy import Executable, Row
+from sqlalchemy import ColumnElement, Executable, Float, Integer, Row, ScalarSelect, Select, String, Text, bindparam, case, cast, column, func, literal, literal_column, select, table
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
-async def get_all_scalars(db: AsyncSession, query: Executable) -> Sequence[Any]:
-    return (await db.execute(query)).scalars().all()
+async def get_all_scalars(db: AsyncSession, query: Executable, params: dict[str, Any] | None = None) -> Sequence[Any]:
+    return (await db.execute(query, params)).scalars().all()
 
 
-async def get_all(db: AsyncSession, query: Executable) -> Sequence[Row[Any]]:
-    return (await db.execute(query)).all()
+async def get_all(db: AsyncSession, query: Executable, params: dict[str, Any] | None = None) -> Sequence[Row[Any]]:
+    return (await db.execute(query, params)).all()
 
 
-async def scalar(db: AsyncSession, query: Executable) -> Any | None:
-    return await db.scalar(query)
+async def scalar(db: AsyncSession, query: Executable, params: dict[str, Any] | None = None) -> Any | None:
+    return await db.scalar(query, params)
 
 
 async def execute(db: AsyncSession, query: Executable, *args, **kwargs) -> Any | None:
     return await db.execute(query, *args, **kwargs)
+
+
+pg_class = table("pg_class", column("oid"), column("reltuples", Float), column("relpages", Integer))
+
+# the planner's own table size estimate: rows per page as of the last ANALYZE times the pages the table has now.
+# A plain SELECT, so read-only sessions run it on their replica like the queries it replaces.
+ESTIMATED_ROWS = select(
+    case(
+        (pg_class.c.relpages > 0, pg_class.c.reltuples / pg_class.c.relpages * (func.pg_relation_size(pg_class.c.oid) / func.current_setting("block_size").cast(Integer))),
+        else_=pg_class.c.reltuples,
+    )
+).where(pg_class.c.oid == func.to_regclass(bindparam("table", type_=String)))
+
+
+async def estimated_count(db: AsyncSession, table: str) -> int | None:
+    """
+    Row count of a whole table from the statistics, without scanning it. None when the table was never analyzed.
+    """
+    estimate = await scalar(db, ESTIMATED_ROWS, {"table": table})
+    return round(estimate) if estimate is not None and estimate >= 0 else None
+
+
+def version_digest(uuid_column: Any, version_column: Any) -> ColumnElement[str]:
+    """
+    md5 of the (uuid, version) pairs of the aggregated rows, it changes when one of them is written, added or removed.
+    NULL when there are none.
+    """
+    pair = cast(uuid_column, String) + ":" + cast(version_column, String)
+    return func.md5(func.string_agg(pair, aggregate_order_by(literal(","), uuid_column)))
+
+
+def json_row(query: Select) -> ScalarSelect:
+    """
+    JSON text of the single row of `query`, keyed by its column labels in order. Postgres renders it compact, as
+    pydantic would, so it can be sent without decoding it.
+    """
+    document = query.subquery("document")
+    return select(cast(func.row_to_json(document.table_valued()), Text)).scalar_subquery()
+
+
+def json_rows(query: Select) -> ScalarSelect:
+    """
+    JSON array of the rows of `query`, an empty array when there are none. Meant to be nested in `json_row`.
+    """
+    items = query.subquery("item")
+    return select(func.coalesce(func.array_to_json(func.array_agg(func.row_to_json(items.table_valued()))), literal_column("'[]'::json"))).scalar_subquery()
@@ -0,0 +1,64 @@
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from inspect import isawaitable
+from typing import Any
+
+from strawberry.extensions import SchemaExtension
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.graphql.extensions.persisted_queries import persisted_query_store, query_hash
+from graphql import GraphQLResolveInfo
+
+OPERATION_DURATION = registry.histogram("graphql_operation_duration_seconds", "GraphQL operation latency", labels=("operation", "type"))
+RESOLVER_DURATION = registry.histogram("graphql_resolver_duration_seconds", "GraphQL resolver latency", labels=("type", "field"))
+METRIC_OPERATIONS = frozenset(name.strip() for name in (settings.GRAPHQL_METRIC_OPERATIONS or "").split(",") if name.strip())
+
+
+def operation_label(name: str | None, query: str | None) -> str:
+    """
+    Operation names are chosen by clients, so they only become label values when listed in `GRAPHQL_METRIC_OPERATIONS`
+    or sent with a pre-registered persisted query, anything else is counted as "other" to keep the series bounded
+    """
+    if not name:
+        return "anonymous"
+    if name in METRIC_OPERATIONS or (query is not None and query_hash(query) in persisted_query_store.allowlist):
+        return name
+    return "other"
+
+
+class GraphQLMetrics(SchemaExtension):
+    """
+    Records the latency of every operation by its bounded name label and of every field with a resolver.
+    Plain attribute fields are passed straight through, so large result lists don't add an observation per value.
+    """
+
+    def on_operation(self) -> Iterator[None]:
+        started = time.perf_counter()
+        yield
+        execution_context = self.execution_context
+        try:
+            operation_type = execution_context.operation_type.value
+            operation = operation_label(execution_context.operation_name, execution_context.query)
+        except RuntimeError:
+            # documents that failed to parse, or without the requested operation
+            operation_type, operation = "unknown", "other"
+        OPERATION_DURATION.observe(time.perf_counter() - started, operation, operation_type)
+
+    def resolve(self, _next: Callable, root: Any, info: GraphQLResolveInfo, *args: Any, **kwargs: Any) -> Any:
+        definition = info.parent_type.fields[info.field_name].extensions.get("strawberry-definition")
+        if definition is None or definition.base_resolver is None:
+            return _next(root, info, *args, **kwargs)
+
+        started = time.perf_counter()
+        result = _next(root, info, *args, **kwargs)
+        if isawaitable(result):
+            return self._observe_awaitable(result, started, info)
+        RESOLVER_DURATION.observe(time.perf_counter() - started, info.parent_type.name, info.field_name)
+        return result
+
+    async def _observe_awaitable(self, result: Awaitable, started: float, info: GraphQLResolveInfo) -> Any:
+        try:
+            return await result
+        finally:
+            RESOLVER_DURATION.observe(time.perf_counter() - started, info.parent_type.name, info.field_name)
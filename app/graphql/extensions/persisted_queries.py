@@ -0,0 +1,153 @@
+import hashlib
+import json
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from strawberry.extensions import SchemaExtension
+
+from app.core.config import settings
+from app.core.logging_setup import logger
+from graphql import DocumentNode, GraphQLError
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+@dataclass
+class CachedDocument:
+    document: DocumentNode
+    validated: bool = False
+
+
+class LRUStore:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class PersistedQueryStore:
+    """
+    Process-wide registry of persisted query texts and of parsed, validated documents keyed by their sha256 hash
+    """
+
+    def __init__(self, max_documents: int, allowlist_only: bool = False, allowlist: dict[str, str] | None = None):
+        self.allowlist_only = allowlist_only
+        self.allowlist = allowlist or {}
+        self.queries = LRUStore(max_documents)
+        self.documents = LRUStore(max_documents)
+
+    def get_query(self, sha256_hash: str) -> str | None:
+        return self.allowlist.get(sha256_hash) or (None if self.allowlist_only else self.queries.get(sha256_hash))
+
+    def register(self, sha256_hash: str, query: str) -> None:
+        if sha256_hash not in self.allowlist:
+            self.queries.set(sha256_hash, query)
+
+    def is_allowed(self, sha256_hash: str) -> bool:
+        return not self.allowlist_only or sha256_hash in self.allowlist
+
+
+def load_allowlist(path: str | None) -> dict[str, str]:
+    """
+    Reads a JSON manifest mapping sha256 hashes to query documents, rejecting entries whose hash doesn't match
+    """
+    if not path:
+        return {}
+
+    with open(path) as manifest_file:
+        manifest: dict[str, str] = json.load(manifest_file)
+
+    allowlist = {}
+    for sha256_hash, query in manifest.items():
+        if query_hash(query) != sha256_hash:
+            logger.error(f"Skipping persisted query {sha256_hash}: hash doesn't match the document")
+            continue
+        allowlist[sha256_hash] = query
+    return allowlist
+
+
+persisted_query_store = PersistedQueryStore(
+    max_documents=settings.GRAPHQL_DOCUMENT_CACHE_SIZE,
+    allowlist_only=settings.GRAPHQL_PERSISTED_QUERIES_ONLY,
+    allowlist=load_allowlist(settings.GRAPHQL_PERSISTED_QUERIES_FILE),
+)
+
+
+class PersistedQueries(SchemaExtension):
+    """
+    Automatic persisted queries (the Apollo `persistedQuery` protocol) plus a parse/validate cache.
+    Repeat documents skip parsing and validation entirely, in allowlist mode only pre-registered hashes execute.
+    """
+
+    store = persisted_query_store
+    sha256_hash: str | None = None
+
+    def on_operation(self) -> Iterator[None]:
+        execution_context = self.execution_context
+        query = execution_context.query
+        persisted_query = (execution_context.operation_extensions or {}).get("persistedQuery")
+
+        if persisted_query:
+            if persisted_query.get("version") != 1:
+                raise GraphQLError("Unsupported persisted query version", extensions={"code": "PERSISTED_QUERY_NOT_SUPPORTED"})
+
+            self.sha256_hash = str(persisted_query.get("sha256Hash", ""))
+            if query is None:
+                query = self.store.get_query(self.sha256_hash)
+                if query is None:
+                    raise GraphQLError("PersistedQueryNotFound", extensions={"code": "PERSISTED_QUERY_NOT_FOUND"})
+                execution_context.query = query
+            elif query_hash(query) != self.sha256_hash:
+                raise GraphQLError("provided sha does not match query", extensions={"code": "PERSISTED_QUERY_HASH_MISMATCH"})
+        elif query is not None:
+            self.sha256_hash = query_hash(query)
+        else:
+            yield
+            return
+
+        if len(query) > settings.GRAPHQL_MAX_QUERY_LENGTH:
+            raise GraphQLError(f"Query document exceeds {settings.GRAPHQL_MAX_QUERY_LENGTH} characters", extensions={"code": "QUERY_TOO_LARGE"})
+        if not self.store.is_allowed(self.sha256_hash):
+            raise GraphQLError("PersistedQueryNotAllowed", extensions={"code": "PERSISTED_QUERY_NOT_ALLOWED"})
+        if persisted_query:
+            self.store.register(self.sha256_hash, query)
+
+        yield
+
+    def on_parse(self) -> Iterator[None]:
+        if self.sha256_hash is None:
+            yield
+            return
+
+        cached = self.store.documents.get(self.sha256_hash)
+        if cached is not None:
+            self.execution_context.graphql_document = cached.document
+        yield
+
+        if cached is None and self.execution_context.graphql_document is not None:
+            self.store.documents.set(self.sha256_hash, CachedDocument(self.execution_context.graphql_document))
+
+    def on_validate(self) -> Iterator[None]:
+        cached = self.store.documents.get(self.sha256_hash) if self.sha256_hash else None
+        if cached is not None and cached.validated:
+            # an empty error list tells strawberry validation already ran
+            self.execution_context.pre_execution_errors = []
+        yield
+
+        if cached is not None and not cached.validated and self.execution_context.pre_execution_errors == []:
+            cached.validated = True
@@ -0,0 +1,134 @@
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from graphql.execution.values import get_argument_values
+from strawberry.extensions import SchemaExtension
+
+from app.core.config import settings
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLObjectType,
+    GraphQLSchema,
+    InlineFragmentNode,
+    SelectionSetNode,
+    get_named_type,
+    get_nullable_type,
+    get_operation_ast,
+    is_composite_type,
+    is_list_type,
+)
+
+# arguments that bound how many items a field returns
+SIZE_ARGUMENTS = ("first", "limit")
+
+
+@dataclass
+class QueryCost:
+    cost: int = 0
+    depth: int = 0
+
+
+class CostEstimator:
+    """
+    Static cost of an operation, roughly the number of objects it can return.
+    Every object costs 1, scalars are free and list fields multiply their sub-selection by their `first`/`limit`
+    argument, or by `default_list_size` when unbounded. Batch mutations are sized by the length of their list argument.
+    A size argument on a non-list field (a connection or a batch result) applies to the lists directly beneath it.
+    """
+
+    def __init__(self, schema: GraphQLSchema, fragments: dict[str, FragmentDefinitionNode], variables: dict[str, Any] | None, default_list_size: int):
+        self.schema = schema
+        self.fragments = fragments
+        self.variables = variables or {}
+        self.default_list_size = default_list_size
+
+    def estimate(self, parent_type: GraphQLObjectType, selection_set: SelectionSetNode, depth: int = 0, list_size: int | None = None) -> QueryCost:
+        total = QueryCost(depth=depth)
+
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                field_cost = self._field_cost(parent_type, selection, depth, list_size)
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = self.schema.get_type(selection.type_condition.name.value) if selection.type_condition else parent_type
+                field_cost = self.estimate(fragment_type, selection.selection_set, depth, list_size)  # type: ignore[arg-type]
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment = self.fragments[selection.name.value]
+                fragment_type = self.schema.get_type(fragment.type_condition.name.value)
+                field_cost = self.estimate(fragment_type, fragment.selection_set, depth, list_size)  # type: ignore[arg-type]
+            else:
+                continue
+
+            total.cost += field_cost.cost
+            total.depth = max(total.depth, field_cost.depth)
+        return total
+
+    def _field_cost(self, parent_type: GraphQLObjectType, node: FieldNode, depth: int, list_size: int | None) -> QueryCost:
+        field_name = node.name.value
+        field_def = parent_type.fields.get(field_name)
+        # introspection fields are served from the schema, not the database
+        if field_name.startswith("__") or field_def is None:
+            return QueryCost(depth=depth)
+
+        named_type = get_named_type(field_def.type)
+        if not is_composite_type(named_type) or node.selection_set is None:
+            return QueryCost(depth=depth + 1)
+
+        arguments = get_argument_values(field_def, node, self.variables)
+        size = next((max(arguments[name], 0) for name in SIZE_ARGUMENTS if isinstance(arguments.get(name), int)), None)
+        if size is None and parent_type is self.schema.mutation_type:
+            size = next((len(value) for value in arguments.values() if isinstance(value, list)), None)
+
+        if is_list_type(get_nullable_type(field_def.type)):
+            multiplier = size if size is not None else list_size if list_size is not None else self.default_list_size
+            child_list_size = None
+        else:
+            multiplier = 1
+            child_list_size = size
+
+        children = self.estimate(named_type, node.selection_set, depth + 1, child_list_size)  # type: ignore[arg-type]
+        return QueryCost(cost=multiplier * (1 + children.cost), depth=children.depth)
+
+
+class QueryCostLimiter(SchemaExtension):
+    """
+    Rejects operations whose estimated cost or depth exceeds the configured budget before any resolver runs,
+    and reports the estimate under `extensions.cost` of every response.
+    """
+
+    max_cost = settings.GRAPHQL_MAX_QUERY_COST
+    max_depth = settings.GRAPHQL_MAX_QUERY_DEPTH
+    default_list_size = settings.GRAPHQL_DEFAULT_LIST_SIZE
+    query_cost: QueryCost | None = None
+
+    def on_execute(self) -> Iterator[None]:
+        execution_context = self.execution_context
+        document = execution_context.graphql_document
+        operation = get_operation_ast(document, execution_context.operation_name) if document else None
+        root_type = execution_context.schema._schema.get_root_type(operation.operation) if operation else None
+
+        if operation is not None and root_type is not None:
+            fragments = {definition.name.value: definition for definition in document.definitions if isinstance(definition, FragmentDefinitionNode)}  # type: ignore[union-attr]
+            estimator = CostEstimator(execution_context.schema._schema, fragments, execution_context.variables, self.default_list_size)
+            self.query_cost = estimator.estimate(root_type, operation.selection_set)
+
+            if self.query_cost.depth > self.max_depth:
+                raise GraphQLError(f"Query depth {self.query_cost.depth} exceeds the maximum of {self.max_depth}", extensions={"code": "QUERY_TOO_DEEP"})
+            if self.query_cost.cost > self.max_cost:
+                raise GraphQLError(f"Query cost {self.query_cost.cost} exceeds the maximum of {self.max_cost}", extensions={"code": "QUERY_TOO_COMPLEX"})
+        yield
+
+    def get_results(self) -> dict[str, Any]:
+        if self.query_cost is None:
+            return {}
+        return {
+            "cost": {
+                "requestedQueryCost": self.query_cost.cost,
+                "maximumAvailable": self.max_cost,
+                "depth": self.query_cost.depth,
+                "maximumDepth": self.max_depth,
+            }
+        }
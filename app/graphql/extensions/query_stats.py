@@ -0,0 +1,34 @@
+from collections.abc import Iterator
+from typing import Any
+
+from strawberry.extensions import SchemaExtension
+
+from app.core.config import settings
+from app.db.instrumentation import query_stats
+
+
+class QueryStatsExtension(SchemaExtension):
+    """
+    Reports the SQL statements of the operation under `extensions.sql`, statements repeated more than
+    `SQL_REPEATED_STATEMENT_THRESHOLD` times are listed with their count
+    """
+
+    threshold = settings.SQL_REPEATED_STATEMENT_THRESHOLD
+
+    def on_operation(self) -> Iterator[None]:
+        stats = query_stats.get()
+        if stats is not None and self.execution_context.operation_name:
+            stats.label = f"{stats.label} {self.execution_context.operation_name}"
+        yield
+
+    def get_results(self) -> dict[str, Any]:
+        stats = query_stats.get()
+        if stats is None:
+            return {}
+        return {
+            "sql": {
+                "statements": stats.statements,
+                "durationMs": round(stats.duration * 1000, 3),
+                "repeated": [{"statement": statement, "count": count} for statement, count in stats.repeated(self.threshold)],
+            }
+        }
@@ -0,0 +1,20 @@
+from collections.abc import Iterator
+
+from strawberry.extensions import SchemaExtension
+from strawberry.types.graphql import OperationType
+
+from app.db.routing import use_primary
+
+
+class SessionRouting(SchemaExtension):
+    """
+    GraphQL queries arrive as POST requests, which pin the session to the primary. Once the operation is known,
+    queries are released to a read-only session, possibly on a replica, while mutations keep the primary.
+    """
+
+    def on_execute(self) -> Iterator[None]:
+        context = self.execution_context.context
+        db = getattr(context, "db", None)
+        if db is not None:
+            use_primary(db, self.execution_context.operation_type != OperationType.QUERY)
+        yield
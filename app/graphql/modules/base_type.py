@@ -1,10 +1,25 @@
-from typing import Type, TypeVar
+from enum import Enum
+from typing import Callable, Generic, Iterable, Type, TypeVar
 
 from pydantic import BaseModel
+from strawberry import Info, enum
 from strawberry import type as strawberry_type
+from strawberry.types.nodes import SelectedField, Selection
+from strawberry.utils.str_converters import to_snake_case
+
+from app.rest.schemas.base_schema import Page
 
 T = TypeVar("T", bound="StrawberryPydanticType")
 PydanticModel = TypeVar("PydanticModel", bound=BaseModel)
+NodeT = TypeVar("NodeT")
+
+MAX_PAGE_SIZE = 100
+
+
+@enum
+class TotalModeEnum(Enum):
+    exact = "exact"
+    estimated = "estimated"
 
 
 @strawberry_type
@@ -13,6 +28,58 @@ class StatusResponse:
     message: str
 
 
+@strawberry_type
+class PageInfo:
+    has_next_page: bool
+    has_previous_page: bool
+    start_cursor: str | None
+    end_cursor: str | None
+
+
+@strawberry_type
+class Edge(Generic[NodeT]):
+    cursor: str
+    node: NodeT
+
+
+@strawberry_type
+class Connection(Generic[NodeT]):
+    edges: list[Edge[NodeT]]
+    page_info: PageInfo
+    # only counted when selected
+    total_count: int | None = None
+
+    @classmethod
+    def from_page(cls, page: Page, node: Callable, has_previous_page: bool = False, total_count: int | None = None) -> "Connection[NodeT]":
+        edges = [Edge(cursor=cursor, node=node(item)) for item, cursor in zip(page.items, page.cursors)]
+        page_info = PageInfo(
+            has_next_page=page.next_cursor is not None,
+            has_previous_page=has_previous_page,
+            start_cursor=page.cursors[0] if page.cursors else None,
+            end_cursor=page.cursors[-1] if page.cursors else None,
+        )
+        return cls(edges=edges, page_info=page_info, total_count=total_count)
+
+
+def _fields(selections: Iterable[Selection]) -> Iterable[SelectedField]:
+    for selection in selections:
+        if isinstance(selection, SelectedField):
+            yield selection
+        else:
+            yield from _fields(selection.selections)
+
+
+def selected_field_names(info: Info, *path: str) -> set[str]:
+    """
+    Python names of the fields the client selected under the current field, fragments included.
+    `path` walks down nested fields first, e.g. ("edges", "node") for a connection.
+    """
+    selections: list[Selection] = list(info.selected_fields[0].selections)
+    for name in path:
+        selections = [child for field in _fields(selections) if field.name == name for child in field.selections]
+    return {to_snake_case(field.name) for field in _fields(selections)}
+
+
 class StrawberryPydanticType:
     @classmethod
     def from_pydantic(
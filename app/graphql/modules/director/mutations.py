@@ -2,6 +2,7 @@ from uuid import UUID
 
 from strawberry import ID, Info, mutation, type
 
+from app.cache.result_cache import entity_tag, list_tag
 from app.graphql.modules.base_type import StatusResponse
 from app.graphql.modules.director.types import DirectorCreateInput, DirectorType, DirectorUpdateInput
 from app.rest.schemas.directors import DirectorCreate, DirectorUpdate
@@ -25,6 +26,7 @@ class DirectorMutation:
 
         pydantic_data = DirectorCreate.model_validate(director_input)
         new_director = await service.create_director(pydantic_data)
+        info.context.invalidate_loaders(list_tag("director"))
 
         return DirectorType.from_pydantic(new_director)
 
@@ -42,6 +44,7 @@ class DirectorMutation:
         service: DirectorsService = info.context.director_service
         pydantic_data = DirectorUpdate.model_validate(director_input)
         updated_director = await service.update_director(director_data=pydantic_data)
+        info.context.invalidate_loaders(entity_tag("director", updated_director.uuid), list_tag("director"))
 
         return DirectorType.from_pydantic(updated_director)
 
@@ -60,6 +63,7 @@ class DirectorMutation:
 
         try:
             deleted_director = await service.remove_director(id=UUID(id))
+            info.context.invalidate_loaders(entity_tag("director", deleted_director.uuid), list_tag("director"))
             if deleted_director:
                 return StatusResponse(success=True, message=f"Director {deleted_director.name} deleted successfully.")
             return StatusResponse(success=False, message="Director could not be deleted.")
@@ -1,6 +1,8 @@
 from strawberry import ID, Info, field, type
 
+from app.graphql.modules.base_type import MAX_PAGE_SIZE, Connection, TotalModeEnum, selected_field_names
 from app.graphql.modules.director.types import DirectorType
+from app.rest.schemas.base_schema import TotalMode
 from app.rest.services.directors import DirectorsService
 
 
@@ -13,7 +15,7 @@ class DirectorQuery:
 
         service: DirectorsService = info.context.director_service
 
-        director_data = await service.get_director_by_id(id=id, with_movies=True)
+        director_data = await service.get_director_by_id(id=id, with_movies="movies" in selected_field_names(info))
 
         if not director_data:
             return None
@@ -32,6 +34,26 @@ class DirectorQuery:
 
         service: DirectorsService = info.context.director_service
 
-        directors_data = await service.get_all_directors(skip=skip, limit=limit, with_movies=False)
+        directors_data = await service.get_all_directors(skip=skip, limit=limit, with_movies="movies" in selected_field_names(info))
 
-        return [DirectorType.from_pydantic(d) for d in directors_data]
+        return [DirectorType.from_pydantic(d) for d in directors_data.items]
+
+    @field
+    async def directors_connection(
+        self,
+        info: Info,
+        first: int = 20,
+        after: str | None = None,
+        total: TotalModeEnum = TotalModeEnum.exact,
+    ) -> Connection[DirectorType]:
+        if not info.context.current_user:
+            raise Exception("Not authenticated!")
+        elif not 0 < first <= MAX_PAGE_SIZE:
+            raise Exception(f"first must be between 1 and {MAX_PAGE_SIZE}")
+
+        service: DirectorsService = info.context.director_service
+
+        page = await service.get_all_directors(limit=first, with_movies="movies" in selected_field_names(info, "edges", "node"), cursor=after)
+        total_count = await service.count_directors(TotalMode(total.value)) if "total_count" in selected_field_names(info) else None
+
+        return Connection.from_page(page, DirectorType.from_pydantic, has_previous_page=after is not None, total_count=total_count)
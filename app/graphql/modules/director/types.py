@@ -20,8 +20,12 @@ class DirectorType(StrawberryPydanticType):
         self,
         info: Info,
     ) -> list[MovieInDirectorType] | None:
-        loader = info.context.director_movies_loader
-        movies_list = await loader.load(self.uuid)
+        model = getattr(self, "_original_model", None)
+        if model is not None and "movies" in model.model_fields_set:
+            movies_list = model.movies or []
+        else:
+            loader = info.context.director_movies_loader
+            movies_list = await loader.load(self.uuid)
         return [MovieInDirectorType.from_pydantic(m) for m in movies_list]
 
 
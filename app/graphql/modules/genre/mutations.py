@@ -2,6 +2,7 @@ from uuid import UUID
 
 from strawberry import ID, Info, mutation, type
 
+from app.cache.result_cache import entity_tag, list_tag
 from app.graphql.modules.base_type import StatusResponse
 from app.graphql.modules.genre.types import GenreCreateInput, GenreType, GenreUpdateInput
 from app.rest.schemas.genres import GenreCreate, GenreUpdate
@@ -21,6 +22,7 @@ class GenreMutation:
 
         pydantic_data = GenreCreate.model_validate(genre_input)
         new_genre = await service.create_genre(pydantic_data)
+        info.context.invalidate_loaders(list_tag("genre"))
 
         return GenreType.from_pydantic(new_genre)
 
@@ -35,6 +37,7 @@ class GenreMutation:
 
         pydantic_data = GenreUpdate.model_validate(genre_input)
         updated_genre = await service.update_genre(pydantic_data)
+        info.context.invalidate_loaders(entity_tag("genre", updated_genre.uuid), list_tag("genre"))
 
         return GenreType.from_pydantic(updated_genre)
 
@@ -49,6 +52,7 @@ class GenreMutation:
 
         try:
             deleted_genre = await service.remove_genre(id=UUID(id))
+            info.context.invalidate_loaders(entity_tag("genre", deleted_genre.uuid), list_tag("genre"))
             if deleted_genre:
                 return StatusResponse(success=True, message=f"Genre {deleted_genre.name} deleted successfully.")
             return StatusResponse(success=False, message="Genre could not be deleted.")
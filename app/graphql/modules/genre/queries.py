@@ -2,7 +2,9 @@ from uuid import UUID
 
 from strawberry import ID, Info, field, type
 
+from app.graphql.modules.base_type import MAX_PAGE_SIZE, Connection, TotalModeEnum, selected_field_names
 from app.graphql.modules.genre.types import GenreType
+from app.rest.schemas.base_schema import TotalMode
 from app.rest.services.genres import GenresService
 
 
@@ -15,7 +17,7 @@ class GenreQuery:
 
         service: GenresService = info.context.genre_service
 
-        genre_data = await service.get_genre_by_id(id=UUID(id))
+        genre_data = await service.get_genre_by_id(id=UUID(id), with_movies="movies" in selected_field_names(info))
 
         if not genre_data:
             return None
@@ -34,6 +36,26 @@ class GenreQuery:
 
         service: GenresService = info.context.genre_service
 
-        genres_data = await service.get_all_genres(skip=skip, limit=limit)
+        genres_data = await service.get_all_genres(skip=skip, limit=limit, with_movies="movies" in selected_field_names(info))
 
-        return [GenreType.from_pydantic(g) for g in genres_data]
+        return [GenreType.from_pydantic(g) for g in genres_data.items]
+
+    @field
+    async def genres_connection(
+        self,
+        info: Info,
+        first: int = 20,
+        after: str | None = None,
+        total: TotalModeEnum = TotalModeEnum.exact,
+    ) -> Connection[GenreType]:
+        if not info.context.current_user:
+            raise Exception("Not authenticated!")
+        elif not 0 < first <= MAX_PAGE_SIZE:
+            raise Exception(f"first must be between 1 and {MAX_PAGE_SIZE}")
+
+        service: GenresService = info.context.genre_service
+
+        page = await service.get_all_genres(limit=first, with_movies="movies" in selected_field_names(info, "edges", "node"), cursor=after)
+        total_count = await service.count_genres(TotalMode(total.value)) if "total_count" in selected_field_names(info) else None
+
+        return Connection.from_page(page, GenreType.from_pydantic, has_previous_page=after is not None, total_count=total_count)
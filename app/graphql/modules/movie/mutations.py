@@ -2,12 +2,20 @@ from uuid import UUID
 
 from strawberry import ID, Info, mutation, type
 
+from app.cache.result_cache import entity_tag
 from app.graphql.modules.base_type import StatusResponse
-from app.graphql.modules.movie.types import MovieCreateInput, MovieType, MovieUpdateInput
-from app.rest.schemas.movies import MovieCreate, MovieUpdate
+from app.graphql.modules.movie.types import MovieBatchResultType, MovieCreateInput, MovieType, MovieUpdateInput
+from app.rest.schemas.movies import MovieBatchResult, MovieCreate, MovieUpdate
 from app.rest.services.movies import MovieService
 
 
+def invalidate_batch(info: Info, result: MovieBatchResult) -> None:
+    info.context.invalidate_loaders(
+        *(entity_tag("movie", movie.uuid) for movie in result.movies),
+        *(entity_tag("director", movie.director_id) for movie in result.movies if movie.director_id),
+    )
+
+
 @type
 class MovieMutation:
     @mutation
@@ -21,6 +29,7 @@ class MovieMutation:
 
         pydantic_data = MovieCreate.model_validate(movie_input)
         new_movie = await service.create_movie(pydantic_data)
+        info.context.invalidate_loaders(entity_tag("movie", new_movie.uuid), entity_tag("director", new_movie.director_id))
         return MovieType.from_pydantic(new_movie)
 
     @mutation
@@ -33,6 +42,7 @@ class MovieMutation:
         service: MovieService = info.context.movie_service
         pydantic_data = MovieUpdate.model_validate(movie_input)
         updated_movie = await service.update_movie(pydantic_data)
+        info.context.invalidate_loaders(entity_tag("movie", updated_movie.uuid), entity_tag("director", updated_movie.director_id))
         return MovieType.from_pydantic(updated_movie)
 
     @mutation
@@ -46,8 +56,48 @@ class MovieMutation:
 
         try:
             deleted_movie = await service.remove_movie(id=UUID(id))
+            info.context.invalidate_loaders(entity_tag("movie", deleted_movie.uuid))
             if deleted_movie:
                 return StatusResponse(success=True, message=f"Movie {deleted_movie.title} deleted successfully.")
             return StatusResponse(success=False, message="Movie could not be deleted.")
         except Exception as e:
             return StatusResponse(success=False, message=str(e))
+
+    @mutation
+    async def create_movies(self, info: Info, movie_inputs: list[MovieCreateInput]) -> MovieBatchResultType:
+        if not info.context.current_user:
+            raise Exception("Not authenticated!")
+        elif "admin" not in info.context.current_user.get("scopes", []):
+            raise Exception("Not authorized!")
+
+        service: MovieService = info.context.movie_service
+
+        result = await service.create_movies([MovieCreate.model_validate(movie_input) for movie_input in movie_inputs])
+        invalidate_batch(info, result)
+        return MovieBatchResultType.from_result(result)
+
+    @mutation
+    async def update_movies(self, info: Info, movie_inputs: list[MovieUpdateInput]) -> MovieBatchResultType:
+        if not info.context.current_user:
+            raise Exception("Not authenticated!")
+        elif "admin" not in info.context.current_user.get("scopes", []):
+            raise Exception("Not authorized!")
+
+        service: MovieService = info.context.movie_service
+
+        result = await service.update_movies([MovieUpdate.model_validate(movie_input) for movie_input in movie_inputs])
+        invalidate_batch(info, result)
+        return MovieBatchResultType.from_result(result)
+
+    @mutation
+    async def delete_movies(self, info: Info, ids: list[ID]) -> MovieBatchResultType:
+        if not info.context.current_user:
+            raise Exception("Not authenticated!")
+        elif "admin" not in info.context.current_user.get("scopes", []):
+            raise Exception("Not authorized!")
+
+        service: MovieService = info.context.movie_service
+
+        result = await service.remove_movies([UUID(id) for id in ids])
+        invalidate_batch(info, result)
+        return MovieBatchResultType.from_result(result)
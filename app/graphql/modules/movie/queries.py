@@ -1,7 +1,12 @@
-from pydantic import UUID4
+from uuid import UUID
+
 from strawberry import ID, Info, field, type
 
-from app.graphql.modules.movie.types import MovieExtendedType, MovieOrderEnum, MovieSortEnum
+from app.db.projection import Projection
+from app.graphql.modules.base_type import MAX_PAGE_SIZE, Connection, TotalModeEnum, selected_field_names
+from app.graphql.modules.movie.types import MovieExtendedType, MovieFilterInput, MovieOrderEnum, MovieSortEnum
+from app.rest.repository.movies import MOVIE_COLUMNS, MOVIE_RELATIONS
+from app.rest.schemas.base_schema import TotalMode
 from app.rest.schemas.movies import MovieOrder, MovieSort
 from app.rest.services.movies import MovieService
 
@@ -16,15 +21,56 @@ class MovieQuery:
         limit: int = 100,
         order_by: MovieOrderEnum = MovieOrderEnum.title,
         sort_by: MovieSortEnum = MovieSortEnum.asc,
+        filter: MovieFilterInput | None = None,
     ) -> list[MovieExtendedType]:
         if not info.context.current_user:
             raise Exception("Not authenticated!")
 
         service: MovieService = info.context.movie_service
 
-        movie_data = await service.get_all_movies(skip=skip, limit=limit, order_by=MovieOrder(order_by.value), sort_by=MovieSort(sort_by.value), extended=False)
+        projection = Projection.from_fields(selected_field_names(info), MOVIE_COLUMNS, MOVIE_RELATIONS)
+        movie_data = await service.get_all_movies(
+            skip=skip,
+            limit=limit,
+            order_by=MovieOrder(order_by.value),
+            sort_by=MovieSort(sort_by.value),
+            projection=projection,
+            filters=filter.to_filter() if filter else None,
+        )
+
+        return [MovieExtendedType.from_pydantic(d) for d in movie_data.items]
+
+    @field
+    async def movies_connection(
+        self,
+        info: Info,
+        first: int = 20,
+        after: str | None = None,
+        order_by: MovieOrderEnum = MovieOrderEnum.title,
+        sort_by: MovieSortEnum = MovieSortEnum.asc,
+        filter: MovieFilterInput | None = None,
+        total: TotalModeEnum = TotalModeEnum.exact,
+    ) -> Connection[MovieExtendedType]:
+        if not info.context.current_user:
+            raise Exception("Not authenticated!")
+        elif not 0 < first <= MAX_PAGE_SIZE:
+            raise Exception(f"first must be between 1 and {MAX_PAGE_SIZE}")
+
+        service: MovieService = info.context.movie_service
+
+        filters = filter.to_filter() if filter else None
+        projection = Projection.from_fields(selected_field_names(info, "edges", "node"), MOVIE_COLUMNS, MOVIE_RELATIONS)
+        page = await service.get_all_movies(
+            limit=first,
+            order_by=MovieOrder(order_by.value),
+            sort_by=MovieSort(sort_by.value),
+            cursor=after,
+            projection=projection,
+            filters=filters,
+        )
+        total_count = await service.count_movies(TotalMode(total.value), filters) if "total_count" in selected_field_names(info) else None
 
-        return [MovieExtendedType.from_pydantic(d) for d in movie_data]
+        return Connection.from_page(page, MovieExtendedType.from_pydantic, has_previous_page=after is not None, total_count=total_count)
 
     @field
     async def movie(self, info: Info, id: ID) -> MovieExtendedType:
@@ -33,5 +79,6 @@ class MovieQuery:
 
         service: MovieService = info.context.movie_service
 
-        movie_data = await service.get_movie_by_id(id=UUID4(id), extended=False)
+        projection = Projection.from_fields(selected_field_names(info), MOVIE_COLUMNS, MOVIE_RELATIONS)
+        movie_data = await service.get_movie_by_id(id=UUID(id), projection=projection)
         return MovieExtendedType.from_pydantic(movie_data)
@@ -1,9 +1,11 @@
 from enum import Enum
+from uuid import UUID
 
-from strawberry import Info, auto, enum, experimental, field
+from strawberry import ID, Info, auto, enum, experimental, field, input, type
 
 from app.graphql.modules.base_type import StrawberryPydanticType
-from app.rest.schemas.movies import MovieCreate, MovieExtended, MovieInDB, MovieInDirector, MovieUpdate
+from app.rest.schemas.movies import GenreMatch, MovieBatchError, MovieBatchResult, MovieCreate, MovieExtended, MovieFilter, MovieInDB, MovieInDirector, MovieUpdate
+from graphql import GraphQLError
 
 
 @enum
@@ -18,6 +20,48 @@ class MovieSortEnum(Enum):
     desc = "desc"
 
 
+@enum
+class GenreMatchEnum(Enum):
+    any = "any"
+    all = "all"
+
+
+@input
+class MovieFilterInput:
+    year_from: int | None = None
+    year_to: int | None = None
+    director_ids: list[ID] | None = None
+    genres: list[str] | None = None
+    genre_match: GenreMatchEnum = GenreMatchEnum.any
+    title_prefix: str | None = None
+
+    def to_filter(self) -> MovieFilter:
+        try:
+            director_ids = [UUID(director_id) for director_id in self.director_ids] if self.director_ids is not None else None
+        except ValueError:
+            raise GraphQLError("directorIds must be UUIDs", extensions={"code": "BAD_USER_INPUT"})
+
+        return MovieFilter(
+            year_from=self.year_from,
+            year_to=self.year_to,
+            director_ids=director_ids,
+            genres=self.genres,
+            genre_match=GenreMatch(self.genre_match.value),
+            title_prefix=self.title_prefix,
+        )
+
+
+async def movie_detail(movie: "MovieExtendedType", info: Info, name: str) -> str | None:
+    # details the parent query already joined in are served as is, the rest go through the batched loader
+    model = getattr(movie, "_original_model", None)
+    if model is not None and name in model.model_fields_set:
+        return getattr(model, name)
+
+    loader = info.context.movie_detail_loader
+    details = await loader.load(movie.uuid)
+    return details.get(name)
+
+
 @experimental.pydantic.type(model=MovieCreate)
 class MovieBase:
     title: auto
@@ -43,15 +87,11 @@ class MovieExtendedType(StrawberryPydanticType):
 
     @field
     async def director(self, info: Info) -> str | None:
-        loader = info.context.movie_detail_loader
-        details = await loader.load(self.uuid)
-        return details.get("director")
+        return await movie_detail(self, info, "director")
 
     @field
     async def genre(self, info: Info) -> str | None:
-        loader = info.context.movie_detail_loader
-        details = await loader.load(self.uuid)
-        return details.get("genre")
+        return await movie_detail(self, info, "genre")
 
 
 @experimental.pydantic.type(model=MovieInDirector)
@@ -84,3 +124,23 @@ class MovieUpdateInput:
     release_year: auto
     director_id: auto
     genre: auto
+
+
+@experimental.pydantic.type(model=MovieBatchError)
+class MovieBatchErrorType(StrawberryPydanticType):
+    index: auto
+    id: auto
+    detail: auto
+
+
+@type
+class MovieBatchResultType:
+    movies: list[MovieType]
+    errors: list[MovieBatchErrorType]
+
+    @classmethod
+    def from_result(cls, result: MovieBatchResult) -> "MovieBatchResultType":
+        return cls(
+            movies=[MovieType.from_pydantic(movie) for movie in result.movies],
+            errors=[MovieBatchErrorType.from_pydantic(error) for error in result.errors],
+        )
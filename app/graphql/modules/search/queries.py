@@ -0,0 +1,30 @@
+from strawberry import Info, field, type
+
+from app.graphql.modules.base_type import MAX_PAGE_SIZE, Connection
+from app.graphql.modules.search.types import SearchResultType, SearchTypeEnum
+from app.rest.schemas.search import SearchType
+from app.rest.services.search import SearchService
+
+
+@type
+class SearchQuery:
+    @field
+    async def search(
+        self,
+        info: Info,
+        query: str,
+        types: list[SearchTypeEnum] | None = None,
+        first: int = 20,
+        after: str | None = None,
+    ) -> Connection[SearchResultType]:
+        if not info.context.current_user:
+            raise Exception("Not authenticated!")
+        elif not 0 < first <= MAX_PAGE_SIZE:
+            raise Exception(f"first must be between 1 and {MAX_PAGE_SIZE}")
+
+        service: SearchService = info.context.search_service
+
+        search_types = [SearchType(type.value) for type in types] if types else list(SearchType)
+        page = await service.search(query, search_types, limit=first, cursor=after)
+
+        return Connection.from_page(page, SearchResultType.from_result, has_previous_page=after is not None)
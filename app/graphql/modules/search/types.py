@@ -0,0 +1,25 @@
+from enum import Enum
+from uuid import UUID
+
+from strawberry import enum, type
+
+from app.rest.schemas.search import SearchResult
+
+
+@enum
+class SearchTypeEnum(Enum):
+    movie = "movie"
+    director = "director"
+    genre = "genre"
+
+
+@type
+class SearchResultType:
+    type: SearchTypeEnum
+    uuid: UUID
+    name: str
+    rank: float
+
+    @classmethod
+    def from_result(cls, result: SearchResult) -> "SearchResultType":
+        return cls(type=SearchTypeEnum(result.type.value), uuid=result.uuid, name=result.name, rank=result.rank)
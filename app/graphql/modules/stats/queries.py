@@ -0,0 +1,37 @@
+from strawberry import Info, field, type
+
+from app.graphql.modules.base_type import MAX_PAGE_SIZE
+from app.graphql.modules.stats.types import DecadeCountType, DirectorCountType, GenreCountType
+from app.rest.services.stats import StatsService
+
+
+@type
+class StatsQuery:
+    @field
+    async def genre_stats(self, info: Info) -> list[GenreCountType]:
+        if not info.context.current_user:
+            raise Exception("Not authenticated!")
+
+        service: StatsService = info.context.stats_service
+
+        return [GenreCountType.from_pydantic(count) for count in await service.get_genre_counts()]
+
+    @field
+    async def top_directors(self, info: Info, first: int = 10) -> list[DirectorCountType]:
+        if not info.context.current_user:
+            raise Exception("Not authenticated!")
+        elif not 0 < first <= MAX_PAGE_SIZE:
+            raise Exception(f"first must be between 1 and {MAX_PAGE_SIZE}")
+
+        service: StatsService = info.context.stats_service
+
+        return [DirectorCountType.from_pydantic(count) for count in await service.get_top_directors(first)]
+
+    @field
+    async def decade_stats(self, info: Info) -> list[DecadeCountType]:
+        if not info.context.current_user:
+            raise Exception("Not authenticated!")
+
+        service: StatsService = info.context.stats_service
+
+        return [DecadeCountType.from_pydantic(count) for count in await service.get_decade_counts()]
@@ -0,0 +1,24 @@
+from strawberry import auto, experimental
+
+from app.graphql.modules.base_type import StrawberryPydanticType
+from app.rest.schemas.stats import DecadeCount, DirectorCount, GenreCount
+
+
+@experimental.pydantic.type(model=GenreCount)
+class GenreCountType(StrawberryPydanticType):
+    uuid: auto
+    name: auto
+    movie_count: auto
+
+
+@experimental.pydantic.type(model=DirectorCount)
+class DirectorCountType(StrawberryPydanticType):
+    uuid: auto
+    name: auto
+    movie_count: auto
+
+
+@experimental.pydantic.type(model=DecadeCount)
+class DecadeCountType(StrawberryPydanticType):
+    decade: auto
+    movie_count: auto
@@ -1,13 +1,40 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 
-from .api import graphql_app, rest_router
+from .api import graphql_app, metrics, rest_router
+from .api.middleware import AdmissionMiddleware, MetricsMiddleware, QueryStatsMiddleware
+from .core.config import settings
+from .rest.services.stats import refresh_stats_periodically
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    stats_refresher = asyncio.create_task(refresh_stats_periodically(settings.STATS_REFRESH_INTERVAL)) if settings.STATS_REFRESH_INTERVAL > 0 else None
+    yield
+    if stats_refresher:
+        stats_refresher.cancel()
+        with suppress(asyncio.CancelledError):
+            await stats_refresher
+
 
 app = FastAPI(
     title="REST vs GraphQL Showdown",
     description="A FastAPI project created to demonstrate the differences between the REST and GraphQL paradigms.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+if settings.SQL_INSTRUMENTATION:
+    app.add_middleware(QueryStatsMiddleware)
+if settings.ADMISSION_CONTROL:
+    app.add_middleware(AdmissionMiddleware)
+if settings.METRICS_ENABLED:
+    metrics.instrument_serialization()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router, tags=["Server Status"])
+
 app.include_router(rest_router)
 app.include_router(graphql_app, prefix="/graphql")
 
@@ -4,3 +4,5 @@ from .association_tables import MovieGenreAssociation
 from .director import Director
 from .genre import Genre
 from .movie import Movie
+from .movie_read_model import MovieReadModel
+from .movie_stats import MovieStats
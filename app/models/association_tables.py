@@ -1,9 +1,12 @@
-from sqlalchemy import UUID, ForeignKey
+from sqlalchemy import UUID, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base_model import BaseDBModel
 
 
 class MovieGenreAssociation(BaseDBModel):
+    # the primary key serves lookups by movie, this one lookups by genre
+    __table_args__ = (Index("ix_moviegenreassociation_genre_id_movie_id", "genre_id", "movie_id"),)
+
     movie_id: Mapped[UUID] = mapped_column(UUID, ForeignKey("movie.uuid", ondelete="CASCADE"), primary_key=True)
     genre_id: Mapped[UUID] = mapped_column(UUID, ForeignKey("genre.uuid", ondelete="CASCADE"), primary_key=True)
@@ -1,9 +1,18 @@
-from sqlalchemy import String
+from sqlalchemy import Computed, Index, String
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base_model import BaseDBModel
-from app.models.mixins import UUIDMixin
+from app.models.mixins import TimestampMixin, UUIDMixin, VersionMixin
 
 
-class Genre(BaseDBModel, UUIDMixin):
+class Genre(BaseDBModel, UUIDMixin, TimestampMixin, VersionMixin):
+    __table_args__ = (
+        Index("ix_genre_name_uuid", "name", "uuid", postgresql_include=["version"]),
+        Index("ix_genre_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_genre_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
+
     name: Mapped[str] = mapped_column(String, nullable=False, unique=True, index=True)
+    # kept up to date by postgres, deferred since only search queries read it
+    search_vector: Mapped[str] = mapped_column(TSVECTOR, Computed("to_tsvector('simple', name)", persisted=True), nullable=True, deferred=True)
@@ -1,6 +1,7 @@
+from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import text
+from sqlalchemy import DateTime, Integer, func, literal_column, text
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Mapped, declarative_mixin, mapped_column
 
@@ -15,3 +16,25 @@ class UUIDMixin:
         primary_key=True,
         server_default=text("gen_random_uuid()"),
     )
+
+
+@declarative_mixin
+class TimestampMixin:
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        index=True,
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+
+@declarative_mixin
+class VersionMixin:
+    # bumped by every UPDATE of the row, so a row's (uuid, version) pair identifies its content. ETags are derived from it.
+    version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default=text("1"),
+        onupdate=literal_column("version") + 1,
+    )
@@ -1,12 +1,24 @@
-from sqlalchemy import UUID, ForeignKey, Integer, String
+from sqlalchemy import UUID, Computed, ForeignKey, Index, Integer, String, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base_model import BaseDBModel
-from app.models.mixins import UUIDMixin
+from app.models.mixins import TimestampMixin, UUIDMixin, VersionMixin
 
 
-class Movie(BaseDBModel, UUIDMixin):
+class Movie(BaseDBModel, UUIDMixin, TimestampMixin, VersionMixin):
+    __table_args__ = (
+        Index("ix_movie_title_uuid", "title", "uuid", postgresql_include=["version"]),
+        Index("ix_movie_release_year_key_uuid", text("coalesce(release_year, 2147483647)"), "uuid", postgresql_include=["version", "release_year"]),
+        Index("ix_movie_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_movie_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_movie_title_pattern", "title", postgresql_ops={"title": "varchar_pattern_ops"}),
+        Index("ix_movie_director_id_release_year", "director_id", "release_year"),
+    )
+
     title: Mapped[str] = mapped_column(String, index=True)
     release_year: Mapped[int] = mapped_column(Integer, nullable=True)
+    # kept up to date by postgres, deferred since only search queries read it
+    search_vector: Mapped[str] = mapped_column(TSVECTOR, Computed("to_tsvector('english', title)", persisted=True), nullable=True, deferred=True)
 
     director_id: Mapped[UUID] = mapped_column(UUID, ForeignKey("director.uuid"), nullable=True)
@@ -0,0 +1,18 @@
+from sqlalchemy import UUID, ForeignKey, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_model import BaseDBModel
+
+
+class MovieReadModel(BaseDBModel):
+    """
+    Director name and genre names of each movie, denormalized so extended reads don't join and aggregate them.
+    Rows are rewritten by `MovieCRUD.refresh_extended` whenever a write changes them.
+    """
+
+    __tablename__ = "movie_extended"
+
+    movie_id: Mapped[UUID] = mapped_column(UUID, ForeignKey("movie.uuid", ondelete="CASCADE"), primary_key=True)
+    director: Mapped[str | None] = mapped_column(String, nullable=True)
+    genres: Mapped[list[str] | None] = mapped_column(ARRAY(String), nullable=True)
@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_model import BaseDBModel
+
+
+class MovieStats(BaseDBModel):
+    """
+    Movie counts per genre, director and decade, rebuilt periodically by `StatsCRUD.refresh` so dashboards read
+    a handful of precomputed rows instead of counting the catalog
+    """
+
+    __table_args__ = (Index("ix_moviestats_kind_movie_count", "kind", "movie_count"),)
+
+    # "genre", "director" or "decade"
+    kind: Mapped[str] = mapped_column(String, primary_key=True)
+    # the genre or director uuid, or the first year of the decade, empty for movies without a release year
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    name: Mapped[str | None] = mapped_column(String, nullable=True)
+    movie_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,17 +1,67 @@
 import uuid
+from datetime import datetime
+from functools import lru_cache
 from typing import Any, Sequence
 from uuid import UUID
 
-from sqlalchemy import Row, func, select
+from sqlalchemy import Row, Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from strawberry import ID
 
-from app.db.utils import get_all, get_all_scalars, scalar
+from app.db.pagination import Cursor, page_params, paginate
+from app.db.utils import get_all, get_all_scalars, json_row, json_rows, scalar, version_digest
 from app.models import Director, Movie
 from app.rest.repository.base_repo import AbstractCRUD
 from app.rest.schemas.directors import DirectorUpdate
 
 
+# built once per shape, page values are bound at execution
+@lru_cache(maxsize=8)
+def director_page_query(with_movies: bool, keyset: bool) -> Select:
+    base_query: Select
+    if with_movies:
+        base_query = (
+            select(
+                Director,
+                func.coalesce(
+                    func.array_agg(func.json_build_object("uuid", Movie.uuid, "title", Movie.title, "release_year", Movie.release_year)).filter(Movie.uuid.is_not(None)),
+                    None,
+                ),
+            )
+            .outerjoin(Movie, Movie.director_id == Director.uuid)
+            .group_by(Director.uuid)
+        )
+    else:
+        base_query = select(Director)
+
+    return paginate(base_query, Director.name, Director.uuid, keyset)
+
+
+@lru_cache(maxsize=2)
+def director_document_query(keyset: bool) -> Select:
+    """
+    (uuid, name, document) rows of directors with their movies, the document being the director rendered to JSON by Postgres
+    """
+    movies = select(Movie.uuid, Movie.title, Movie.release_year).where(Movie.director_id == Director.uuid).correlate(Director)
+    document = select(Director.name, Director.uuid, json_rows(movies).label("movies")).correlate(Director)
+    return paginate(select(Director.uuid, Director.name, json_row(document).label("document")), Director.name, Director.uuid, keyset)
+
+
+def director_version_query(with_movies: bool) -> Select:
+    """
+    uuid and version of directors and, with their movies, a digest of the movies' versions
+    """
+    if with_movies:
+        return select(Director.uuid, Director.version, version_digest(Movie.uuid, Movie.version)).outerjoin(Movie, Movie.director_id == Director.uuid).group_by(Director.uuid)
+    return select(Director.uuid, Director.version)
+
+
+@lru_cache(maxsize=8)
+def director_page_version_query(with_movies: bool, keyset: bool) -> Select:
+    # without movies the page is read from the (name, uuid) index alone, which carries the version
+    return paginate(director_version_query(with_movies), Director.name, Director.uuid, keyset)
+
+
 class DirectorCRUD(AbstractCRUD):
     async def get_one(self, db: AsyncSession, id: UUID | ID | None = None, name: str | None = None, with_movies: bool = False) -> Director | Sequence[Row[Any]] | None:
         filter = Director.uuid == id if id else Director.name == name
@@ -31,25 +81,33 @@ class DirectorCRUD(AbstractCRUD):
             return await get_all(db, base_query)
         return await scalar(db, select(Director).where(filter))
 
-    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 20, with_movies: bool = False) -> Sequence[Director] | Sequence[Row[Any]]:
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 20, with_movies: bool = False, after: Cursor | None = None) -> Sequence[Director] | Sequence[Row[Any]]:
+        query = director_page_query(with_movies, after is not None)
         if with_movies:
-            base_query = (
-                select(
-                    Director,
-                    func.coalesce(
-                        func.array_agg(func.json_build_object("uuid", Movie.uuid, "title", Movie.title, "release_year", Movie.release_year)).filter(Movie.uuid.is_not(None)),
-                        None,
-                    ),
-                )
-                .outerjoin(Movie, Movie.director_id == Director.uuid)
-                .group_by(Director.uuid)
-                .order_by(Director.name)
-                .offset(skip)
-                .limit(limit)
-            )
-            return await get_all(db, base_query)
+            return await get_all(db, query, page_params(skip, limit, after))
+        return await get_all_scalars(db, query, page_params(skip, limit, after))
 
-        return await get_all_scalars(db, select(Director).order_by(Director.name).offset(skip).limit(limit))
+    async def get_all_documents(self, db: AsyncSession, skip: int = 0, limit: int = 20, after: Cursor | None = None) -> Sequence[Row[Any]]:
+        return await get_all(db, director_document_query(after is not None), page_params(skip, limit, after))
+
+    async def get_version(self, db: AsyncSession, id: UUID | None = None, name: str | None = None, with_movies: bool = False) -> Row[Any] | None:
+        """
+        (uuid, version[, movies digest], updated_at) of a director
+        """
+        filter = Director.uuid == id if id else Director.name == name
+        rows = await get_all(db, director_version_query(with_movies).add_columns(Director.updated_at).where(filter))
+        return rows[0] if rows else None
+
+    async def get_page_versions(self, db: AsyncSession, skip: int = 0, limit: int = 20, with_movies: bool = False, after: Cursor | None = None) -> Sequence[Row[Any]]:
+        return await get_all(db, director_page_version_query(with_movies, after is not None), page_params(skip, limit, after))
+
+    async def count(self, db: AsyncSession) -> int:
+        return await scalar(db, select(func.count()).select_from(Director)) or 0
+
+    async def get_many(self, db: AsyncSession, ids: Sequence[UUID]) -> Sequence[Director]:
+        if not ids:
+            return []
+        return await get_all_scalars(db, select(Director).where(Director.uuid.in_(ids)))
 
     async def create(self, db: AsyncSession, name: str) -> Director:
         new_director = Director(name=name, uuid=uuid.uuid4())
@@ -70,6 +128,13 @@ class DirectorCRUD(AbstractCRUD):
         await db.delete(director)
         return director
 
+    def export_query(self, modified_since: datetime | None = None) -> Select:
+        query = select(Director.uuid, Director.name, Director.updated_at)
+        return query.where(Director.updated_at >= modified_since) if modified_since else query
+
+    async def last_modified(self, db: AsyncSession) -> datetime | None:
+        return await scalar(db, select(func.max(Director.updated_at)))
+
 
 def get_director_crud() -> DirectorCRUD:
     return DirectorCRUD()
@@ -1,16 +1,74 @@
 import uuid
+from datetime import datetime
+from functools import lru_cache
 from typing import Any, Sequence
 from uuid import UUID
 
-from sqlalchemy import Row, func, select
+from sqlalchemy import Row, Select, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.utils import get_all, get_all_scalars, scalar
+from app.db.pagination import Cursor, page_params, paginate
+from app.db.utils import execute, get_all, get_all_scalars, scalar, version_digest
 from app.models import Genre, Movie, MovieGenreAssociation
 from app.rest.repository.base_repo import AbstractCRUD
 from app.rest.schemas.genres import GenreUpdate
 
 
+# built once per shape, page values are bound at execution
+@lru_cache(maxsize=8)
+def genre_page_query(with_movies: bool, keyset: bool) -> Select:
+    base_query: Select
+    if with_movies:
+        base_query = (
+            select(
+                Genre,
+                func.coalesce(
+                    func.array_agg(
+                        func.json_build_object(
+                            "uuid",
+                            Movie.uuid,
+                            "title",
+                            Movie.title,
+                            "release_year",
+                            Movie.release_year,
+                            "director_id",
+                            Movie.director_id,
+                        )
+                    ).filter(Movie.uuid.is_not(None)),
+                    None,
+                ),
+            )
+            .outerjoin(MovieGenreAssociation, MovieGenreAssociation.genre_id == Genre.uuid)
+            .outerjoin(Movie, Movie.uuid == MovieGenreAssociation.movie_id)
+            .group_by(Genre.uuid)
+        )
+    else:
+        base_query = select(Genre)
+
+    return paginate(base_query, Genre.name, Genre.uuid, keyset)
+
+
+def genre_version_query(with_movies: bool) -> Select:
+    """
+    uuid and version of genres and, with their movies, a digest of the movies' versions
+    """
+    if with_movies:
+        return (
+            select(Genre.uuid, Genre.version, version_digest(Movie.uuid, Movie.version))
+            .outerjoin(MovieGenreAssociation, MovieGenreAssociation.genre_id == Genre.uuid)
+            .outerjoin(Movie, Movie.uuid == MovieGenreAssociation.movie_id)
+            .group_by(Genre.uuid)
+        )
+    return select(Genre.uuid, Genre.version)
+
+
+@lru_cache(maxsize=8)
+def genre_page_version_query(with_movies: bool, keyset: bool) -> Select:
+    # without movies the page is read from the (name, uuid) index alone, which carries the version
+    return paginate(genre_version_query(with_movies), Genre.name, Genre.uuid, keyset)
+
+
 class GenreCRUD(AbstractCRUD):
     async def get_one(self, db: AsyncSession, id: UUID | None = None, name: str | None = None, with_movies: bool = False) -> Genre | Sequence[Row[Any]] | None:
         filter = Genre.uuid == id if id else Genre.name == name
@@ -30,7 +88,7 @@ class GenreCRUD(AbstractCRUD):
                                 "director_id",
                                 Movie.director_id,
                             )
-                        ),
+                        ).filter(Movie.uuid.is_not(None)),
                         None,
                     ).label("movies"),
                 )
@@ -42,8 +100,25 @@ class GenreCRUD(AbstractCRUD):
             return await get_all(db, base_query)
         return await scalar(db, select(Genre).where(filter))
 
-    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 20) -> Sequence[Genre] | Sequence[Row[Any]]:
-        return await get_all_scalars(db, select(Genre).order_by(Genre.name).offset(skip).limit(limit))
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 20, with_movies: bool = False, after: Cursor | None = None) -> Sequence[Genre] | Sequence[Row[Any]]:
+        query = genre_page_query(with_movies, after is not None)
+        if with_movies:
+            return await get_all(db, query, page_params(skip, limit, after))
+        return await get_all_scalars(db, query, page_params(skip, limit, after))
+
+    async def get_version(self, db: AsyncSession, id: UUID | None = None, name: str | None = None, with_movies: bool = False) -> Row[Any] | None:
+        """
+        (uuid, version[, movies digest], updated_at) of a genre
+        """
+        filter = Genre.uuid == id if id else Genre.name == name
+        rows = await get_all(db, genre_version_query(with_movies).add_columns(Genre.updated_at).where(filter))
+        return rows[0] if rows else None
+
+    async def get_page_versions(self, db: AsyncSession, skip: int = 0, limit: int = 20, with_movies: bool = False, after: Cursor | None = None) -> Sequence[Row[Any]]:
+        return await get_all(db, genre_page_version_query(with_movies, after is not None), page_params(skip, limit, after))
+
+    async def count(self, db: AsyncSession) -> int:
+        return await scalar(db, select(func.count()).select_from(Genre)) or 0
 
     async def create(self, db: AsyncSession, name: str) -> Genre:
         existing_genre = await self.get_one(db, name=name)
@@ -54,6 +129,15 @@ class GenreCRUD(AbstractCRUD):
             return new_genre
         return existing_genre  # type: ignore
 
+    async def create_many(self, db: AsyncSession, names: Sequence[str]) -> Sequence[Genre]:
+        """
+        Gets or creates every genre in two statements, a multi-row INSERT ... ON CONFLICT and one IN lookup
+        """
+        if not names:
+            return []
+        await execute(db, pg_insert(Genre).values([{"uuid": uuid.uuid4(), "name": name} for name in names]).on_conflict_do_nothing(index_elements=[Genre.name]))
+        return await get_all_scalars(db, select(Genre).where(Genre.name.in_(names)))
+
     async def update(self, db: AsyncSession, genre_data: GenreUpdate) -> Genre | Sequence[Row[Any]] | None:
         genre = await self.get_one(db, id=genre_data.uuid)
         if genre and isinstance(genre, Genre):
@@ -67,6 +151,13 @@ class GenreCRUD(AbstractCRUD):
         await db.delete(genre)
         return genre
 
+    def export_query(self, modified_since: datetime | None = None) -> Select:
+        query = select(Genre.uuid, Genre.name, Genre.updated_at)
+        return query.where(Genre.updated_at >= modified_since) if modified_since else query
+
+    async def last_modified(self, db: AsyncSession) -> datetime | None:
+        return await scalar(db, select(func.max(Genre.updated_at)))
+
 
 def get_genre_crud() -> GenreCRUD:
     return GenreCRUD()
@@ -0,0 +1,159 @@
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.utils import execute, scalar
+
+# Staging tables live for a single transaction. COPY fills them with the raw names of the whole input, then
+# set-based statements resolve directors, genres and movies and move the rows into the catalog once, so neither
+# per-row round trips nor per-chunk passes over the catalog are needed
+CREATE_STAGING_TABLES = (
+    "CREATE TEMP TABLE IF NOT EXISTS import_movie (row_id bigint NOT NULL, title varchar NOT NULL, release_year integer, director_name varchar) ON COMMIT DROP",
+    "CREATE TEMP TABLE IF NOT EXISTS import_movie_genre (row_id bigint NOT NULL, genre_name varchar NOT NULL) ON COMMIT DROP",
+)
+
+# analyzed once everything is copied, so the planner knows how many rows it joins
+ANALYZE_STAGING_TABLES = text("ANALYZE import_movie, import_movie_genre")
+
+# director names aren't unique, an existing director with the same name is reused
+UPSERT_DIRECTORS = text(
+    """
+    INSERT INTO director (uuid, name)
+    SELECT gen_random_uuid(), staged.director_name
+    FROM (SELECT DISTINCT director_name FROM import_movie WHERE director_name IS NOT NULL) AS staged
+    WHERE NOT EXISTS (SELECT 1 FROM director WHERE director.name = staged.director_name)
+    """
+)
+
+UPSERT_GENRES = text(
+    """
+    INSERT INTO genre (uuid, name)
+    SELECT gen_random_uuid(), genre_name FROM (SELECT DISTINCT genre_name FROM import_movie_genre) AS staged
+    ON CONFLICT (name) DO NOTHING
+    """
+)
+
+# The movie of every staged row. Movies are matched on (title, director), so re-importing a file doesn't duplicate
+# the catalog, and rows without a match get a new id shared by every row with the same title and director. Missing
+# directors count as a nil uuid, which keeps the match a plain equality the planner can hash, or look up in
+# ix_movie_title for small imports. Written once with CREATE TABLE AS rather than updating the staged rows.
+NO_DIRECTOR = "'00000000-0000-0000-0000-000000000000'::uuid"
+
+MATCH_MOVIES = text(
+    f"""
+    CREATE TEMP TABLE import_movie_match ON COMMIT DROP AS
+    SELECT
+        row_id,
+        title,
+        release_year,
+        director_id,
+        first_value(candidate_id) OVER same_movie AS movie_id,
+        created,
+        row_number() OVER same_movie = 1 AS first
+    FROM (
+        -- a volatile column keeps the subquery from being inlined, first_value would evaluate it again otherwise
+        SELECT
+            staged.row_id,
+            staged.title,
+            staged.release_year,
+            director.uuid AS director_id,
+            coalesce(movie.uuid, gen_random_uuid()) AS candidate_id,
+            movie.uuid IS NULL AS created
+        FROM import_movie AS staged
+        LEFT JOIN (
+            SELECT DISTINCT ON (name) name, uuid FROM director
+            WHERE name IN (SELECT director_name FROM import_movie)
+            ORDER BY name, uuid
+        ) AS director ON director.name = staged.director_name
+        LEFT JOIN movie ON movie.title = staged.title AND coalesce(movie.director_id, {NO_DIRECTOR}) = coalesce(director.uuid, {NO_DIRECTOR})
+    ) AS matched
+    WINDOW same_movie AS (PARTITION BY title, coalesce(director_id, {NO_DIRECTOR}) ORDER BY row_id)
+    """
+)
+
+# the first row of every new movie is inserted
+INSERT_MOVIES = text(
+    """
+    WITH inserted AS (
+        INSERT INTO movie (uuid, title, release_year, director_id)
+        SELECT movie_id, title, release_year, director_id FROM import_movie_match WHERE created AND first
+        RETURNING director_id
+    )
+    SELECT count(*), array_remove(array_agg(DISTINCT director_id), NULL) FROM inserted
+    """
+)
+
+# also returns the movies that were already in the catalog and gained a genre, their rows aren't written otherwise
+INSERT_ASSOCIATIONS = text(
+    """
+    WITH inserted AS (
+        INSERT INTO moviegenreassociation (movie_id, genre_id)
+        SELECT DISTINCT staged.movie_id, genre.uuid
+        FROM import_movie_genre AS staged_genre
+        JOIN import_movie_match AS staged ON staged.row_id = staged_genre.row_id
+        JOIN genre ON genre.name = staged_genre.genre_name
+        ON CONFLICT DO NOTHING
+        RETURNING movie_id, genre_id
+    )
+    SELECT count(*), array_agg(DISTINCT inserted.genre_id), array_agg(DISTINCT inserted.movie_id) FILTER (WHERE NOT staged.created)
+    FROM inserted
+    JOIN import_movie_match AS staged ON staged.movie_id = inserted.movie_id AND staged.first
+    """
+)
+
+# every staged movie, new or already in the catalog, since either may have gained genres
+IMPORTED_MOVIE_IDS = text("SELECT array_agg(movie_id) FROM import_movie_match WHERE first")
+
+
+class ImportCRUD:
+    async def create_staging_tables(self, db: AsyncSession) -> None:
+        for statement in CREATE_STAGING_TABLES:
+            await execute(db, text(statement))
+
+    async def stage(self, db: AsyncSession, movies: Sequence[tuple], genres: Sequence[tuple]) -> None:
+        """
+        Appends one chunk to the staging rows, streamed in with COPY.
+        Movies are `(row_id, title, release_year, director_name)`, genres `(row_id, genre_name)`.
+        """
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        await driver_connection.copy_records_to_table("import_movie", records=movies, columns=["row_id", "title", "release_year", "director_name"])  # type: ignore[union-attr]
+        await driver_connection.copy_records_to_table("import_movie_genre", records=genres, columns=["row_id", "genre_name"])  # type: ignore[union-attr]
+
+    async def analyze_staging_tables(self, db: AsyncSession) -> None:
+        await execute(db, ANALYZE_STAGING_TABLES)
+
+    async def upsert_directors(self, db: AsyncSession) -> int:
+        created = await execute(db, UPSERT_DIRECTORS)
+        return created.rowcount  # type: ignore[union-attr]
+
+    async def upsert_genres(self, db: AsyncSession) -> int:
+        created = await execute(db, UPSERT_GENRES)
+        return created.rowcount  # type: ignore[union-attr]
+
+    async def insert_movies(self, db: AsyncSession) -> tuple[int, list[UUID]]:
+        """
+        Links the staged rows to the movies already in the catalog and inserts the others.
+        Returns the number of new movies and the directors they were added to.
+        """
+        await execute(db, MATCH_MOVIES)
+        count, director_ids = (await execute(db, INSERT_MOVIES)).one()  # type: ignore[union-attr]
+        return count, director_ids or []
+
+    async def insert_associations(self, db: AsyncSession) -> tuple[int, list[UUID], list[UUID]]:
+        """
+        Adds the staged genres to the movies. Returns the number of new associations, the genres they were added to
+        and the movies that already existed but gained a genre.
+        """
+        count, genre_ids, updated_movie_ids = (await execute(db, INSERT_ASSOCIATIONS)).one()  # type: ignore[union-attr]
+        return count, genre_ids or [], updated_movie_ids or []
+
+    async def get_imported_movie_ids(self, db: AsyncSession) -> list[UUID]:
+        return await scalar(db, IMPORTED_MOVIE_IDS) or []
+
+
+def get_import_crud() -> ImportCRUD:
+    return ImportCRUD()
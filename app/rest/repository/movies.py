@@ -1,66 +1,265 @@
+import operator
 import uuid
+from datetime import datetime
+from functools import lru_cache
 from typing import Any, Sequence
 from uuid import UUID
 
-from sqlalchemy import Row, func, select
+from sqlalchemy import ColumnElement, Integer, Row, Select, String, any_, bindparam, cast, column, delete, func, insert, literal, literal_column, or_, select, update, values
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.utils import get_all, get_all_scalars, scalar
-from app.models import Director, Genre, Movie, MovieGenreAssociation
+from app.db.pagination import Cursor, page_params, paginate
+from app.db.projection import Projection
+from app.db.utils import execute, get_all, get_all_scalars, json_row, scalar
+from app.models import Director, Genre, Movie, MovieGenreAssociation, MovieReadModel
 from app.rest.repository.base_repo import AbstractCRUD
 from app.rest.repository.directors import DirectorCRUD
-from app.rest.schemas.movies import MovieCreate, MovieOrder, MovieSort, MovieUpdate
+from app.rest.schemas.movies import GenreMatch, MovieCreate, MovieFilter, MovieOrder, MovieSort, MovieUpdate
+
+# Movies without a release year sort after every dated movie, the coalesced key keeps them reachable through keyset cursors
+NULL_RELEASE_YEAR_KEY = 2147483647
+release_year_key = func.coalesce(Movie.release_year, literal_column(str(NULL_RELEASE_YEAR_KEY)))
+
+MOVIE_ROW = (Movie.uuid, Movie.title, Movie.release_year, Movie.director_id)
+MOVIE_COLUMNS = ("release_year", "director_id")
+MOVIE_RELATIONS = ("director", "genre")
+EXPORT_PROJECTION = Projection(columns=frozenset(MOVIE_COLUMNS), relations=frozenset(MOVIE_RELATIONS))
+
+
+def movie_order_key(movie: Any, order_by: MovieOrder) -> Any:
+    if order_by == MovieOrder.year:
+        return NULL_RELEASE_YEAR_KEY if movie.release_year is None else movie.release_year
+    return movie.title
+
+
+def projected_movie_query(projection: Projection) -> Select:
+    """
+    Rows carrying only the projected columns, uuid and title are always selected since every movie schema requires them.
+    The director name and genres come from the movie's read model row, so neither needs a join or an aggregate over the page.
+    """
+    columns = [Movie.uuid, Movie.title, *(getattr(Movie, name) for name in MOVIE_COLUMNS if name in projection.columns)]
+    query = select(*columns).select_from(Movie)
+
+    if "director" in projection.relations:
+        query = query.add_columns(MovieReadModel.director)
+    if "genre" in projection.relations:
+        query = query.add_columns(func.array_to_string(MovieReadModel.genres, " | ").label("genre"))
+    if projection.relations:
+        query = query.outerjoin(MovieReadModel, MovieReadModel.movie_id == Movie.uuid)
+    return query
+
+
+def movie_filter_params(filters: MovieFilter | None) -> dict[str, Any]:
+    """
+    Bound values of the active filters. Their names select the predicates of `movie_filter`, so a page statement
+    is built once per combination of filters, not per value.
+    """
+    if filters is None:
+        return {}
+
+    params: dict[str, Any] = {}
+    if filters.year_from is not None:
+        params["year_from"] = filters.year_from
+    if filters.year_to is not None:
+        params["year_to"] = filters.year_to
+    if filters.director_ids:
+        params["director_ids"] = list(dict.fromkeys(filters.director_ids))
+    if filters.genres:
+        params[f"genres_{filters.genre_match.value}"] = list(dict.fromkeys(filters.genres))
+    if filters.title_prefix:
+        # LIKE wildcards in the prefix match literally
+        escaped = filters.title_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params["title_prefix"] = f"{escaped}%"
+    return params
+
+
+def movie_filter(names: frozenset[str]) -> list[ColumnElement[bool]]:
+    """
+    Index backed predicates for the filters in `names`: directors go through (director_id, release_year), genres through
+    (genre_id, movie_id) and title prefixes through the pattern index. Lists are bound as one array, so their length
+    doesn't change the SQL.
+    """
+    conditions: list[ColumnElement[bool]] = []
+    # years are bounded on the column, which (director_id, release_year) serves, and on the coalesced key the year ordering
+    # pages through. The column bound also keeps movies without a year out of open ended ranges.
+    for name, compare in (("year_from", operator.ge), ("year_to", operator.le)):
+        if name in names:
+            year = bindparam(name, type_=Integer)
+            conditions.extend((compare(Movie.release_year, year), compare(release_year_key, year)))
+    if "director_ids" in names:
+        conditions.append(Movie.director_id == any_(bindparam("director_ids", type_=postgresql.ARRAY(postgresql.UUID(as_uuid=True)))))
+    if "title_prefix" in names:
+        conditions.append(Movie.title.like(bindparam("title_prefix", type_=String), escape="\\"))
+
+    for match in GenreMatch:
+        if f"genres_{match.value}" not in names:
+            continue
+        genre_names = bindparam(f"genres_{match.value}", type_=postgresql.ARRAY(String))
+        matching = select(MovieGenreAssociation.movie_id).join(Genre, Genre.uuid == MovieGenreAssociation.genre_id).where(Genre.name == any_(genre_names))
+        if match == GenreMatch.all:
+            matching = matching.group_by(MovieGenreAssociation.movie_id).having(func.count() == func.cardinality(genre_names))
+        conditions.append(Movie.uuid.in_(matching))
+    return conditions
+
+
+def extended_movie_query() -> Select:
+    return select(Movie, MovieReadModel.director, MovieReadModel.genres).outerjoin(MovieReadModel, MovieReadModel.movie_id == Movie.uuid)
+
+
+def movie_extended_rows() -> Select:
+    """
+    The read model rows of every movie, computed from the normalized tables
+    """
+    genre_names = (
+        select(func.array_agg(Genre.name))
+        .join(MovieGenreAssociation, MovieGenreAssociation.genre_id == Genre.uuid)
+        .where(MovieGenreAssociation.movie_id == Movie.uuid)
+        .correlate(Movie)
+        .scalar_subquery()
+    )
+    return select(Movie.uuid, Director.name, genre_names).select_from(Movie).outerjoin(Director, Director.uuid == Movie.director_id)
+
+
+# Statements are immutable and memoize their cache key, so building each shape once skips the Python side query
+# construction and cache key generation on every call. The same SQL text then hits the compiled cache and the
+# prepared statement of the connection, values are bound at execution.
+@lru_cache(maxsize=256)
+def movie_detail_query(extended: bool, projection: Projection | None = None) -> Select:
+    if projection is not None:
+        base_query = projected_movie_query(projection)
+    elif extended:
+        base_query = extended_movie_query()
+    else:
+        base_query = select(Movie)
+    return base_query.where(Movie.uuid == bindparam("id"))
+
+
+@lru_cache(maxsize=256)
+def movie_page_query(order_by: MovieOrder, sort_by: MovieSort, extended: bool, keyset: bool, projection: Projection | None = None, filters: frozenset[str] = frozenset()) -> Select:
+    order_expression = release_year_key if order_by == MovieOrder.year else Movie.title
+    if projection is not None:
+        # the page cursor is built from the order key, so it has to be selected
+        base_query = projected_movie_query(projection.with_columns("release_year") if order_by == MovieOrder.year else projection)
+    elif extended:
+        base_query = extended_movie_query()
+    else:
+        base_query = select(Movie)
+    return paginate(base_query.where(*movie_filter(filters)), order_expression, Movie.uuid, keyset, sort_by == MovieSort.desc)
+
+
+@lru_cache(maxsize=64)
+def movie_version_query(order_by: MovieOrder, sort_by: MovieSort, keyset: bool, filters: frozenset[str] = frozenset()) -> Select:
+    """
+    uuid and version of the movies `movie_page_query` returns for the same values. Unfiltered pages are read from the
+    (key, uuid) index of their ordering alone, which carries the version.
+    """
+    return movie_page_query(order_by, sort_by, False, keyset, None, filters).with_only_columns(Movie.uuid, Movie.version)
+
+
+@lru_cache(maxsize=64)
+def movie_document_query(order_by: MovieOrder, sort_by: MovieSort, keyset: bool, filters: frozenset[str] = frozenset()) -> Select:
+    """
+    (uuid, title, release_year, document) rows of the extended movies `movie_page_query` returns for the same values,
+    the document being the movie rendered to JSON by Postgres
+    """
+    genre = func.coalesce(func.array_to_string(MovieReadModel.genres, " | "), "")
+    document = select(*MOVIE_ROW, MovieReadModel.director, genre.label("genre")).correlate(Movie, MovieReadModel)
+    base_query = select(Movie.uuid, Movie.title, Movie.release_year, json_row(document).label("document")).outerjoin(MovieReadModel, MovieReadModel.movie_id == Movie.uuid)
+    order_expression = release_year_key if order_by == MovieOrder.year else Movie.title
+    return paginate(base_query.where(*movie_filter(filters)), order_expression, Movie.uuid, keyset, sort_by == MovieSort.desc)
+
+
+MOVIE_VERSION = select(Movie.uuid, Movie.version, Movie.updated_at).where(Movie.uuid == bindparam("id"))
+
+
+def movie_selection(ids: Sequence[UUID] | None = None, director_id: UUID | None = None, genre_id: UUID | None = None) -> list[ColumnElement[bool]]:
+    """
+    Conditions picking the given movies, the movies of a director or of a genre. None of them picks every movie.
+    """
+    conditions: list[ColumnElement[bool]] = []
+    if ids is not None:
+        # one array parameter, however many movies a batch or an import chunk touches
+        conditions.append(Movie.uuid == any_(literal(list(ids), postgresql.ARRAY(postgresql.UUID(as_uuid=True)))))
+    if director_id is not None:
+        conditions.append(Movie.director_id == director_id)
+    if genre_id is not None:
+        conditions.append(Movie.uuid.in_(select(MovieGenreAssociation.movie_id).where(MovieGenreAssociation.genre_id == genre_id)))
+    return conditions
+
+
+@lru_cache(maxsize=64)
+def movie_count_query(filters: frozenset[str] = frozenset()) -> Select:
+    return select(func.count()).select_from(Movie).where(*movie_filter(filters))
 
 
 class MovieCRUD(AbstractCRUD):
-    async def get_one(self, db: AsyncSession, id: UUID, extended: bool = False) -> Movie | Sequence[Row[Any]] | None:
-        if extended:
-            base_query = (
-                select(
-                    Movie,
-                    Director.name,
-                    func.coalesce(
-                        func.array_agg(Genre.name).filter(Genre.uuid.is_not(None)),
-                        None,
-                    ).label("genres"),
-                )
-                .outerjoin(Director, Director.uuid == Movie.director_id)
-                .outerjoin(MovieGenreAssociation, MovieGenreAssociation.movie_id == Movie.uuid)
-                .outerjoin(Genre, Genre.uuid == MovieGenreAssociation.genre_id)
-                .where(Movie.uuid == id)
-                .group_by(Movie.uuid, Movie.title, Movie.release_year, Director.name)
-            )
-            return await get_all(db, base_query)
-        return await scalar(db, select(Movie).where(Movie.uuid == id))
+    async def get_one(self, db: AsyncSession, id: UUID, extended: bool = False, projection: Projection | None = None) -> Movie | Sequence[Row[Any]] | None:
+        query = movie_detail_query(extended, projection)
+        if extended or projection is not None:
+            return await get_all(db, query, {"id": id})
+        return await scalar(db, query, {"id": id})
 
     async def get_all(
-        self, db: AsyncSession, skip: int = 0, limit: int = 20, order_by: MovieOrder = MovieOrder.title, sort_by: MovieSort = MovieSort.asc, extended: bool = False
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 20,
+        order_by: MovieOrder = MovieOrder.title,
+        sort_by: MovieSort = MovieSort.asc,
+        extended: bool = False,
+        after: Cursor | None = None,
+        projection: Projection | None = None,
+        filters: MovieFilter | None = None,
     ) -> Sequence[Movie] | Sequence[Row[Any]]:
-        order_expression = Movie.release_year if order_by == MovieOrder.year else Movie.title
-        sort_expression = order_expression.desc() if sort_by == MovieSort.desc else order_expression.asc()
-        if extended:
-            base_query = (
-                select(
-                    Movie,
-                    Director.name,
-                    func.coalesce(
-                        func.array_agg(Genre.name).filter(Genre.uuid.is_not(None)),
-                        None,
-                    ).label("genres"),
-                )
-                .outerjoin(Director, Director.uuid == Movie.director_id)
-                .outerjoin(MovieGenreAssociation, MovieGenreAssociation.movie_id == Movie.uuid)
-                .outerjoin(Genre, Genre.uuid == MovieGenreAssociation.genre_id)
-                .group_by(Movie.uuid, Movie.title, Movie.release_year, Director.name)
-                .order_by(sort_expression)
-                .offset(skip)
-                .limit(limit)
-            )
-            return await get_all(db, base_query)
+        filter_params = movie_filter_params(filters)
+        query = movie_page_query(order_by, sort_by, extended, after is not None, projection, frozenset(filter_params))
+        params = {**page_params(skip, limit, after), **filter_params}
+        if extended or projection is not None:
+            return await get_all(db, query, params)
+        return await get_all_scalars(db, query, params)
 
-        return await get_all_scalars(db, select(Movie).order_by(sort_expression).offset(skip).limit(limit))
+    async def get_all_documents(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 20,
+        order_by: MovieOrder = MovieOrder.title,
+        sort_by: MovieSort = MovieSort.asc,
+        after: Cursor | None = None,
+        filters: MovieFilter | None = None,
+    ) -> Sequence[Row[Any]]:
+        filter_params = movie_filter_params(filters)
+        query = movie_document_query(order_by, sort_by, after is not None, frozenset(filter_params))
+        return await get_all(db, query, {**page_params(skip, limit, after), **filter_params})
 
-    async def create(self, db: AsyncSession, movie_data: MovieCreate) -> Movie | None:
+    async def get_version(self, db: AsyncSession, id: UUID) -> Row[Any] | None:
+        """
+        (uuid, version, updated_at) of a movie. The version covers the director name and genres shown with it as well.
+        """
+        rows = await get_all(db, MOVIE_VERSION, {"id": id})
+        return rows[0] if rows else None
+
+    async def get_page_versions(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 20,
+        order_by: MovieOrder = MovieOrder.title,
+        sort_by: MovieSort = MovieSort.asc,
+        after: Cursor | None = None,
+        filters: MovieFilter | None = None,
+    ) -> Sequence[Row[Any]]:
+        filter_params = movie_filter_params(filters)
+        query = movie_version_query(order_by, sort_by, after is not None, frozenset(filter_params))
+        return await get_all(db, query, {**page_params(skip, limit, after), **filter_params})
+
+    async def count(self, db: AsyncSession, filters: MovieFilter | None = None) -> int:
+        filter_params = movie_filter_params(filters)
+        return await scalar(db, movie_count_query(frozenset(filter_params)), filter_params) or 0
+
+    async def create(self, db: AsyncSession, movie_data: MovieCreate) -> Movie:
         director = await DirectorCRUD().get_one(db=db, id=movie_data.director_id)
         new_movie = Movie(title=movie_data.title, release_year=movie_data.release_year, uuid=uuid.uuid4(), director_id=movie_data.director_id if director else None)
         db.add(new_movie)
@@ -83,6 +282,101 @@ class MovieCRUD(AbstractCRUD):
         await db.delete(movie)
         return movie
 
+    async def create_many(self, db: AsyncSession, movies: Sequence[dict]) -> Sequence[Row[Any]]:
+        """
+        Inserts all movies with a single multi-row INSERT
+        """
+        if not movies:
+            return []
+        return await get_all(db, insert(Movie).values(list(movies)).returning(*MOVIE_ROW))
+
+    async def update_many(self, db: AsyncSession, movies: Sequence[dict]) -> Sequence[Row[Any]]:
+        """
+        Applies every change with one UPDATE ... FROM (VALUES ...), NULL values keep the current column value.
+        Movies that don't exist are simply missing from the returned rows.
+        """
+        if not movies:
+            return []
+
+        columns = (
+            column("uuid", postgresql.UUID(as_uuid=True)),
+            column("title", String),
+            column("release_year", Integer),
+            column("director_id", postgresql.UUID(as_uuid=True)),
+        )
+        # typed casts, otherwise postgres infers text for parameters and for all NULL columns
+        changes = values(*columns, name="changes").data([tuple(cast(literal(movie[col.name], col.type), col.type) for col in columns) for movie in movies])
+        query = (
+            update(Movie)
+            .where(Movie.uuid == changes.c.uuid)
+            .values(
+                title=func.coalesce(changes.c.title, Movie.title),
+                release_year=func.coalesce(changes.c.release_year, Movie.release_year),
+                director_id=func.coalesce(changes.c.director_id, Movie.director_id),
+            )
+            .returning(*MOVIE_ROW)
+            .execution_options(synchronize_session=False)
+        )
+        return await get_all(db, query)
+
+    async def delete_many(self, db: AsyncSession, ids: Sequence[UUID]) -> Sequence[Row[Any]]:
+        query = delete(Movie).where(Movie.uuid.in_(ids)).returning(*MOVIE_ROW).execution_options(synchronize_session=False)
+        return await get_all(db, query)
+
+    async def clear_genres(self, db: AsyncSession, movie_ids: Sequence[UUID]) -> None:
+        if movie_ids:
+            await execute(db, delete(MovieGenreAssociation).where(MovieGenreAssociation.movie_id.in_(movie_ids)))
+
+    async def add_genres(self, db: AsyncSession, associations: Sequence[tuple[UUID, UUID]]) -> None:
+        if associations:
+            query = pg_insert(MovieGenreAssociation).values([{"movie_id": movie_id, "genre_id": genre_id} for movie_id, genre_id in associations])
+            await execute(db, query.on_conflict_do_nothing())
+
+    async def touch(self, db: AsyncSession, ids: Sequence[UUID] | None = None, director_id: UUID | None = None, genre_id: UUID | None = None) -> Sequence[UUID]:
+        """
+        Bumps `updated_at` and `version` for changes that don't write the movie row itself, like its genres or the rename
+        of its director or of one of its genres. Takes the same selection as `refresh_extended` and returns the touched ids.
+        """
+        if ids is not None and not ids:
+            return []
+        query = update(Movie).where(*movie_selection(ids, director_id, genre_id)).values(updated_at=func.now()).returning(Movie.uuid)
+        return await get_all_scalars(db, query.execution_options(synchronize_session=False))
+
+    async def refresh_extended(self, db: AsyncSession, ids: Sequence[UUID] | None = None, director_id: UUID | None = None, genre_id: UUID | None = None) -> None:
+        """
+        Rewrites the read model rows of the given movies, the movies of a director or of a genre, or of every movie.
+        Runs in the writing transaction, so readers never see a movie without its current director and genres.
+        """
+        if ids is not None and not ids:
+            return
+        query = movie_extended_rows().where(*movie_selection(ids, director_id, genre_id))
+
+        # pending ORM changes, like genre associations added to the session, have to be written first
+        await db.flush()
+        upsert = pg_insert(MovieReadModel).from_select(["movie_id", "director", "genres"], query)
+        await execute(db, upsert.on_conflict_do_update(index_elements=[MovieReadModel.movie_id], set_={"director": upsert.excluded.director, "genres": upsert.excluded.genres}))
+
+    async def get_genre_movie_ids(self, db: AsyncSession, genre_id: UUID) -> Sequence[UUID]:
+        return await get_all_scalars(db, select(MovieGenreAssociation.movie_id).where(MovieGenreAssociation.genre_id == genre_id))
+
+    def export_query(self, modified_since: datetime | None = None) -> Select:
+        query = projected_movie_query(EXPORT_PROJECTION).add_columns(Movie.updated_at)
+        if modified_since:
+            query = query.outerjoin(Director, Director.uuid == Movie.director_id)
+            # the director name and genres are exported with the movie, so renaming them changes the movie too
+            renamed_genre = (
+                select(MovieGenreAssociation.movie_id)
+                .join(Genre, Genre.uuid == MovieGenreAssociation.genre_id)
+                .where(MovieGenreAssociation.movie_id == Movie.uuid, Genre.updated_at >= modified_since)
+                .exists()
+            )
+            query = query.where(or_(Movie.updated_at >= modified_since, Director.updated_at >= modified_since, renamed_genre))
+        return query
+
+    async def last_modified(self, db: AsyncSession) -> datetime | None:
+        latest = (select(func.max(model.updated_at)).scalar_subquery() for model in (Movie, Director, Genre))
+        return await scalar(db, select(func.greatest(*latest)))
+
 
 def get_movie_crud() -> MovieCRUD:
     return MovieCRUD()
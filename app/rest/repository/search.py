@@ -0,0 +1,50 @@
+from functools import lru_cache
+from typing import Any, Sequence
+
+from sqlalchemy import BindParameter, Row, Select, String, bindparam, func, literal_column, or_, select, union_all
+from sqlalchemy.dialects.postgresql import REAL, websearch_to_tsquery
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.pagination import Cursor, page_params, paginate
+from app.db.utils import get_all
+from app.models import Director, Genre, Movie
+from app.rest.schemas.search import SearchType
+
+# searched column and text search configuration of each type, they match the generated search_vector columns
+SEARCH_TARGETS: dict[SearchType, tuple[Any, Any, str]] = {
+    SearchType.movie: (Movie, Movie.title, "english"),
+    SearchType.director: (Director, Director.name, "simple"),
+    SearchType.genre: (Genre, Genre.name, "simple"),
+}
+
+
+def target_query(type: SearchType, term: BindParameter) -> Select:
+    """
+    Rows of one type matching the search term either as full text or, to tolerate typos and partial words,
+    by trigram word similarity. Both conditions are served by the GIN indexes of the search_vector and searched columns.
+    """
+    model, name, config = SEARCH_TARGETS[type]
+    ts_query = websearch_to_tsquery(config, term)
+    rank = func.ts_rank_cd(model.search_vector, ts_query, type_=REAL) + func.word_similarity(term, name, type_=REAL)
+    return select(literal_column(f"'{type.value}'").label("type"), model.uuid, name.label("name"), rank.label("rank")).where(or_(model.search_vector.bool_op("@@")(ts_query), term.bool_op("<%")(name)))
+
+
+# built once per set of types and paging mode, like the listing statements
+@lru_cache(maxsize=32)
+def search_query(types: tuple[SearchType, ...], keyset: bool) -> Select:
+    term = bindparam("term", type_=String)
+    results = union_all(*(target_query(type, term) for type in types)).subquery("results")
+    return paginate(select(results), results.c.rank, results.c.uuid, keyset, descending=True)
+
+
+class SearchCRUD:
+    async def search(self, db: AsyncSession, term: str, types: Sequence[SearchType], limit: int = 20, after: Cursor | None = None) -> Sequence[Row[Any]]:
+        """
+        Best matches first, ties broken by uuid so keyset cursors stay stable
+        """
+        query = search_query(tuple(sorted(set(types), key=list(SearchType).index)), after is not None)
+        return await get_all(db, query, {"term": term, **page_params(0, limit, after)})
+
+
+def get_search_crud() -> SearchCRUD:
+    return SearchCRUD()
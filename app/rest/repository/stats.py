@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+from typing import Sequence
+
+from sqlalchemy import CompoundSelect, String, cast, delete, func, insert, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.utils import execute, get_all_scalars, scalar
+from app.models import Director, Genre, Movie, MovieGenreAssociation, MovieStats
+from app.rest.schemas.stats import StatsKind
+
+# transaction level advisory lock, taken by the worker rebuilding the counts so the others skip their turn
+REFRESH_LOCK_ID = 7_351_022
+
+decade = Movie.release_year // 10 * 10
+
+
+def stats_rows() -> CompoundSelect:
+    """
+    (kind, key, name, movie_count) of every genre, director and decade, counted from the catalog
+    """
+    genres = (
+        select(literal(StatsKind.genre.value), cast(Genre.uuid, String), Genre.name, func.count(MovieGenreAssociation.movie_id))
+        .outerjoin(MovieGenreAssociation, MovieGenreAssociation.genre_id == Genre.uuid)
+        .group_by(Genre.uuid)
+    )
+    directors = (
+        select(literal(StatsKind.director.value), cast(Director.uuid, String), Director.name, func.count(Movie.uuid)).outerjoin(Movie, Movie.director_id == Director.uuid).group_by(Director.uuid)
+    )
+    decades = select(literal(StatsKind.decade.value), func.coalesce(cast(decade, String), ""), cast(decade, String) + "s", func.count()).group_by(decade)
+    return union_all(genres, directors, decades)
+
+
+class StatsCRUD:
+    async def get_counts(self, db: AsyncSession, kind: StatsKind, limit: int | None = None) -> Sequence[MovieStats]:
+        query = select(MovieStats).where(MovieStats.kind == kind.value)
+        if kind == StatsKind.decade:
+            # chronological, movies without a release year last
+            query = query.order_by(MovieStats.key == "", MovieStats.key)
+        else:
+            query = query.order_by(MovieStats.movie_count.desc(), MovieStats.name)
+        return await get_all_scalars(db, query.limit(limit))
+
+    async def refresh(self, db: AsyncSession, max_age: int | None = None) -> datetime | None:
+        """
+        Replaces every count in one transaction, readers keep seeing the previous counts until it commits.
+        Returns when the counts were refreshed, None when another worker holds the lock or they are younger than `max_age` seconds.
+        """
+        if not await scalar(db, select(func.pg_try_advisory_xact_lock(REFRESH_LOCK_ID))):
+            return None
+        if max_age is not None and await scalar(db, select(func.max(MovieStats.refreshed_at) > func.now() - timedelta(seconds=max_age))):
+            return None
+
+        await execute(db, delete(MovieStats))
+        await execute(db, insert(MovieStats).from_select(["kind", "key", "name", "movie_count"], stats_rows()))
+        return await scalar(db, select(func.now()))
+
+
+def get_stats_crud() -> StatsCRUD:
+    return StatsCRUD()
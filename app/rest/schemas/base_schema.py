@@ -1,5 +1,43 @@
+from enum import Enum
+from typing import Any, Callable, Generic, Sequence, TypeVar
+
 from pydantic import BaseModel, ConfigDict
 
+from app.db.pagination import encode_cursor
+
+T = TypeVar("T")
+
 
 class ResponseSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class TotalMode(Enum):
+    # COUNT(*) with the same filters as the listing, cached until the next write
+    exact = "exact"
+    # the table size from planner statistics, unfiltered listings only, filtered ones are counted exactly
+    estimated = "estimated"
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    cursors: list[str] = []
+    next_cursor: str | None = None
+
+    @classmethod
+    def from_items(cls, items: Sequence[Any], limit: int, order: str, key: Callable[[Any], Any]) -> "Page":
+        """
+        Builds a page from up to `limit + 1` rows, the extra row only signals that another page exists
+        """
+        page_items = list(items[:limit])
+        cursors = [encode_cursor(key(item), item.uuid, order) for item in page_items]
+        next_cursor = cursors[-1] if len(items) > limit and cursors else None
+        return cls(items=page_items, cursors=cursors, next_cursor=next_cursor)
+
+    @classmethod
+    def from_documents(cls, rows: Sequence[Any], limit: int, order: str, key: Callable[[Any], Any]) -> "Page[str]":
+        """
+        Builds a page of JSON documents from up to `limit + 1` rows carrying a `document` next to their order key columns
+        """
+        page = cls.from_items(rows, limit, order, key)
+        return Page[str](items=[row.document for row in page.items], cursors=page.cursors, next_cursor=page.next_cursor)
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from pydantic import ConfigDict
+from pydantic import ConfigDict, TypeAdapter
 
 from app.rest.schemas.base_schema import ResponseSchema
 from app.rest.schemas.movies import MovieInDirector
@@ -25,3 +25,9 @@ class DirectorExtended(DirectorInDB):
 class DirectorUpdate(ResponseSchema):
     uuid: UUID
     name: str
+
+
+# whole lists are validated and serialized in one call rather than once per item
+DIRECTOR_LIST = TypeAdapter(list[DirectorInDB])
+DIRECTOR_EXTENDED_LIST = TypeAdapter(list[DirectorExtended])
+DIRECTOR_PAGE = TypeAdapter(list[DirectorInDB | DirectorExtended])
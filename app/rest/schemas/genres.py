@@ -1,5 +1,7 @@
 from uuid import UUID
 
+from pydantic import TypeAdapter
+
 from app.rest.schemas.base_schema import ResponseSchema
 from app.rest.schemas.movies import MovieInDB
 
@@ -19,3 +21,9 @@ class GenreExtended(GenreInDB):
 class GenreUpdate(ResponseSchema):
     uuid: UUID
     name: str
+
+
+# whole lists are validated and serialized in one call rather than once per item
+GENRE_LIST = TypeAdapter(list[GenreInDB])
+GENRE_EXTENDED_LIST = TypeAdapter(list[GenreExtended])
+GENRE_PAGE = TypeAdapter(list[GenreInDB | GenreExtended])
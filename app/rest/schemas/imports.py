@@ -0,0 +1,19 @@
+from enum import Enum
+
+from app.rest.schemas.base_schema import ResponseSchema
+
+
+class ImportFormat(Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+class ImportReport(ResponseSchema):
+    rows: int = 0
+    skipped: int = 0
+    chunks: int = 0
+    directors: int = 0
+    genres: int = 0
+    movies: int = 0
+    associations: int = 0
+    errors: list[str] = []
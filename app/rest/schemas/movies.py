@@ -1,7 +1,7 @@
 from enum import Enum
 from uuid import UUID
 
-from pydantic import ConfigDict
+from pydantic import ConfigDict, TypeAdapter
 
 from app.rest.schemas.base_schema import ResponseSchema
 
@@ -16,6 +16,25 @@ class MovieSort(Enum):
     desc = "desc"
 
 
+class GenreMatch(Enum):
+    any = "any"
+    all = "all"
+
+
+class MovieFilter(ResponseSchema):
+    """
+    Conditions a listed movie has to meet, all of them combined
+    """
+
+    year_from: int | None = None
+    year_to: int | None = None
+    director_ids: list[UUID] | None = None
+    # genre names, a movie matches with any or with all of them
+    genres: list[str] | None = None
+    genre_match: GenreMatch = GenreMatch.any
+    title_prefix: str | None = None
+
+
 class MovieCreate(ResponseSchema):
     title: str
     release_year: int | None = None
@@ -51,3 +70,21 @@ class MovieUpdate(ResponseSchema):
     release_year: int | None = None
     director_id: UUID | None = None
     genre: str | None = None
+
+
+class MovieBatchError(ResponseSchema):
+    index: int
+    id: UUID | None = None
+    detail: str
+
+
+class MovieBatchResult(ResponseSchema):
+    movies: list[MovieInDB] = []
+    errors: list[MovieBatchError] = []
+
+
+# whole lists are validated and serialized in one call rather than once per item
+MOVIE_LIST = TypeAdapter(list[MovieInDB])
+MOVIE_EXTENDED_LIST = TypeAdapter(list[MovieExtended])
+MOVIE_IN_DIRECTOR_LIST = TypeAdapter(list[MovieInDirector])
+MOVIE_PAGE = TypeAdapter(list[MovieInDB | MovieExtended])
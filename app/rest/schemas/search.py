@@ -0,0 +1,18 @@
+from enum import Enum
+from uuid import UUID
+
+from app.rest.schemas.base_schema import ResponseSchema
+
+
+class SearchType(Enum):
+    movie = "movie"
+    director = "director"
+    genre = "genre"
+
+
+class SearchResult(ResponseSchema):
+    type: SearchType
+    uuid: UUID
+    # the movie title, or the director or genre name
+    name: str
+    rank: float
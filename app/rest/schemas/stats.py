@@ -0,0 +1,35 @@
+from datetime import datetime
+from enum import Enum
+from uuid import UUID
+
+from app.rest.schemas.base_schema import ResponseSchema
+
+
+class StatsKind(Enum):
+    genre = "genre"
+    director = "director"
+    decade = "decade"
+
+
+class GenreCount(ResponseSchema):
+    uuid: UUID
+    name: str
+    movie_count: int
+
+
+class DirectorCount(ResponseSchema):
+    uuid: UUID
+    name: str
+    movie_count: int
+
+
+class DecadeCount(ResponseSchema):
+    # first year of the decade, None for movies without a release year
+    decade: int | None
+    movie_count: int
+
+
+class StatsRefreshReport(ResponseSchema):
+    # False when another worker was refreshing, or the counts were refreshed less than `max_age` seconds ago
+    refreshed: bool
+    refreshed_at: datetime | None = None
@@ -0,0 +1,68 @@
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from email.utils import format_datetime
+from typing import Any
+
+from fastapi import Response
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+from app.rest.services.exports import parse_http_date
+
+
+@dataclass(frozen=True)
+class Validators:
+    """
+    Strong ETag and, for representations built from a single row, Last-Modified date of a response
+    """
+
+    etag: str
+    last_modified: datetime | None = None
+    # uuids of the rows, so cached validators are invalidated together with the representation
+    ids: tuple[Any, ...] = field(default=(), compare=False)
+
+    @classmethod
+    def from_versions(cls, rows: Iterable[Iterable[Any]], last_modified: datetime | None = None) -> "Validators":
+        """
+        Hashes the (uuid, version, ...) rows a representation is built from, in their order
+        """
+        digest = hashlib.sha1(usedforsecurity=False)
+        ids = []
+        for row in rows:
+            values = list(row)
+            ids.append(values[0])
+            digest.update(",".join(str(value) for value in values).encode() + b"\n")
+        # HTTP dates have a one second precision
+        return cls(etag=f'"{digest.hexdigest()}"', last_modified=last_modified.replace(microsecond=0) if last_modified else None, ids=tuple(ids))
+
+    def headers(self) -> dict[str, str]:
+        headers = {"ETag": self.etag}
+        if self.last_modified:
+            headers["Last-Modified"] = format_datetime(self.last_modified.astimezone(UTC), usegmt=True)
+        return headers
+
+
+def is_not_modified(validators: Validators, if_none_match: str | None, if_modified_since: str | None) -> bool:
+    """
+    Evaluates the conditional headers of a GET as RFC 9110 does: If-None-Match wins over If-Modified-Since when both are sent
+    """
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or validators.etag in tags
+
+    modified_since = parse_http_date(if_modified_since)
+    return modified_since is not None and validators.last_modified is not None and validators.last_modified <= modified_since
+
+
+def conditional_response(response: Response, validators: Validators | None, if_none_match: str | None, if_modified_since: str | None) -> Response | None:
+    """
+    Adds the validators to the response, or returns the 304 to send instead of it when the client's copy is current.
+    Without validators, e.g. for a missing entity, the request goes on unconditionally.
+    """
+    if validators is None:
+        return None
+    if is_not_modified(validators, if_none_match, if_modified_since):
+        return Response(status_code=HTTP_304_NOT_MODIFIED, headers=validators.headers())
+    response.headers.update(validators.headers())
+    return None
@@ -1,19 +1,24 @@
-from typing import Sequence
+from typing import Any, Sequence
 from uuid import UUID
 
 from fastapi import Depends, HTTPException
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from starlette.status import HTTP_404_NOT_FOUND, HTTP_500_INTERNAL_SERVER_ERROR
+from starlette.status import HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND, HTTP_500_INTERNAL_SERVER_ERROR
 from strawberry import ID
 
+from app.cache.result_cache import ResultCache, entity_tag, get_result_cache, list_tag
 from app.core.logging_setup import logger
+from app.db.pagination import Cursor, InvalidCursorError, decode_cursor
 from app.db.session import get_db
-from app.db.utils import get_all
-from app.models import Movie
+from app.db.utils import estimated_count, get_all
+from app.models import Director, Movie
 from app.rest.repository.directors import DirectorCRUD, get_director_crud
-from app.rest.schemas.directors import DirectorCreate, DirectorExtended, DirectorInDB, DirectorUpdate
-from app.rest.schemas.movies import MovieInDirector
+from app.rest.repository.movies import get_movie_crud
+from app.rest.schemas.base_schema import Page, TotalMode
+from app.rest.schemas.directors import DIRECTOR_EXTENDED_LIST, DIRECTOR_LIST, DirectorCreate, DirectorExtended, DirectorInDB, DirectorUpdate
+from app.rest.schemas.movies import MOVIE_IN_DIRECTOR_LIST
+from app.rest.services.conditional import Validators
 
 
 class DirectorsService:
@@ -21,34 +26,130 @@ class DirectorsService:
         self,
         db: AsyncSession = Depends(get_db),
         crud: DirectorCRUD = Depends(get_director_crud),
+        cache: ResultCache = Depends(get_result_cache),
     ):
         self.db = db
         self.crud = crud
+        self.cache = cache
 
-    async def get_all_directors(self, skip: int = 0, limit: int = 20, with_movies: bool = False) -> Sequence[DirectorInDB | DirectorExtended]:
+    async def get_all_directors(self, skip: int = 0, limit: int = 20, with_movies: bool = False, cursor: str | None = None) -> Page[DirectorInDB | DirectorExtended]:
+        order = "name:asc"
         try:
-            results: Sequence = await self.crud.get_all(self.db, skip=skip, limit=limit, with_movies=with_movies)
+            after = decode_cursor(cursor, order) if cursor else None
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+        key = self.cache.key("directors.get_all_directors", skip=skip, limit=limit, with_movies=with_movies, cursor=cursor)
+        return await self.cache.get_or_set(self.db, key, lambda: self._get_directors_page(skip, limit, with_movies, after), tags=director_page_tags)
+
+    async def get_director_documents(self, skip: int = 0, limit: int = 20, cursor: str | None = None) -> Page[str]:
+        """
+        Page of directors with their movies as JSON documents rendered by Postgres
+        """
+        order = "name:asc"
+        try:
+            after = decode_cursor(cursor, order) if cursor else None
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+        key = self.cache.key("directors.get_director_documents", skip=skip, limit=limit, cursor=cursor)
+        return await self.cache.get_or_set(self.db, key, lambda: self._get_director_documents(skip, limit, after), tags=director_document_tags)
+
+    async def get_directors_page_validators(self, skip: int = 0, limit: int = 20, with_movies: bool = False, cursor: str | None = None) -> Validators:
+        """
+        ETag of a directors page from the versions of its rows, without fetching them. The row after the page is
+        included, since it decides the next cursor.
+        """
+        try:
+            after = decode_cursor(cursor, "name:asc") if cursor else None
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+        key = self.cache.key("directors.get_directors_page_validators", skip=skip, limit=limit, with_movies=with_movies, cursor=cursor)
+        return await self.cache.get_or_set(
+            self.db, key, lambda: self._get_directors_page_validators(skip, limit, with_movies, after), tags=lambda validators: director_validator_tags(validators, with_movies)
+        )
+
+    async def _get_directors_page_validators(self, skip: int, limit: int, with_movies: bool, after: Cursor | None) -> Validators:
+        try:
+            return Validators.from_versions(await self.crud.get_page_versions(self.db, skip=skip, limit=limit + 1, with_movies=with_movies, after=after))
+        except Exception as e:
+            error_detail = "An error occurred while checking directors for changes."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+    async def get_director_validators(self, id: UUID | None = None, name: str | None = None, with_movies: bool = False) -> Validators | None:
+        """
+        ETag of a director, None when it doesn't exist. Last-Modified only applies without movies, removing one of
+        them leaves every date as it was.
+        """
+        key = self.cache.key("directors.get_director_validators", id=id, name=name, with_movies=with_movies)
+        return await self.cache.get_or_set(self.db, key, lambda: self._get_director_validators(id, name, with_movies), tags=lambda validators: director_validator_tags(validators, with_movies))
+
+    async def _get_director_validators(self, id: UUID | None, name: str | None, with_movies: bool) -> Validators | None:
+        try:
+            row = await self.crud.get_version(self.db, id=id, name=name, with_movies=with_movies)
+        except Exception as e:
+            error_detail = "An error occurred while checking a director for changes."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+        if row is None:
+            return None
+        *versions, updated_at = row
+        return Validators.from_versions([versions], last_modified=None if with_movies else updated_at)
+
+    async def count_directors(self, mode: TotalMode = TotalMode.exact) -> int:
+        """
+        Estimated counts come from the table statistics, exact ones are counted and cached until a director is created or removed
+        """
+        try:
+            if mode == TotalMode.estimated:
+                estimate = await estimated_count(self.db, Director.__tablename__)
+                if estimate is not None:
+                    return estimate
+
+            key = self.cache.key("directors.count_directors")
+            return await self.cache.get_or_set(self.db, key, lambda: self.crud.count(self.db), tags=lambda _: [list_tag("director")])
+        except Exception as e:
+            error_detail = "An error occurred while counting directors."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+    async def _get_directors_page(self, skip: int, limit: int, with_movies: bool, after: Cursor | None) -> Page[DirectorInDB | DirectorExtended]:
+        order = "name:asc"
+        try:
+            results: Sequence = await self.crud.get_all(self.db, skip=skip, limit=limit + 1, with_movies=with_movies, after=after)
+            directors: list[DirectorInDB | DirectorExtended] = []
             if with_movies:
-                directors_with_movies: list[DirectorExtended] = []
-                for director, movies in results:
-                    director_resp = DirectorExtended.model_validate(director)
-                    director_resp.movies = [MovieInDirector.model_validate(movie) for movie in movies] if movies else []
-                    directors_with_movies.append(director_resp)
-                return directors_with_movies
-            return [DirectorInDB.model_validate(data) for data in results]
+                directors.extend(directors_with_movies(results))
+            else:
+                directors.extend(DIRECTOR_LIST.validate_python(results, from_attributes=True))
+            return Page.from_items(directors, limit, order, key=lambda director: director.name)
+        except Exception as e:
+            error_detail = "An error occurred while fetching directors."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+    async def _get_director_documents(self, skip: int, limit: int, after: Cursor | None) -> Page[str]:
+        try:
+            rows = await self.crud.get_all_documents(self.db, skip=skip, limit=limit + 1, after=after)
+            return Page.from_documents(rows, limit, "name:asc", key=lambda row: row.name)
         except Exception as e:
             error_detail = "An error occurred while fetching directors."
             logger.error(f"{error_detail} - details: {e}", exc_info=e)
             raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
 
     async def get_director_by_id(self, id: UUID | ID, with_movies: bool = False) -> DirectorInDB | DirectorExtended:
+        key = self.cache.key("directors.get_director_by_id", id=id, with_movies=with_movies)
+        return await self.cache.get_or_set(self.db, key, lambda: self._get_director_by_id(id, with_movies), tags=director_tags)
+
+    async def _get_director_by_id(self, id: UUID | ID, with_movies: bool) -> DirectorInDB | DirectorExtended:
         result = None
         try:
             result = await self.crud.get_one(self.db, id=id, with_movies=with_movies)
             if with_movies and isinstance(result, Sequence):
-                director = DirectorExtended.model_validate(result[0][0])
-                director.movies = [MovieInDirector.model_validate(movie) for movie in result[0][1]] if result[0][1] else []
-                return director
+                return directors_with_movies(result[:1])[0]
             return DirectorInDB.model_validate(result)
         except Exception as e:
             error_detail = f"An error occurred while fetching director. {e}" if result else f"Director with id {id} not found."
@@ -56,13 +157,15 @@ class DirectorsService:
             raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=error_detail)
 
     async def get_director_by_name(self, name: str, with_movies: bool = False) -> DirectorInDB | DirectorExtended:
+        key = self.cache.key("directors.get_director_by_name", name=name, with_movies=with_movies)
+        return await self.cache.get_or_set(self.db, key, lambda: self._get_director_by_name(name, with_movies), tags=director_tags)
+
+    async def _get_director_by_name(self, name: str, with_movies: bool) -> DirectorInDB | DirectorExtended:
         result = None
         try:
             result = await self.crud.get_one(self.db, name=name, with_movies=with_movies)
             if with_movies and isinstance(result, Sequence):
-                director = DirectorExtended.model_validate(result[0][0])
-                director.movies = [MovieInDirector.model_validate(movie) for movie in result[0][1]] if result[0][1] else []
-                return director
+                return directors_with_movies(result[:1])[0]
             return DirectorInDB.model_validate(result)
         except Exception as e:
             error_detail = f"An error occurred while fetching director. {e}" if result else f"Director with name {name} not found."
@@ -80,7 +183,7 @@ class DirectorsService:
                 .group_by(Movie.director_id)
             )
             result = await get_all(self.db, query)
-            director_movies_map = {director_id: [MovieInDirector.model_validate(m) for m in movies] for director_id, movies in result}
+            director_movies_map = {director_id: MOVIE_IN_DIRECTOR_LIST.validate_python(movies) for director_id, movies in result}
             return director_movies_map
         except Exception as e:
             error_detail = f"An error occurred while fetching directors' movies. {e}"
@@ -90,6 +193,7 @@ class DirectorsService:
     async def create_director(self, director_data: DirectorCreate) -> DirectorInDB:
         try:
             result = await self.crud.create(self.db, name=director_data.name)
+            self.cache.invalidate_on_commit(self.db, list_tag("director"))
             return DirectorInDB.model_validate(result)
         except Exception as e:
             error_detail = "An error occurred while creating a director."
@@ -99,6 +203,13 @@ class DirectorsService:
     async def update_director(self, director_data: DirectorUpdate) -> DirectorInDB:
         try:
             result = await self.crud.update(self.db, director_data=director_data)
+            movie_ids: Sequence[UUID] = []
+            if result:
+                # its movies show the director's name, so their versions and validators move with it
+                movie_crud = get_movie_crud()
+                movie_ids = await movie_crud.touch(self.db, director_id=director_data.uuid)
+                await movie_crud.refresh_extended(self.db, director_id=director_data.uuid)
+            self.cache.invalidate_on_commit(self.db, entity_tag("director", director_data.uuid), list_tag("director"), list_tag("movie"), *(entity_tag("movie", movie_id) for movie_id in movie_ids))
             return DirectorInDB.model_validate(result)
         except Exception as e:
             error_detail = "An error occurred while updating a director."
@@ -108,8 +219,38 @@ class DirectorsService:
     async def remove_director(self, id: UUID) -> DirectorInDB:
         try:
             result = await self.crud.delete(self.db, id=id)
+            self.cache.invalidate_on_commit(self.db, entity_tag("director", id), list_tag("director"))
             return DirectorInDB.model_validate(result)
         except Exception as e:
             error_detail = "An error occurred while removing a director."
             logger.error(f"{error_detail} - details: {e}", exc_info=e)
             raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+
+def directors_with_movies(rows: Sequence[Any]) -> list[DirectorExtended]:
+    """
+    Directors of (director, movies) rows, the movies being the aggregated JSON objects, validated as one list
+    """
+    return DIRECTOR_EXTENDED_LIST.validate_python([{"uuid": director.uuid, "name": director.name, "movies": movies or []} for director, movies in rows])
+
+
+def director_tags(director: DirectorInDB | DirectorExtended) -> list[str]:
+    tags = [entity_tag("director", director.uuid)]
+    if isinstance(director, DirectorExtended):
+        tags += [entity_tag("movie", movie.uuid) for movie in director.movies or []]
+    return tags
+
+
+def director_validator_tags(validators: Validators | None, with_movies: bool) -> list[str]:
+    # lookups by name and pages change with any director created, the movie versions folded in with any movie write
+    tags = [list_tag("director"), *(entity_tag("director", id) for id in (validators.ids if validators else ()))]
+    return tags + [list_tag("movie")] if with_movies else tags
+
+
+def director_page_tags(page: Page[DirectorInDB | DirectorExtended]) -> list[str]:
+    return [list_tag("director"), *(tag for director in page.items for tag in director_tags(director))]
+
+
+def director_document_tags(page: Page[str]) -> list[str]:
+    # the documents aren't decoded, so the page goes stale with any director or movie write rather than with the ones it embeds
+    return [list_tag("director"), list_tag("movie")]
@@ -0,0 +1,134 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.status import HTTP_304_NOT_MODIFIED, HTTP_500_INTERNAL_SERVER_ERROR
+
+from app.core.config import settings
+from app.core.logging_setup import logger
+from app.db.routing import READ_ONLY_TRANSACTION, use_read_only_mode
+from app.db.session import AsyncSessionLocal, get_db
+from app.rest.repository.directors import DirectorCRUD, get_director_crud
+from app.rest.repository.genres import GenreCRUD, get_genre_crud
+from app.rest.repository.movies import MovieCRUD, get_movie_crud
+from app.rest.schemas.exports import ExportFormat
+
+MEDIA_TYPES = {ExportFormat.csv: "text/csv", ExportFormat.ndjson: "application/x-ndjson"}
+
+
+@dataclass
+class CatalogExport:
+    media_type: str
+    last_modified: datetime | None
+    # None when nothing changed since the requested date
+    rows: AsyncIterator[str] | None = None
+
+
+def parse_http_date(value: str | None) -> datetime | None:
+    """
+    Parses an `If-Modified-Since` header, invalid dates are ignored as HTTP requires
+    """
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def export_response(export: CatalogExport) -> Response:
+    headers = {"Last-Modified": format_datetime(export.last_modified.astimezone(UTC), usegmt=True)} if export.last_modified else {}
+    if export.rows is None:
+        return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+    return StreamingResponse(export.rows, media_type=export.media_type, headers=headers)
+
+
+def serialize(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value) if value is not None and not isinstance(value, (str, int, float, bool)) else value
+
+
+async def stream_rows(query: Select, format: ExportFormat) -> AsyncIterator[str]:
+    """
+    Streams the query result through a server-side cursor, one serialized batch of `EXPORT_BATCH_SIZE` rows at a time.
+    The stream runs on its own session since the request session is closed before the response body is sent,
+    in a read-only transaction as server-side cursors can't live outside one.
+    """
+    async with AsyncSessionLocal() as session:
+        use_read_only_mode(session, READ_ONLY_TRANSACTION)
+        try:
+            result = await session.stream(query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+            columns = list(result.keys())
+            if format == ExportFormat.csv:
+                yield csv_lines([columns])
+
+            async for rows in result.partitions():
+                records = [[serialize(value) for value in row] for row in rows]
+                if format == ExportFormat.csv:
+                    yield csv_lines(records)
+                else:
+                    yield "".join(json.dumps(dict(zip(columns, record))) + "\n" for record in records)
+        except Exception as e:
+            # the status line is already sent, the client sees a truncated body
+            logger.error(f"An error occurred while streaming an export. - details: {e}", exc_info=e)
+            raise
+
+
+def csv_lines(records: list[list[Any]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(records)
+    return buffer.getvalue()
+
+
+class ExportService:
+    def __init__(
+        self,
+        db: AsyncSession = Depends(get_db),
+        movie_crud: MovieCRUD = Depends(get_movie_crud),
+        director_crud: DirectorCRUD = Depends(get_director_crud),
+        genre_crud: GenreCRUD = Depends(get_genre_crud),
+    ):
+        self.db = db
+        self.movie_crud = movie_crud
+        self.director_crud = director_crud
+        self.genre_crud = genre_crud
+
+    async def export_movies(self, format: ExportFormat = ExportFormat.ndjson, modified_since: datetime | None = None) -> CatalogExport:
+        """
+        Every movie with its director name and genres, or only those changed after `modified_since`
+        """
+        return await self._export(self.movie_crud, format, modified_since)
+
+    async def export_directors(self, format: ExportFormat = ExportFormat.ndjson, modified_since: datetime | None = None) -> CatalogExport:
+        return await self._export(self.director_crud, format, modified_since)
+
+    async def export_genres(self, format: ExportFormat = ExportFormat.ndjson, modified_since: datetime | None = None) -> CatalogExport:
+        return await self._export(self.genre_crud, format, modified_since)
+
+    async def _export(self, crud: MovieCRUD | DirectorCRUD | GenreCRUD, format: ExportFormat, modified_since: datetime | None) -> CatalogExport:
+        try:
+            last_modified = await crud.last_modified(self.db)
+        except Exception as e:
+            error_detail = "An error occurred while preparing an export."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+        # HTTP dates drop the fraction of a second, so rows changed during the second of `modified_since` are sent again
+        # rather than risking to skip one, the 304 is decided on the same full precision date the rows are filtered on
+        export = CatalogExport(media_type=MEDIA_TYPES[format], last_modified=last_modified)
+        if modified_since and (last_modified is None or last_modified < modified_since):
+            return export
+
+        export.rows = stream_rows(crud.export_query(modified_since), format)
+        return export
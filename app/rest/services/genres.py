@@ -1,18 +1,23 @@
-from typing import Sequence
+from typing import Any, Sequence
 from uuid import UUID
 
 from fastapi import Depends, HTTPException
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from starlette.status import HTTP_404_NOT_FOUND, HTTP_500_INTERNAL_SERVER_ERROR
+from starlette.status import HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND, HTTP_500_INTERNAL_SERVER_ERROR
 
+from app.cache.result_cache import ResultCache, entity_tag, get_result_cache, list_tag
 from app.core.logging_setup import logger
+from app.db.pagination import Cursor, InvalidCursorError, decode_cursor
 from app.db.session import get_db
-from app.db.utils import get_all
-from app.models import Movie, MovieGenreAssociation
+from app.db.utils import estimated_count, get_all
+from app.models import Genre, Movie, MovieGenreAssociation
 from app.rest.repository.genres import GenreCRUD, get_genre_crud
-from app.rest.schemas.genres import GenreCreate, GenreExtended, GenreInDB, GenreUpdate
-from app.rest.schemas.movies import MovieInDB
+from app.rest.repository.movies import get_movie_crud
+from app.rest.schemas.base_schema import Page, TotalMode
+from app.rest.schemas.genres import GENRE_EXTENDED_LIST, GENRE_LIST, GenreCreate, GenreExtended, GenreInDB, GenreUpdate
+from app.rest.schemas.movies import MOVIE_LIST
+from app.rest.services.conditional import Validators
 
 
 class GenresService:
@@ -20,14 +25,93 @@ class GenresService:
         self,
         db: AsyncSession = Depends(get_db),
         crud: GenreCRUD = Depends(get_genre_crud),
+        cache: ResultCache = Depends(get_result_cache),
     ):
         self.db = db
         self.crud = crud
+        self.cache = cache
 
-    async def get_all_genres(self, skip: int = 0, limit: int = 20) -> Sequence[GenreInDB]:
+    async def get_all_genres(self, skip: int = 0, limit: int = 20, with_movies: bool = False, cursor: str | None = None) -> Page[GenreInDB | GenreExtended]:
+        order = "name:asc"
         try:
-            results: Sequence = await self.crud.get_all(self.db, skip=skip, limit=limit)
-            return [GenreInDB.model_validate(data) for data in results]
+            after = decode_cursor(cursor, order) if cursor else None
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+        key = self.cache.key("genres.get_all_genres", skip=skip, limit=limit, with_movies=with_movies, cursor=cursor)
+        return await self.cache.get_or_set(self.db, key, lambda: self._get_genres_page(skip, limit, with_movies, after), tags=genre_page_tags)
+
+    async def get_genres_page_validators(self, skip: int = 0, limit: int = 20, with_movies: bool = False, cursor: str | None = None) -> Validators:
+        """
+        ETag of a genres page from the versions of its rows, without fetching them. The row after the page is
+        included, since it decides the next cursor.
+        """
+        try:
+            after = decode_cursor(cursor, "name:asc") if cursor else None
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+        key = self.cache.key("genres.get_genres_page_validators", skip=skip, limit=limit, with_movies=with_movies, cursor=cursor)
+        return await self.cache.get_or_set(
+            self.db, key, lambda: self._get_genres_page_validators(skip, limit, with_movies, after), tags=lambda validators: genre_validator_tags(validators, with_movies)
+        )
+
+    async def _get_genres_page_validators(self, skip: int, limit: int, with_movies: bool, after: Cursor | None) -> Validators:
+        try:
+            return Validators.from_versions(await self.crud.get_page_versions(self.db, skip=skip, limit=limit + 1, with_movies=with_movies, after=after))
+        except Exception as e:
+            error_detail = "An error occurred while checking genres for changes."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+    async def get_genre_validators(self, id: UUID | None = None, name: str | None = None, with_movies: bool = False) -> Validators | None:
+        """
+        ETag of a genre, None when it doesn't exist. Last-Modified only applies without movies, removing one of
+        them leaves every date as it was.
+        """
+        key = self.cache.key("genres.get_genre_validators", id=id, name=name, with_movies=with_movies)
+        return await self.cache.get_or_set(self.db, key, lambda: self._get_genre_validators(id, name, with_movies), tags=lambda validators: genre_validator_tags(validators, with_movies))
+
+    async def _get_genre_validators(self, id: UUID | None, name: str | None, with_movies: bool) -> Validators | None:
+        try:
+            row = await self.crud.get_version(self.db, id=id, name=name, with_movies=with_movies)
+        except Exception as e:
+            error_detail = "An error occurred while checking a genre for changes."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+        if row is None:
+            return None
+        *versions, updated_at = row
+        return Validators.from_versions([versions], last_modified=None if with_movies else updated_at)
+
+    async def count_genres(self, mode: TotalMode = TotalMode.exact) -> int:
+        """
+        Estimated counts come from the table statistics, exact ones are counted and cached until a genre is created or removed
+        """
+        try:
+            if mode == TotalMode.estimated:
+                estimate = await estimated_count(self.db, Genre.__tablename__)
+                if estimate is not None:
+                    return estimate
+
+            key = self.cache.key("genres.count_genres")
+            return await self.cache.get_or_set(self.db, key, lambda: self.crud.count(self.db), tags=lambda _: [list_tag("genre")])
+        except Exception as e:
+            error_detail = "An error occurred while counting genres."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+    async def _get_genres_page(self, skip: int, limit: int, with_movies: bool, after: Cursor | None) -> Page[GenreInDB | GenreExtended]:
+        order = "name:asc"
+        try:
+            results: Sequence = await self.crud.get_all(self.db, skip=skip, limit=limit + 1, with_movies=with_movies, after=after)
+            genres: list[GenreInDB | GenreExtended] = []
+            if with_movies:
+                genres.extend(genres_with_movies(results))
+            else:
+                genres.extend(GENRE_LIST.validate_python(results, from_attributes=True))
+            return Page.from_items(genres, limit, order, key=lambda genre: genre.name)
         except Exception as e:
             error_detail = "An error occurred while fetching genres."
             logger.error(f"{error_detail} - details: {e}", exc_info=e)
@@ -59,7 +143,7 @@ class GenresService:
                 .group_by(MovieGenreAssociation.genre_id)
             )
             result = await get_all(self.db, query)
-            director_movies_map = {genre_id: [MovieInDB.model_validate(m) for m in movies] for genre_id, movies in result}
+            director_movies_map = {genre_id: MOVIE_LIST.validate_python(movies) for genre_id, movies in result}
             return director_movies_map
         except Exception as e:
             error_detail = f"An error occurred while fetching genre' movies. {e}"
@@ -67,13 +151,15 @@ class GenresService:
             raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=error_detail)
 
     async def get_genre_by_id(self, id: UUID, with_movies: bool = False) -> GenreInDB | GenreExtended:
+        key = self.cache.key("genres.get_genre_by_id", id=id, with_movies=with_movies)
+        return await self.cache.get_or_set(self.db, key, lambda: self._get_genre_by_id(id, with_movies), tags=genre_tags)
+
+    async def _get_genre_by_id(self, id: UUID, with_movies: bool) -> GenreInDB | GenreExtended:
         result = None
         try:
             result = await self.crud.get_one(self.db, id=id, with_movies=with_movies)
             if with_movies and isinstance(result, Sequence):
-                genre = GenreExtended.model_validate(result[0][0])
-                genre.movies = [MovieInDB.model_validate(movie) for movie in result[0][1]] if result[0][1] else []
-                return genre
+                return genres_with_movies(result[:1])[0]
             return GenreInDB.model_validate(result)
         except Exception as e:
             error_detail = f"An error occurred while fetching genre. {e}" if result else f"Genre with id {id} not found."
@@ -81,13 +167,15 @@ class GenresService:
             raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=error_detail)
 
     async def get_genre_by_name(self, name: str, with_movies: bool = False) -> GenreInDB | GenreExtended:
+        key = self.cache.key("genres.get_genre_by_name", name=name, with_movies=with_movies)
+        return await self.cache.get_or_set(self.db, key, lambda: self._get_genre_by_name(name, with_movies), tags=genre_tags)
+
+    async def _get_genre_by_name(self, name: str, with_movies: bool) -> GenreInDB | GenreExtended:
         result = None
         try:
             result = await self.crud.get_one(self.db, name=name, with_movies=with_movies)
             if with_movies and isinstance(result, Sequence):
-                genre = GenreExtended.model_validate(result[0][0])
-                genre.movies = [MovieInDB.model_validate(movie) for movie in result[0][1]] if result[0][1] else []
-                return genre
+                return genres_with_movies(result[:1])[0]
             return GenreInDB.model_validate(result)
         except Exception as e:
             error_detail = f"An error occurred while fetching genre. {e}" if result else f"Genre with name {name} not found."
@@ -97,6 +185,7 @@ class GenresService:
     async def create_genre(self, genre_data: GenreCreate) -> GenreInDB:
         try:
             result = await self.crud.create(self.db, name=genre_data.name)
+            self.cache.invalidate_on_commit(self.db, list_tag("genre"))
             return GenreInDB.model_validate(result)
         except Exception as e:
             error_detail = "An error occurred while creating a genre."
@@ -106,6 +195,13 @@ class GenresService:
     async def update_genre(self, genre_data: GenreUpdate) -> GenreInDB:
         try:
             result = await self.crud.update(self.db, genre_data=genre_data)
+            movie_ids: Sequence[UUID] = []
+            if result:
+                # its movies show the genre's name, so their versions and validators move with it
+                movie_crud = get_movie_crud()
+                movie_ids = await movie_crud.touch(self.db, genre_id=genre_data.uuid)
+                await movie_crud.refresh_extended(self.db, genre_id=genre_data.uuid)
+            self.cache.invalidate_on_commit(self.db, entity_tag("genre", genre_data.uuid), list_tag("genre"), list_tag("movie"), *(entity_tag("movie", movie_id) for movie_id in movie_ids))
             return GenreInDB.model_validate(result)
         except Exception as e:
             error_detail = "An error occurred while updating a genre."
@@ -114,9 +210,39 @@ class GenresService:
 
     async def remove_genre(self, id: UUID) -> GenreInDB:
         try:
+            # the associations go with the genre, so its movies are looked up first
+            movie_crud = get_movie_crud()
+            movie_ids = await movie_crud.get_genre_movie_ids(self.db, id)
             result = await self.crud.delete(self.db, id=id)
+            await movie_crud.touch(self.db, movie_ids)
+            await movie_crud.refresh_extended(self.db, ids=movie_ids)
+            self.cache.invalidate_on_commit(self.db, entity_tag("genre", id), list_tag("genre"), list_tag("movie"), *(entity_tag("movie", movie_id) for movie_id in movie_ids))
             return GenreInDB.model_validate(result)
         except Exception as e:
             error_detail = "An error occurred while removing a genre."
             logger.error(f"{error_detail} - details: {e}", exc_info=e)
             raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+
+def genres_with_movies(rows: Sequence[Any]) -> list[GenreExtended]:
+    """
+    Genres of (genre, movies) rows, the movies being the aggregated JSON objects, validated as one list
+    """
+    return GENRE_EXTENDED_LIST.validate_python([{"uuid": genre.uuid, "name": genre.name, "movies": movies or []} for genre, movies in rows])
+
+
+def genre_tags(genre: GenreInDB | GenreExtended) -> list[str]:
+    tags = [entity_tag("genre", genre.uuid)]
+    if isinstance(genre, GenreExtended):
+        tags += [entity_tag("movie", movie.uuid) for movie in genre.movies or []]
+    return tags
+
+
+def genre_validator_tags(validators: Validators | None, with_movies: bool) -> list[str]:
+    # lookups by name and pages change with any genre created, the movie versions folded in with any movie write
+    tags = [list_tag("genre"), *(entity_tag("genre", id) for id in (validators.ids if validators else ()))]
+    return tags + [list_tag("movie")] if with_movies else tags
+
+
+def genre_page_tags(page: Page[GenreInDB | GenreExtended]) -> list[str]:
+    return [list_tag("genre"), *(tag for genre in page.items for tag in genre_tags(genre))]
@@ -0,0 +1,193 @@
+import csv
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+
+from fastapi import Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR
+
+from app.cache.result_cache import ResultCache, entity_tag, get_result_cache, list_tag
+from app.core.config import settings
+from app.core.logging_setup import logger
+from app.db.session import get_db
+from app.rest.repository.imports import ImportCRUD, get_import_crud
+from app.rest.repository.movies import get_movie_crud
+from app.rest.schemas.imports import ImportFormat, ImportReport
+
+MAX_REPORTED_ERRORS = 20
+
+# header names accepted for each record field, the first ones match data/dummy_data.csv
+CSV_COLUMNS = {
+    "movie_title": "title",
+    "title": "title",
+    "release_year": "release_year",
+    "year": "release_year",
+    "director_name": "director",
+    "director": "director",
+    "genres": "genres",
+    "genre": "genres",
+}
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """
+    Splits a byte stream into lines without holding more than one chunk in memory
+    """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode().rstrip("\r")
+    if buffer:
+        yield buffer.decode().rstrip("\r")
+
+
+async def iter_csv_records(lines: AsyncIterable[str]) -> AsyncIterator[str]:
+    """
+    Joins back the lines of quoted fields spanning several of them, so a chunk never ends inside a record
+    """
+    record: list[str] = []
+    quotes = 0
+    async for line in lines:
+        record.append(line)
+        quotes += line.count('"')
+        # escaped quotes come in pairs, an odd count means a quoted field goes on
+        if quotes % 2 == 0:
+            yield "\n".join(record)
+            record, quotes = [], 0
+    if record:
+        yield "\n".join(record)
+
+
+class RecordParser:
+    """
+    Turns CSV records or NDJSON lines into staging rows, skipping and reporting malformed ones
+    """
+
+    def __init__(self, format: ImportFormat):
+        self.format = format
+        self.columns: list[str | None] | None = None
+        self.line_number = 0
+
+    def parse(self, lines: list[str], report: ImportReport) -> tuple[list[tuple], list[tuple]]:
+        movies: list[tuple] = []
+        genres: list[tuple] = []
+        rows = csv.reader(lines) if self.format == ImportFormat.csv else lines
+        # every line is a whole record, so the reader stays in step with them
+        for line, row in zip(lines, rows):
+            self.line_number += 1
+            first_line = self.line_number
+            self.line_number += line.count("\n")
+            if not row or (isinstance(row, str) and not row.strip()):
+                continue
+
+            try:
+                if isinstance(row, str):
+                    record = json.loads(row)
+                elif self.columns is None:
+                    self.columns = [CSV_COLUMNS.get(column.strip().lower()) for column in row]
+                    continue
+                else:
+                    record = {column: value for column, value in zip(self.columns, row) if column}
+                movie, genre_names = self._parse_record(first_line, record)
+            except (ValueError, TypeError, AttributeError) as e:
+                report.skipped += 1
+                if len(report.errors) < MAX_REPORTED_ERRORS:
+                    report.errors.append(f"line {first_line}: {e}")
+                continue
+
+            movies.append(movie)
+            genres.extend((first_line, name) for name in genre_names)
+        report.rows += len(movies)
+        return movies, genres
+
+    def _parse_record(self, row_id: int, record: dict) -> tuple[tuple, list[str]]:
+        title = (record.get("title") or "").strip()
+        if not title:
+            raise ValueError("title is required")
+
+        year = record.get("release_year")
+        release_year = int(year) if year is not None and year != "" else None
+        director = (record.get("director") or "").strip() or None
+
+        genres = record.get("genres") or []
+        genres = genres.split("|") if isinstance(genres, str) else genres
+        genre_names = list(dict.fromkeys(name.strip() for name in genres if name and name.strip()))
+        return (row_id, title, release_year, director), genre_names
+
+
+class ImportService:
+    def __init__(
+        self,
+        db: AsyncSession = Depends(get_db),
+        crud: ImportCRUD = Depends(get_import_crud),
+        cache: ResultCache = Depends(get_result_cache),
+    ):
+        self.db = db
+        self.crud = crud
+        self.cache = cache
+        self.movie_crud = get_movie_crud()
+        self.touched_tags: set[str] = set()
+
+    async def import_catalog(
+        self,
+        chunks: AsyncIterable[bytes],
+        format: ImportFormat = ImportFormat.csv,
+        chunk_size: int | None = None,
+        on_progress: Callable[[ImportReport], None] | None = None,
+    ) -> ImportReport:
+        """
+        Loads movies, directors and genres from a CSV or NDJSON stream in a single transaction. The stream is copied
+        into the staging tables `chunk_size` records at a time, then merged into the catalog at once.
+        """
+        chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        report = ImportReport()
+        parser = RecordParser(format)
+        try:
+            await self.crud.create_staging_tables(self.db)
+
+            lines: list[str] = []
+            records = iter_csv_records(iter_lines(chunks)) if format == ImportFormat.csv else iter_lines(chunks)
+            async for line in records:
+                lines.append(line)
+                if len(lines) >= chunk_size:
+                    await self._stage_chunk(*parser.parse(lines, report), report, on_progress)
+                    lines = []
+            if lines:
+                await self._stage_chunk(*parser.parse(lines, report), report, on_progress)
+
+            if report.rows:
+                await self._merge_staged_rows(report)
+            self.cache.invalidate_on_commit(self.db, list_tag("movie"), list_tag("director"), list_tag("genre"), *self.touched_tags)
+            return report
+        except Exception as e:
+            error_detail = f"An error occurred while importing the catalog after {report.rows} rows."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+    async def _stage_chunk(self, movies: list[tuple], genres: list[tuple], report: ImportReport, on_progress: Callable[[ImportReport], None] | None) -> None:
+        if movies:
+            await self.crud.stage(self.db, movies, genres)
+
+        report.chunks += 1
+        logger.info(f"Import chunk {report.chunks}: {report.rows} rows staged, {report.skipped} skipped")
+        if on_progress:
+            on_progress(report)
+
+    async def _merge_staged_rows(self, report: ImportReport) -> None:
+        await self.crud.analyze_staging_tables(self.db)
+        report.directors += await self.crud.upsert_directors(self.db)
+        report.genres += await self.crud.upsert_genres(self.db)
+
+        created_movies, director_ids = await self.crud.insert_movies(self.db)
+        created_associations, genre_ids, updated_movie_ids = await self.crud.insert_associations(self.db)
+        report.movies += created_movies
+        report.associations += created_associations
+        # movies that gained a genre get a new version, so their ETags and cached details change
+        await self.movie_crud.touch(self.db, ids=updated_movie_ids)
+        await self.movie_crud.refresh_extended(self.db, ids=await self.crud.get_imported_movie_ids(self.db))
+        self.touched_tags.update(entity_tag("director", director_id) for director_id in director_ids)
+        self.touched_tags.update(entity_tag("genre", genre_id) for genre_id in genre_ids)
+        self.touched_tags.update(entity_tag("movie", movie_id) for movie_id in updated_movie_ids)
+        logger.info(f"Import merged: {report.movies} movies, {report.directors} directors and {report.genres} genres created")
@@ -1,18 +1,25 @@
-from typing import Sequence
-from uuid import UUID
+from typing import Any, Sequence
+from uuid import UUID, uuid4
 
 from fastapi import Depends, HTTPException
-from sqlalchemy import delete, func, select
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from starlette.status import HTTP_404_NOT_FOUND, HTTP_500_INTERNAL_SERVER_ERROR
+from starlette.status import HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND, HTTP_500_INTERNAL_SERVER_ERROR
 
+from app.cache.result_cache import ResultCache, entity_tag, get_result_cache, list_tag
+from app.core.config import settings
 from app.core.logging_setup import logger
+from app.db.pagination import Cursor, InvalidCursorError, decode_cursor
+from app.db.projection import Projection
 from app.db.session import get_db
-from app.db.utils import execute, get_all
-from app.models import Director, Genre, Movie, MovieGenreAssociation
+from app.db.utils import estimated_count, execute, get_all
+from app.models import Movie, MovieGenreAssociation, MovieReadModel
+from app.rest.repository.directors import get_director_crud
 from app.rest.repository.genres import get_genre_crud
-from app.rest.repository.movies import MovieCRUD, get_movie_crud
-from app.rest.schemas.movies import MovieCreate, MovieExtended, MovieInDB, MovieOrder, MovieSort, MovieUpdate
+from app.rest.repository.movies import MovieCRUD, get_movie_crud, movie_filter_params, movie_order_key
+from app.rest.schemas.base_schema import Page, TotalMode
+from app.rest.schemas.movies import MOVIE_EXTENDED_LIST, MOVIE_LIST, MovieBatchError, MovieBatchResult, MovieCreate, MovieExtended, MovieFilter, MovieInDB, MovieOrder, MovieSort, MovieUpdate
+from app.rest.services.conditional import Validators
 
 
 class MovieService:
@@ -20,39 +27,197 @@ class MovieService:
         self,
         db: AsyncSession = Depends(get_db),
         crud: MovieCRUD = Depends(get_movie_crud),
+        cache: ResultCache = Depends(get_result_cache),
     ):
         self.db = db
         self.crud = crud
+        self.cache = cache
 
     async def get_all_movies(
-        self, skip: int = 0, limit: int = 20, order_by: MovieOrder = MovieOrder.title, sort_by: MovieSort = MovieSort.asc, extended: bool = False
-    ) -> Sequence[MovieInDB | MovieExtended]:
-        try:
-            results: Sequence = await self.crud.get_all(self.db, skip=skip, limit=limit, order_by=order_by, sort_by=sort_by, extended=extended)
-            if extended:
-                extended_movies: list[MovieExtended] = []
-                for movie, director, genres in results:
-                    movie_resp = MovieExtended.model_validate(movie)
-                    movie_resp.director = director
-                    movie_resp.genre = " | ".join([g for g in genres]) if genres else ""
-                    extended_movies.append(movie_resp)
-                return extended_movies
-            return [MovieInDB.model_validate(data) for data in results]
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        order_by: MovieOrder = MovieOrder.title,
+        sort_by: MovieSort = MovieSort.asc,
+        extended: bool = False,
+        cursor: str | None = None,
+        projection: Projection | None = None,
+        filters: MovieFilter | None = None,
+    ) -> Page[MovieInDB | MovieExtended]:
+        order = f"{order_by.value}:{sort_by.value}"
+        try:
+            after = decode_cursor(cursor, order) if cursor else None
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+        projection = with_tag_columns(projection)
+        key = self.cache.key(
+            "movies.get_all_movies",
+            skip=skip,
+            limit=limit,
+            order_by=order_by.value,
+            sort_by=sort_by.value,
+            extended=extended,
+            cursor=cursor,
+            projection=projection.cache_key() if projection else None,
+            filters=filter_cache_key(filters),
+        )
+        return await self.cache.get_or_set(
+            self.db,
+            key,
+            lambda: self._get_movies_page(skip, limit, order_by, sort_by, extended, after, projection, filters),
+            tags=lambda page: [*movie_page_tags(page), *movie_filter_tags(filters)],
+        )
+
+    async def get_movie_documents(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        order_by: MovieOrder = MovieOrder.title,
+        sort_by: MovieSort = MovieSort.asc,
+        cursor: str | None = None,
+        filters: MovieFilter | None = None,
+    ) -> Page[str]:
+        """
+        Page of extended movies as JSON documents rendered by Postgres
+        """
+        order = f"{order_by.value}:{sort_by.value}"
+        try:
+            after = decode_cursor(cursor, order) if cursor else None
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+        key = self.cache.key("movies.get_movie_documents", skip=skip, limit=limit, order_by=order_by.value, sort_by=sort_by.value, cursor=cursor, filters=filter_cache_key(filters))
+        return await self.cache.get_or_set(
+            self.db,
+            key,
+            lambda: self._get_movie_documents(skip, limit, order_by, sort_by, after, filters),
+            # the documents aren't decoded, so the page goes stale with any write to what extended movies embed
+            tags=lambda _: [list_tag("movie"), list_tag("director"), list_tag("genre")],
+        )
+
+    async def count_movies(self, mode: TotalMode = TotalMode.exact, filters: MovieFilter | None = None) -> int:
+        """
+        Movies matching the filters. Unfiltered estimated counts come from the table statistics, the others are counted and cached until a write.
+        """
+        try:
+            if mode == TotalMode.estimated and not movie_filter_params(filters):
+                estimate = await estimated_count(self.db, Movie.__tablename__)
+                if estimate is not None:
+                    return estimate
+
+            key = self.cache.key("movies.count_movies", filters=filter_cache_key(filters))
+            return await self.cache.get_or_set(self.db, key, lambda: self.crud.count(self.db, filters=filters), tags=lambda _: [list_tag("movie"), *movie_filter_tags(filters)])
+        except Exception as e:
+            error_detail = "An error occurred while counting movies."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+    async def get_movies_page_validators(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        order_by: MovieOrder = MovieOrder.title,
+        sort_by: MovieSort = MovieSort.asc,
+        cursor: str | None = None,
+        filters: MovieFilter | None = None,
+    ) -> Validators:
+        """
+        ETag of a movies page from the versions of its rows, without fetching them. The row after the page is
+        included, since it decides the next cursor.
+        """
+        try:
+            after = decode_cursor(cursor, f"{order_by.value}:{sort_by.value}") if cursor else None
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+        key = self.cache.key("movies.get_movies_page_validators", skip=skip, limit=limit, order_by=order_by.value, sort_by=sort_by.value, cursor=cursor, filters=filter_cache_key(filters))
+        return await self.cache.get_or_set(
+            self.db,
+            key,
+            lambda: self._get_movies_page_validators(skip, limit, order_by, sort_by, after, filters),
+            tags=lambda validators: [list_tag("movie"), *movie_filter_tags(filters), *(entity_tag("movie", id) for id in validators.ids)],
+        )
+
+    async def _get_movies_page_validators(self, skip: int, limit: int, order_by: MovieOrder, sort_by: MovieSort, after: Cursor | None, filters: MovieFilter | None) -> Validators:
+        try:
+            rows = await self.crud.get_page_versions(self.db, skip=skip, limit=limit + 1, order_by=order_by, sort_by=sort_by, after=after, filters=filters)
+            return Validators.from_versions(rows)
+        except Exception as e:
+            error_detail = "An error occurred while checking movies for changes."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+    async def _get_movies_page(
+        self,
+        skip: int,
+        limit: int,
+        order_by: MovieOrder,
+        sort_by: MovieSort,
+        extended: bool,
+        after: Cursor | None,
+        projection: Projection | None = None,
+        filters: MovieFilter | None = None,
+    ) -> Page[MovieInDB | MovieExtended]:
+        order = f"{order_by.value}:{sort_by.value}"
+        try:
+            results: Sequence = await self.crud.get_all(self.db, skip=skip, limit=limit + 1, order_by=order_by, sort_by=sort_by, extended=extended, after=after, projection=projection, filters=filters)
+            movies: list[MovieInDB | MovieExtended] = []
+            if projection is not None:
+                movies.extend(projected_movies(results, projection))
+            elif extended:
+                movies.extend(extended_movies(results))
+            else:
+                movies.extend(MOVIE_LIST.validate_python(results, from_attributes=True))
+            return Page.from_items(movies, limit, order, key=lambda movie: movie_order_key(movie, order_by))
         except Exception as e:
             error_detail = "An error occurred while fetching movies."
             logger.error(f"{error_detail} - details: {e}", exc_info=e)
             raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
 
-    async def get_movie_by_id(self, id: UUID, extended: bool = False) -> MovieInDB | MovieExtended:
+    async def _get_movie_documents(self, skip: int, limit: int, order_by: MovieOrder, sort_by: MovieSort, after: Cursor | None, filters: MovieFilter | None) -> Page[str]:
+        try:
+            rows = await self.crud.get_all_documents(self.db, skip=skip, limit=limit + 1, order_by=order_by, sort_by=sort_by, after=after, filters=filters)
+            return Page.from_documents(rows, limit, f"{order_by.value}:{sort_by.value}", key=lambda row: movie_order_key(row, order_by))
+        except Exception as e:
+            error_detail = "An error occurred while fetching movies."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+    async def get_movie_by_id(self, id: UUID, extended: bool = False, projection: Projection | None = None) -> MovieInDB | MovieExtended:
+        projection = with_tag_columns(projection)
+        key = self.cache.key("movies.get_movie_by_id", id=id, extended=extended, projection=projection.cache_key() if projection else None)
+        return await self.cache.get_or_set(self.db, key, lambda: self._get_movie_by_id(id, extended, projection), tags=movie_tags)
+
+    async def get_movie_validators(self, id: UUID) -> Validators | None:
+        """
+        ETag and Last-Modified date of a movie, None when it doesn't exist
+        """
+        key = self.cache.key("movies.get_movie_validators", id=id)
+        return await self.cache.get_or_set(self.db, key, lambda: self._get_movie_validators(id), tags=lambda _: [entity_tag("movie", id)])
+
+    async def _get_movie_validators(self, id: UUID) -> Validators | None:
+        try:
+            row = await self.crud.get_version(self.db, id)
+        except Exception as e:
+            error_detail = "An error occurred while checking a movie for changes."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+        if row is None:
+            return None
+        *versions, updated_at = row
+        return Validators.from_versions([versions], last_modified=updated_at)
+
+    async def _get_movie_by_id(self, id: UUID, extended: bool, projection: Projection | None = None) -> MovieInDB | MovieExtended:
         result = None
         try:
-            result = await self.crud.get_one(self.db, id=id, extended=extended)
+            result = await self.crud.get_one(self.db, id=id, extended=extended, projection=projection)
 
+            if projection is not None and isinstance(result, Sequence):
+                return projected_movies(result[:1], projection)[0]
             if extended and isinstance(result, Sequence):
-                movie = MovieExtended.model_validate(result[0][0])
-                movie.director = result[0][1]
-                movie.genre = " | ".join([g for g in result[0][2]]) if result[0][2] else ""
-                return movie
+                return extended_movies(result[:1])[0]
             return MovieInDB.model_validate(result)
         except Exception as e:
             error_detail = f"An error occurred while fetching movie. {e}" if result else f"Movie with id {id} not found."
@@ -64,18 +229,7 @@ class MovieService:
             if not movie_ids:
                 return {}
 
-            query = (
-                select(
-                    Movie.uuid,
-                    Director.name,
-                    func.array_agg(Genre.name).label("genres"),
-                )
-                .outerjoin(Director, Director.uuid == Movie.director_id)
-                .outerjoin(MovieGenreAssociation, MovieGenreAssociation.movie_id == Movie.uuid)
-                .outerjoin(Genre, Genre.uuid == MovieGenreAssociation.genre_id)
-                .where(Movie.uuid.in_(movie_ids))
-                .group_by(Movie.uuid, Director.name)
-            )
+            query = select(MovieReadModel.movie_id, MovieReadModel.director, MovieReadModel.genres).where(MovieReadModel.movie_id.in_(movie_ids))
             result = await get_all(self.db, query)
             movies_map = {movie_id: {"director": director, "genre": " | ".join([g for g in genres]) if genres else None} for movie_id, director, genres in result}
             return movies_map
@@ -85,26 +239,30 @@ class MovieService:
             raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=error_detail)
 
     async def create_movie(self, movie_data: MovieCreate) -> MovieInDB:
-        result = None
         try:
             result = await self.crud.create(self.db, movie_data=movie_data)
-            if movie_data.genre and result:
+            if movie_data.genre:
                 genres = movie_data.genre.split("|")
                 genre_crud = get_genre_crud()
                 for g in genres:
                     genre_name = g.strip()
                     genre = await genre_crud.create(self.db, genre_name)
                     self.db.add(MovieGenreAssociation(movie_id=result.uuid, genre_id=genre.uuid))
+                    self.cache.invalidate_on_commit(self.db, entity_tag("genre", genre.uuid), list_tag("genre"))
 
+            await self.crud.refresh_extended(self.db, ids=[result.uuid])
+            self.cache.invalidate_on_commit(self.db, list_tag("movie"), entity_tag("director", result.director_id))
             return MovieInDB.model_validate(result)
         except Exception as e:
-            error_detail = "An error occurred while creating a movie." if result else "Director not found"
+            error_detail = "An error occurred while creating a movie."
             logger.error(f"{error_detail} - details: {e}", exc_info=e)
             raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
 
     async def update_movie(self, movie_data: MovieUpdate) -> MovieInDB:
         try:
             result = await self.crud.update(self.db, movie_data=movie_data)
+            if result is None:
+                raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=f"Movie with id {movie_data.id} not found.")
             if movie_data.genre and isinstance(result, Movie):
                 await execute(self.db, delete(MovieGenreAssociation).where(MovieGenreAssociation.movie_id == result.uuid))
                 logger.info(f"Genre associations deleted for movie: {result.uuid}")
@@ -115,7 +273,14 @@ class MovieService:
                     genre = await genre_crud.create(self.db, genre_name)
                     new_association = MovieGenreAssociation(movie_id=result.uuid, genre_id=genre.uuid)
                     self.db.add(new_association)
+                    self.cache.invalidate_on_commit(self.db, entity_tag("genre", genre.uuid), list_tag("genre"))
+                await self.crud.touch(self.db, [result.uuid])
+            if isinstance(result, Movie):
+                await self.crud.refresh_extended(self.db, ids=[result.uuid])
+                self.cache.invalidate_on_commit(self.db, entity_tag("movie", result.uuid), list_tag("movie"), entity_tag("director", result.director_id))
             return MovieInDB.model_validate(result)
+        except HTTPException:
+            raise
         except Exception as e:
             error_detail = "An error occurred while updating a movie."
             logger.error(f"{error_detail} - details: {e}", exc_info=e)
@@ -124,8 +289,172 @@ class MovieService:
     async def remove_movie(self, id: UUID) -> MovieInDB:
         try:
             result = await self.crud.delete(self.db, id=id)
+            self.cache.invalidate_on_commit(self.db, entity_tag("movie", id), list_tag("movie"))
             return MovieInDB.model_validate(result)
         except Exception as e:
             error_detail = "An error occurred while removing a movie."
             logger.error(f"{error_detail} - details: {e}", exc_info=e)
             raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+    async def create_movies(self, movies_data: list[MovieCreate]) -> MovieBatchResult:
+        """
+        Creates every valid movie in the batch with one lookup per referenced entity type and multi-row INSERTs,
+        invalid items are reported in `errors` and don't abort the rest
+        """
+        check_batch_size(movies_data)
+        try:
+            result = MovieBatchResult()
+            directors = await self._existing_directors(movies_data)
+            genres = await self._get_or_create_genres(movies_data)
+
+            movies: list[dict] = []
+            associations: list[tuple[UUID, UUID]] = []
+            for index, movie_data in enumerate(movies_data):
+                if movie_data.director_id and movie_data.director_id not in directors:
+                    result.errors.append(MovieBatchError(index=index, detail=f"Director with id {movie_data.director_id} not found."))
+                    continue
+                movie_id = uuid4()
+                movies.append({"uuid": movie_id, "title": movie_data.title, "release_year": movie_data.release_year, "director_id": movie_data.director_id})
+                associations.extend((movie_id, genres[name].uuid) for name in split_genres(movie_data.genre))
+
+            rows = await self.crud.create_many(self.db, movies)
+            await self.crud.add_genres(self.db, associations)
+            await self.crud.refresh_extended(self.db, ids=[row.uuid for row in rows])
+            result.movies = MOVIE_LIST.validate_python(rows, from_attributes=True)
+
+            self._invalidate_batch(result.movies, genres.values())
+            return result
+        except Exception as e:
+            error_detail = "An error occurred while creating movies."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+    async def update_movies(self, movies_data: list[MovieUpdate]) -> MovieBatchResult:
+        check_batch_size(movies_data)
+        try:
+            result = MovieBatchResult()
+            directors = await self._existing_directors(movies_data)
+            genres = await self._get_or_create_genres(movies_data)
+
+            accepted: list[tuple[int, MovieUpdate]] = []
+            for index, movie_data in enumerate(movies_data):
+                if movie_data.director_id and movie_data.director_id not in directors:
+                    result.errors.append(MovieBatchError(index=index, id=movie_data.id, detail=f"Director with id {movie_data.director_id} not found."))
+                    continue
+                accepted.append((index, movie_data))
+
+            changes = [{"uuid": movie_data.id, "title": movie_data.title or None, "release_year": movie_data.release_year or None, "director_id": movie_data.director_id} for _, movie_data in accepted]
+            rows = await self.crud.update_many(self.db, changes)
+            updated = {row.uuid for row in rows}
+            result.errors += [MovieBatchError(index=index, id=movie_data.id, detail=f"Movie with id {movie_data.id} not found.") for index, movie_data in accepted if movie_data.id not in updated]
+
+            regenred = {movie_data.id: split_genres(movie_data.genre) for _, movie_data in accepted if movie_data.genre and movie_data.id in updated}
+            await self.crud.clear_genres(self.db, list(regenred))
+            await self.crud.add_genres(self.db, [(movie_id, genres[name].uuid) for movie_id, names in regenred.items() for name in names])
+            await self.crud.refresh_extended(self.db, ids=list(updated))
+            result.movies = MOVIE_LIST.validate_python(rows, from_attributes=True)
+
+            self._invalidate_batch(result.movies, genres.values())
+            return result
+        except Exception as e:
+            error_detail = "An error occurred while updating movies."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+    async def remove_movies(self, ids: list[UUID]) -> MovieBatchResult:
+        check_batch_size(ids)
+        try:
+            rows = await self.crud.delete_many(self.db, ids)
+            result = MovieBatchResult(movies=MOVIE_LIST.validate_python(rows, from_attributes=True))
+            deleted = {movie.uuid for movie in result.movies}
+            result.errors = [MovieBatchError(index=index, id=id, detail=f"Movie with id {id} not found.") for index, id in enumerate(ids) if id not in deleted]
+
+            self._invalidate_batch(result.movies)
+            return result
+        except Exception as e:
+            error_detail = "An error occurred while removing movies."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+    async def _existing_directors(self, movies_data: Sequence[MovieCreate | MovieUpdate]) -> set[UUID]:
+        director_ids = list({movie_data.director_id for movie_data in movies_data if movie_data.director_id})
+        return {director.uuid for director in await get_director_crud().get_many(self.db, director_ids)}
+
+    async def _get_or_create_genres(self, movies_data: Sequence[MovieCreate | MovieUpdate]) -> dict:
+        names = list(dict.fromkeys(name for movie_data in movies_data for name in split_genres(movie_data.genre)))
+        return {genre.name: genre for genre in await get_genre_crud().create_many(self.db, names)}
+
+    def _invalidate_batch(self, movies: list[MovieInDB], genres: Any = ()) -> None:
+        self.cache.invalidate_on_commit(
+            self.db,
+            list_tag("movie"),
+            *(entity_tag("movie", movie.uuid) for movie in movies),
+            *(entity_tag("director", movie.director_id) for movie in movies if movie.director_id),
+            *(tag for genre in genres for tag in (entity_tag("genre", genre.uuid), list_tag("genre"))),
+        )
+
+
+def check_batch_size(items: Sequence) -> None:
+    if len(items) > settings.BATCH_MAX_SIZE:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=f"Batches are limited to {settings.BATCH_MAX_SIZE} items.")
+
+
+def split_genres(genre: str | None) -> list[str]:
+    return list(dict.fromkeys(name.strip() for name in (genre or "").split("|") if name.strip()))
+
+
+def filter_cache_key(filters: MovieFilter | None) -> dict | None:
+    return filters.model_dump(mode="json", exclude_defaults=True) if filters else None
+
+
+def movie_filter_tags(filters: MovieFilter | None) -> list[str]:
+    # a renamed genre changes which movies its name filters in
+    return [list_tag("genre")] if filters and filters.genres else []
+
+
+def with_tag_columns(projection: Projection | None) -> Projection | None:
+    # movies embedding a director name are tagged with the director's id
+    if projection is not None and "director" in projection.relations:
+        return projection.with_columns("director_id")
+    return projection
+
+
+def projected_movies(rows: Sequence[Any], projection: Projection) -> Sequence[MovieInDB | MovieExtended]:
+    # only the projected relations end up in `model_fields_set`, which tells resolvers what was preloaded
+    if projection.relations:
+        return MOVIE_EXTENDED_LIST.validate_python(rows, from_attributes=True)
+    return MOVIE_LIST.validate_python(rows, from_attributes=True)
+
+
+def extended_movies(rows: Sequence[Any]) -> list[MovieExtended]:
+    """
+    Movies of (movie, director name, genre names) rows, validated as one list
+    """
+    return MOVIE_EXTENDED_LIST.validate_python(
+        [
+            {
+                "uuid": movie.uuid,
+                "title": movie.title,
+                "release_year": movie.release_year,
+                "director_id": movie.director_id,
+                "director": director,
+                "genre": " | ".join(genres) if genres else "",
+            }
+            for movie, director, genres in rows
+        ]
+    )
+
+
+def movie_tags(movie: MovieInDB | MovieExtended) -> list[str]:
+    tags = [entity_tag("movie", movie.uuid)]
+    if isinstance(movie, MovieExtended):
+        # extended movies embed the director and genre names
+        if "director" in movie.model_fields_set:
+            tags.append(entity_tag("director", movie.director_id))
+        if "genre" in movie.model_fields_set:
+            tags.append(list_tag("genre"))
+    return tags
+
+
+def movie_page_tags(page: Page[MovieInDB | MovieExtended]) -> list[str]:
+    return [list_tag("movie"), *(tag for movie in page.items for tag in movie_tags(movie))]
@@ -0,0 +1,53 @@
+from typing import Sequence
+
+from fastapi import Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.status import HTTP_400_BAD_REQUEST, HTTP_500_INTERNAL_SERVER_ERROR
+
+from app.cache.result_cache import ResultCache, entity_tag, get_result_cache, list_tag
+from app.core.logging_setup import logger
+from app.db.pagination import Cursor, InvalidCursorError, decode_cursor
+from app.db.session import get_db
+from app.rest.repository.search import SearchCRUD, get_search_crud
+from app.rest.schemas.base_schema import Page
+from app.rest.schemas.search import SearchResult, SearchType
+
+
+class SearchService:
+    def __init__(
+        self,
+        db: AsyncSession = Depends(get_db),
+        crud: SearchCRUD = Depends(get_search_crud),
+        cache: ResultCache = Depends(get_result_cache),
+    ):
+        self.db = db
+        self.crud = crud
+        self.cache = cache
+
+    async def search(self, term: str, types: Sequence[SearchType] = tuple(SearchType), limit: int = 20, cursor: str | None = None) -> Page[SearchResult]:
+        order = "rank:desc"
+        term = term.strip()
+        if not term:
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail="Search term required")
+        try:
+            after = decode_cursor(cursor, order) if cursor else None
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+        types = list(types) or list(SearchType)
+        key = self.cache.key("search.search", term=term, types=sorted(type.value for type in types), limit=limit, cursor=cursor)
+        return await self.cache.get_or_set(self.db, key, lambda: self._search(term, types, limit, after), tags=lambda page: search_page_tags(page, types))
+
+    async def _search(self, term: str, types: list[SearchType], limit: int, after: Cursor | None) -> Page[SearchResult]:
+        try:
+            results = await self.crud.search(self.db, term, types, limit=limit + 1, after=after)
+            return Page.from_items([SearchResult.model_validate(result) for result in results], limit, "rank:desc", key=lambda result: result.rank)
+        except Exception as e:
+            error_detail = "An error occurred while searching."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+
+def search_page_tags(page: Page[SearchResult], types: list[SearchType]) -> list[str]:
+    # any new or renamed entity of a searched type can change the results
+    return [*(list_tag(type.value) for type in types), *(entity_tag(result.type.value, result.uuid) for result in page.items)]
@@ -0,0 +1,83 @@
+import asyncio
+from uuid import UUID
+
+from fastapi import Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR
+
+from app.core.logging_setup import logger
+from app.db.routing import use_primary
+from app.db.session import AsyncSessionLocal, get_db
+from app.rest.repository.stats import StatsCRUD, get_stats_crud
+from app.rest.schemas.stats import DecadeCount, DirectorCount, GenreCount, StatsKind, StatsRefreshReport
+
+
+class StatsService:
+    def __init__(
+        self,
+        db: AsyncSession = Depends(get_db),
+        crud: StatsCRUD = Depends(get_stats_crud),
+    ):
+        self.db = db
+        self.crud = crud
+
+    async def get_genre_counts(self) -> list[GenreCount]:
+        try:
+            rows = await self.crud.get_counts(self.db, StatsKind.genre)
+            # only decade rows go without a name
+            return [GenreCount(uuid=UUID(row.key), name=row.name or "", movie_count=row.movie_count) for row in rows]
+        except Exception as e:
+            error_detail = "An error occurred while fetching genre stats."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+    async def get_top_directors(self, limit: int = 10) -> list[DirectorCount]:
+        try:
+            rows = await self.crud.get_counts(self.db, StatsKind.director, limit=limit)
+            return [DirectorCount(uuid=UUID(row.key), name=row.name or "", movie_count=row.movie_count) for row in rows]
+        except Exception as e:
+            error_detail = "An error occurred while fetching director stats."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+    async def get_decade_counts(self) -> list[DecadeCount]:
+        try:
+            rows = await self.crud.get_counts(self.db, StatsKind.decade)
+            return [DecadeCount(decade=int(row.key) if row.key else None, movie_count=row.movie_count) for row in rows]
+        except Exception as e:
+            error_detail = "An error occurred while fetching decade stats."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+    async def refresh(self, max_age: int | None = None) -> StatsRefreshReport:
+        """
+        Recounts the catalog, unless another worker is doing it or the counts are younger than `max_age` seconds
+        """
+        try:
+            refreshed_at = await self.crud.refresh(self.db, max_age=max_age)
+            return StatsRefreshReport(refreshed=refreshed_at is not None, refreshed_at=refreshed_at)
+        except Exception as e:
+            error_detail = "An error occurred while refreshing stats."
+            logger.error(f"{error_detail} - details: {e}", exc_info=e)
+            raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail)
+
+
+async def refresh_stats_periodically(interval: int) -> None:
+    """
+    Refreshes the counts every `interval` seconds for the lifetime of the app. Every worker runs the loop,
+    the advisory lock and the age check make sure the catalog is recounted about once per interval overall.
+    """
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                use_primary(db)
+                report = await StatsService(db=db, crud=get_stats_crud()).refresh(max_age=interval // 2)
+                await db.commit()
+            if report.refreshed:
+                logger.info(f"Stats refreshed at {report.refreshed_at}")
+        except HTTPException:
+            # already logged by the service, the next turn tries again
+            pass
+        except Exception as e:
+            logger.error(f"An error occurred while refreshing stats. - details: {e}", exc_info=e)
+        await asyncio.sleep(interval)
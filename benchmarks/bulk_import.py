@@ -0,0 +1,103 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from collections.abc import AsyncIterator
+from uuid import UUID, uuid4
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.cache.result_cache import result_cache
+from app.db.session import AsyncSessionLocal
+from app.rest.repository.imports import get_import_crud
+from app.rest.repository.movies import MovieCRUD
+from app.rest.schemas.imports import ImportFormat
+from app.rest.services.imports import ImportService
+from sqlalchemy.ext.asyncio import AsyncSession
+
+GENRES = ["Action", "Comedy", "Drama", "Horror", "Romance", "Sci-Fi", "Thriller", "Western"]
+# directors per movie and genres per movie, close to the ratios of data/dummy_data.csv
+MOVIES_PER_DIRECTOR = 20
+MAX_GENRES_PER_MOVIE = 3
+READ_SIZE = 1024 * 1024
+
+
+def catalog_rows(movies: int, seed: int) -> list[tuple[str, int, str, list[str]]]:
+    rng = random.Random(seed)
+    directors = [f"Director {number}" for number in range(max(movies // MOVIES_PER_DIRECTOR, 1))]
+    return [(f"Movie {number}", rng.randint(1920, 2025), rng.choice(directors), rng.sample(GENRES, rng.randint(1, MAX_GENRES_PER_MOVIE))) for number in range(movies)]
+
+
+def catalog_csv(rows: list[tuple[str, int, str, list[str]]]) -> bytes:
+    lines = ["movie_title,release_year,director_name,genres"] + [f"{title},{year},{director},{'|'.join(genres)}" for title, year, director, genres in rows]
+    return "\n".join(lines).encode()
+
+
+async def read_body(body: bytes) -> AsyncIterator[bytes]:
+    for start in range(0, len(body), READ_SIZE):
+        yield body[start : start + READ_SIZE]
+
+
+async def import_catalog(db: AsyncSession, rows: list[tuple[str, int, str, list[str]]]) -> None:
+    """
+    The import endpoint: COPY into staging tables, then set-based statements
+    """
+    service = ImportService(db=db, crud=get_import_crud(), cache=result_cache)
+    await service.import_catalog(read_body(catalog_csv(rows)), ImportFormat.csv)
+
+
+async def insert_catalog(db: AsyncSession, rows: list[tuple[str, int, str, list[str]]]) -> None:
+    """
+    The same rows with one prepared INSERT per row, pipelined by executemany, and the same read model refresh
+    """
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+
+    director_ids = {director: uuid4() for _, _, director, _ in rows}
+    await driver_connection.executemany("INSERT INTO director (uuid, name) VALUES ($1, $2)", [(uuid, name) for name, uuid in director_ids.items()])  # type: ignore[union-attr]
+    await driver_connection.executemany("INSERT INTO genre (uuid, name) VALUES ($1, $2) ON CONFLICT (name) DO NOTHING", [(uuid4(), name) for name in GENRES])  # type: ignore[union-attr]
+    genre_ids: dict[str, UUID] = dict(await driver_connection.fetch("SELECT name, uuid FROM genre WHERE name = any($1)", GENRES))  # type: ignore[union-attr]
+
+    movies = [(uuid4(), title, year, director_ids[director], genres) for title, year, director, genres in rows]
+    await driver_connection.executemany("INSERT INTO movie (uuid, title, release_year, director_id) VALUES ($1, $2, $3, $4)", [movie[:4] for movie in movies])  # type: ignore[union-attr]
+    associations = [(movie_id, genre_ids[genre]) for movie_id, _, _, _, genres in movies for genre in genres]
+    await driver_connection.executemany("INSERT INTO moviegenreassociation (movie_id, genre_id) VALUES ($1, $2)", associations)  # type: ignore[union-attr]
+    await MovieCRUD().refresh_extended(db, ids=[movie[0] for movie in movies])
+
+
+async def run(movies: int, repeat: int, seed: int):
+    rows = catalog_rows(movies, seed)
+    loaders = (("COPY import", import_catalog), ("INSERT per row", insert_catalog))
+    timings: dict[str, list[float]] = {name: [] for name, _ in loaders}
+
+    print(f"\nLoading {movies} movies, every run rolled back...")
+    for run_number in range(repeat):
+        for name, loader in loaders:
+            async with AsyncSessionLocal() as db:
+                started = time.perf_counter()
+                await loader(db, rows)
+                timings[name].append(time.perf_counter() - started)
+                await db.rollback()
+            print(f"run {run_number + 1} {name:16} {timings[name][-1]:>7.1f}s")
+
+    print(f"\n{'loader':16} {'best':>8} {'median':>8}")
+    for name, values in timings.items():
+        values.sort()
+        print(f"{name:16} {values[0]:>7.1f}s {values[len(values) // 2]:>7.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wall time of loading a catalog through the COPY import against plain INSERTs")
+    parser.add_argument("--movies", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3, help="runs of each loader, alternating")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.movies, args.repeat, args.seed))
+
+
+if __name__ == "__main__":
+    main()
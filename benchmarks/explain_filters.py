@@ -0,0 +1,97 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.db.routing import use_primary
+from app.db.session import AsyncSessionLocal, engine
+from app.models import Genre, Movie
+from app.rest.repository.movies import movie_filter_params, movie_page_query
+from app.rest.schemas.movies import GenreMatch, MovieFilter, MovieOrder, MovieSort
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@dataclass
+class Case:
+    name: str
+    filters: MovieFilter
+    # any of these indexes serves the filter
+    indexes: tuple[str, ...]
+    order_by: MovieOrder = MovieOrder.title
+
+
+def plan_indexes(plan: dict) -> Iterator[str]:
+    """
+    Indexes the plan searches with a condition, an index only read for its order doesn't serve a filter
+    """
+    if "Index Name" in plan and "Index Cond" in plan:
+        yield plan["Index Name"]
+    for child in plan.get("Plans", []):
+        yield from plan_indexes(child)
+
+
+async def explain(db: AsyncSession, case: Case, limit: int) -> tuple[set[str], dict]:
+    """
+    Plans the page statement of the case with sequential scans disabled, so the plan shows whether an index can serve
+    the predicate at all, whatever the size of the local catalog
+    """
+    params = movie_filter_params(case.filters)
+    query = movie_page_query(case.order_by, MovieSort.asc, False, False, None, frozenset(params))
+    compiled = query.compile(dialect=engine.dialect)
+    values = compiled.construct_params({"limit": limit, "skip": 0, **params})
+
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+    await db.execute(text("SET LOCAL enable_seqscan = off"))
+    result = await driver_connection.fetchval(f"EXPLAIN (FORMAT JSON) {compiled.string}", *(values[name] for name in compiled.positiontup or []))  # type: ignore[union-attr]
+    # the engine registers a json codec on its connections, plans arrive decoded
+    plan = (json.loads(result) if isinstance(result, str) else result)[0]["Plan"]
+    return set(plan_indexes(plan)), plan
+
+
+async def run(args: argparse.Namespace) -> int:
+    async with AsyncSessionLocal() as db:
+        # read-only sessions may run in autocommit, SET LOCAL needs a transaction
+        use_primary(db)
+        director_ids = (await db.execute(select(Movie.director_id).where(Movie.director_id.is_not(None)).group_by(Movie.director_id).order_by(func.count().desc()).limit(2))).scalars().all()
+        genres = (await db.execute(select(Genre.name).order_by(Genre.name).limit(2))).scalars().all()
+        title = await db.scalar(select(Movie.title).limit(1)) or "A"
+
+        cases = [
+            Case("year range", MovieFilter(year_from=1990, year_to=2000), ("ix_movie_release_year_key_uuid",), MovieOrder.year),
+            Case("director_id IN", MovieFilter(director_ids=list(director_ids)), ("ix_movie_director_id_release_year",)),
+            Case("director_id IN + year range", MovieFilter(director_ids=list(director_ids), year_from=1990, year_to=2000), ("ix_movie_director_id_release_year",)),
+            Case("genres ANY", MovieFilter(genres=list(genres)), ("ix_moviegenreassociation_genre_id_movie_id",)),
+            Case("genres ALL", MovieFilter(genres=list(genres), genre_match=GenreMatch.all), ("ix_moviegenreassociation_genre_id_movie_id",)),
+            # with the C collation the (title, uuid) keyset index serves prefixes as well
+            Case("title prefix", MovieFilter(title_prefix=title[:3]), ("ix_movie_title_pattern", "ix_movie_title_trgm", "ix_movie_title_uuid")),
+        ]
+
+        failures = 0
+        for case in cases:
+            indexes, plan = await explain(db, case, args.limit)
+            used = indexes.intersection(case.indexes)
+            failures += not used
+            print(f"{'ok' if used else 'MISSING':8} {case.name:30} {', '.join(sorted(indexes)) or '-'}")
+            if args.verbose or not used:
+                print(json.dumps(plan, indent=2))
+        await db.rollback()
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that every movie filter is served by its index")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--verbose", action="store_true", help="print every plan, not only the failing ones")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+from datetime import UTC, datetime, timezone
+
+import httpx
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.workloads import WORKLOADS, Catalog, Request, Workload
+
+APIS = ("rest", "graphql")
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+# the database entry of the Server-Timing header added by QueryStatsMiddleware
+SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    # settings are read on import, so this has to run before the app is imported
+    if not args.cache:
+        os.environ["CACHE_BACKEND"] = "none"
+        os.environ["LOADER_CACHE_TTL"] = "0"
+        os.environ["SINGLE_FLIGHT"] = "False"
+
+
+def percentile(sorted_values: list[float], percent: float) -> float:
+    return sorted_values[max(math.ceil(percent / 100 * len(sorted_values)) - 1, 0)]
+
+
+def wire_size(message: httpx.Request | httpx.Response, body_size: int) -> int:
+    # start line and headers as sent over HTTP/1.1, plus the body
+    return 16 + sum(len(name) + len(value) + 4 for name, value in message.headers.raw) + 2 + body_size
+
+
+async def load_catalog(sample_size: int) -> Catalog:
+    from app.db.session import AsyncSessionLocal
+    from app.models import Director, Genre, Movie
+    from sqlalchemy import func, select
+
+    async with AsyncSessionLocal() as db:
+        director_ids = (await db.execute(select(Director.uuid).order_by(func.random()).limit(sample_size))).scalars().all()
+        genre_ids = (await db.execute(select(Genre.uuid))).scalars().all()
+        movies = await db.scalar(select(func.count()).select_from(Movie))
+    if not director_ids or not genre_ids:
+        raise SystemExit("The catalog is empty, seed it first with --seed-movies or `make bench-seed`")
+    return Catalog(director_ids=list(director_ids), genre_ids=list(genre_ids), movies=movies or 0)
+
+
+async def send(client: httpx.AsyncClient, request: Request) -> httpx.Response:
+    return await client.request(request.method, request.url, params=request.params, json=request.json)
+
+
+def failed(response: httpx.Response, api: str) -> bool:
+    if response.status_code >= 400:
+        return True
+    return api == "graphql" and bool(response.json().get("errors"))
+
+
+async def measure(client: httpx.AsyncClient, workload: Workload, api: str, catalog: Catalog, args: argparse.Namespace) -> dict:
+    build = workload.rest if api == "rest" else workload.graphql
+    for _ in range(args.warmup):
+        await send(client, build(catalog, args.limit))
+
+    latencies: list[float] = []
+    request_bytes = 0
+    response_bytes = 0
+    errors = 0
+    statements: int | None = None
+    db_time = 0.0
+    pending = iter(range(args.requests))
+
+    async def worker():
+        nonlocal request_bytes, response_bytes, errors, statements, db_time
+        for _ in pending:
+            request = build(catalog, args.limit)
+            started = time.perf_counter()
+            response = await send(client, request)
+            latencies.append(time.perf_counter() - started)
+
+            request_bytes += wire_size(response.request, len(response.request.content))
+            response_bytes += wire_size(response, response.num_bytes_downloaded)
+            errors += failed(response, api)
+
+            if timing := SERVER_TIMING_DB.search(response.headers.get("server-timing", "")):
+                db_time += float(timing.group(1)) / 1000
+                statements = (statements or 0) + int(timing.group(2))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "workload": workload.name,
+        "api": api,
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "sql_statements_per_request": round(statements / len(latencies), 2) if statements is not None else None,
+        "db_ms": round(db_time / len(latencies) * 1000, 3) if statements is not None else None,
+        "request_bytes": request_bytes // len(latencies),
+        "response_bytes": response_bytes // len(latencies),
+    }
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/rest/status/status")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise SystemExit("uvicorn did not start in time")
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict:
+    from app.core.config import settings
+
+    if args.seed_movies:
+        from benchmarks.seed_catalog import seed_catalog
+
+        await seed_catalog(args.seed_movies, reset=True, chunk_size=50_000, seed=42)
+
+    catalog = await load_catalog(args.sample_size)
+    headers = {"Authorization": f"Bearer {settings.API_SECRET_KEY}"}
+    server = None
+
+    if args.target == "asgi":
+        from app.main import app
+
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark", headers=headers, timeout=None)
+    else:
+        base_url = args.url
+        if base_url is None:
+            base_url = f"http://127.0.0.1:{args.port}"
+            command = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(args.port), "--workers", str(args.workers), "--log-level", "warning"]
+            server = subprocess.Popen(command, env=os.environ.copy())
+        client = httpx.AsyncClient(base_url=base_url, headers=headers, timeout=None, limits=httpx.Limits(max_connections=args.concurrency))
+
+    results = []
+    try:
+        async with client:
+            if args.target == "uvicorn":
+                await wait_until_ready(client)
+            for workload in WORKLOADS:
+                if args.workloads and workload.name not in args.workloads:
+                    continue
+                for api in args.apis:
+                    result = await measure(client, workload, api, catalog, args)
+                    results.append(result)
+                    print(
+                        f"{result['workload']:<22}{result['api']:<9}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+                        f"{result['throughput_rps']:>10.1f}{result['sql_statements_per_request'] or '-':>8}{result['db_ms'] or '-':>10}{result['response_bytes']:>12}{result['errors']:>8}"
+                    )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    return {
+        "meta": {
+            "started_at": datetime.now(UTC).isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "target": args.target,
+            "url": args.url,
+            "cache": args.cache,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "limit": args.limit,
+            "catalog": {"movies": catalog.movies, "genres": len(catalog.genre_ids)},
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the same read workloads against the REST and GraphQL APIs")
+    parser.add_argument("--target", choices=["asgi", "uvicorn"], default="asgi", help="in-process ASGI transport or a uvicorn server")
+    parser.add_argument("--url", help="benchmark an already running server instead of starting uvicorn")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per workload and API")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=100, help="page size of the listing workloads")
+    parser.add_argument("--sample-size", type=int, default=200, help="directors picked at random for the detail workloads")
+    parser.add_argument("--workloads", nargs="*", choices=[workload.name for workload in WORKLOADS])
+    parser.add_argument("--apis", nargs="*", choices=APIS, default=list(APIS))
+    parser.add_argument("--seed-movies", type=int, help="replace the catalog with a synthetic one of this many movies first")
+    parser.add_argument("--cache", action="store_true", help="keep the result and DataLoader caches enabled")
+    parser.add_argument("--output", help="JSON report path, defaults to benchmarks/results/<timestamp>.json")
+    args = parser.parse_args()
+    if args.url:
+        args.target = "uvicorn"
+
+    configure_environment(args)
+    # request logging would be measured too
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    print(f"{'workload':<22}{'api':<9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'sql':>8}{'db ms':>10}{'bytes':>12}{'errors':>8}")
+    report = asyncio.run(run(args))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as report_file:
+        json.dump(report, report_file, indent=2)
+    print(f"\nReport written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from uuid import UUID
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.db.session import AsyncSessionLocal
+from app.models.association_tables import MovieGenreAssociation
+from app.models.director import Director
+from app.models.genre import Genre
+from app.models.movie import Movie
+from app.models.movie_read_model import MovieReadModel
+from app.rest.repository.movies import MovieCRUD
+from app.rest.repository.stats import StatsCRUD
+
+GENRES = [
+    "Action", "Adventure", "Animation", "Biography", "Comedy", "Crime", "Documentary", "Drama", "Family", "Fantasy",
+    "History", "Horror", "Music", "Musical", "Mystery", "Romance", "Sci-Fi", "Sport", "Thriller", "War", "Western",
+]  # fmt: skip
+FIRST_NAMES = ["Ava", "Ben", "Chloe", "David", "Elif", "Farid", "Grace", "Hiro", "Ines", "Jonas", "Kemal", "Lena", "Mina", "Noah", "Olga", "Pablo"]
+LAST_NAMES = ["Anders", "Baker", "Costa", "Demir", "Evans", "Fischer", "Garcia", "Hansen", "Ivanov", "Kaya", "Lopez", "Moreau", "Novak", "Ortiz", "Park", "Rossi"]
+TITLE_WORDS = ["Silent", "Broken", "Golden", "Last", "Hidden", "Distant", "Crimson", "Endless", "Northern", "Paper", "Midnight", "Glass", "Iron", "Wild", "Lost", "Electric"]
+TITLE_NOUNS = ["River", "Empire", "Garden", "Signal", "Harbor", "Machine", "Orchard", "Frontier", "Mirror", "Voyage", "Kingdom", "Letter", "Storm", "Circus", "Island", "Echo"]
+
+# directors per movie and genres per movie of the synthetic catalog, close to the ratios of data/dummy_data.csv
+MOVIES_PER_DIRECTOR = 20
+MAX_GENRES_PER_MOVIE = 3
+
+
+def random_uuid(rng: random.Random) -> UUID:
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+async def copy_rows(db, model, columns: list[str], rows: list[tuple]) -> None:
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(model.__tablename__, records=rows, columns=columns)  # type: ignore[union-attr]
+
+
+async def seed_catalog(movies: int, reset: bool, chunk_size: int, seed: int):
+    rng = random.Random(seed)
+    started = time.perf_counter()
+
+    async with AsyncSessionLocal() as db:
+        if reset:
+            print("\nTruncating the catalog...")
+            tables = ", ".join(model.__tablename__ for model in (MovieReadModel, MovieGenreAssociation, Movie, Director, Genre))
+            await db.execute(text(f"TRUNCATE {tables}"))
+
+        print("\nCreating genres...")
+        await db.execute(pg_insert(Genre).values([{"uuid": random_uuid(rng), "name": name} for name in GENRES]).on_conflict_do_nothing(index_elements=["name"]))
+        genre_ids = (await db.execute(select(Genre.uuid).where(Genre.name.in_(GENRES)))).scalars().all()
+
+        print("\nCreating directors...")
+        director_ids = [random_uuid(rng) for _ in range(max(movies // MOVIES_PER_DIRECTOR, 1))]
+        for start in range(0, len(director_ids), chunk_size):
+            rows = [(director_id, f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}") for director_id in director_ids[start : start + chunk_size]]
+            await copy_rows(db, Director, ["uuid", "name"], rows)
+
+        print("\nCreating movies and movie-genre associations...")
+        for start in range(0, movies, chunk_size):
+            movie_rows: list[tuple] = []
+            association_rows: list[tuple] = []
+            for number in range(start, min(start + chunk_size, movies)):
+                movie_id = random_uuid(rng)
+                title = f"{rng.choice(TITLE_WORDS)} {rng.choice(TITLE_NOUNS)} {number}"
+                # a few movies without a year or director, like the real data
+                release_year = rng.randint(1920, 2025) if rng.random() > 0.02 else None
+                director_id = rng.choice(director_ids) if rng.random() > 0.01 else None
+                movie_rows.append((movie_id, title, release_year, director_id))
+                association_rows.extend((movie_id, genre_id) for genre_id in rng.sample(genre_ids, rng.randint(1, MAX_GENRES_PER_MOVIE)))
+
+            await copy_rows(db, Movie, ["uuid", "title", "release_year", "director_id"], movie_rows)
+            await copy_rows(db, MovieGenreAssociation, ["movie_id", "genre_id"], association_rows)
+            print(f"{start + len(movie_rows)} / {movies} movies ({time.perf_counter() - started:.1f}s)")
+
+        print("\nFilling the movie read model and counting stats...")
+        await MovieCRUD().refresh_extended(db)
+        await StatsCRUD().refresh(db)
+        await db.commit()
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("ANALYZE"))
+
+    print(f"\nSeeded {movies} movies, {len(director_ids)} directors and {len(genre_ids)} genres in {time.perf_counter() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a synthetic movie catalog for benchmarks")
+    parser.add_argument("--movies", type=int, default=10_000)
+    parser.add_argument("--reset", action="store_true", help="truncate the catalog first")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42, help="random seed, the same seed produces the same catalog")
+    args = parser.parse_args()
+
+    asyncio.run(seed_catalog(args.movies, args.reset, args.chunk_size, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections.abc import Awaitable, Callable
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.config import settings
+from app.rest.repository.movies import MovieCRUD, movie_page_query
+from app.rest.schemas.movies import MovieOrder, MovieSort
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+SHAPES = [(order_by, sort_by, extended, keyset) for order_by in MovieOrder for sort_by in MovieSort for extended in (False, True) for keyset in (False, True)]
+
+
+def measure(function: Callable[[], object], iterations: int) -> float:
+    """
+    Process CPU time per call in microseconds
+    """
+    started = time.process_time()
+    for _ in range(iterations):
+        function()
+    return (time.process_time() - started) / iterations * 1e6
+
+
+async def measure_async(function: Callable[[], Awaitable[object]], iterations: int) -> tuple[float, float]:
+    """
+    Process CPU time and wall time per call in microseconds
+    """
+    started, started_cpu = time.perf_counter(), time.process_time()
+    for _ in range(iterations):
+        await function()
+    return (time.process_time() - started_cpu) / iterations * 1e6, (time.perf_counter() - started) / iterations * 1e6
+
+
+def build_statements(iterations: int) -> None:
+    """
+    Python side cost of a statement: building it and generating the cache key SQLAlchemy looks compiled SQL up with
+    """
+    print(f"{'statement shape':44} {'rebuilt':>10} {'cached':>10}")
+    for shape in SHAPES:
+        rebuilt = measure(lambda: movie_page_query.__wrapped__(*shape)._generate_cache_key(), iterations)
+        cached = measure(lambda: movie_page_query(*shape)._generate_cache_key(), iterations)
+        name = f"{shape[0].value} {shape[1].value} extended={shape[2]} keyset={shape[3]}"
+        print(f"{name:44} {rebuilt:>8.1f}us {cached:>8.1f}us")
+
+
+async def query_database(iterations: int, limit: int) -> None:
+    """
+    The extended movies page end to end, with the statement rebuilt and prepared on every call against the cached path
+    """
+    crud = MovieCRUD()
+    runs = (("rebuilt, prepared every call", 0, True), ("cached, prepared every call", 0, False), ("cached, prepared once", settings.PREPARED_STATEMENT_CACHE_SIZE, False))
+    print(f"\n{'get_all(extended=True)':44} {'cpu':>10} {'wall':>10}")
+    for name, prepared_statement_cache_size, rebuild in runs:
+        engine = create_async_engine(settings.DATABASE_URL or "", connect_args={"prepared_statement_cache_size": prepared_statement_cache_size})
+        async with AsyncSession(bind=engine) as db:
+
+            async def page() -> None:
+                if rebuild:
+                    movie_page_query.cache_clear()
+                await crud.get_all(db, limit=limit, extended=True)
+
+            await measure_async(page, 20)
+            cpu, wall = await measure_async(page, iterations)
+        await engine.dispose()
+        print(f"{name:44} {cpu:>8.1f}us {wall:>8.1f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU saved per request by the statement and prepared statement caches")
+    parser.add_argument("--iterations", type=int, default=2000, help="calls per statement shape")
+    parser.add_argument("--queries", type=int, default=500, help="database round trips per run, 0 skips the database")
+    parser.add_argument("--limit", type=int, default=20, help="page size of the database runs")
+    args = parser.parse_args()
+
+    build_statements(args.iterations)
+    if args.queries:
+        asyncio.run(query_database(args.queries, args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import random
+from dataclasses import dataclass, field
+from typing import Any, Callable
+from uuid import UUID
+
+
+@dataclass
+class Catalog:
+    """
+    Ids the workloads pick from, sampled from the benchmark database once per run
+    """
+
+    director_ids: list[UUID]
+    genre_ids: list[UUID]
+    movies: int = 0
+    rng: random.Random = field(default_factory=lambda: random.Random(42))
+
+    def director_id(self) -> str:
+        return str(self.rng.choice(self.director_ids))
+
+    def genre_id(self) -> str:
+        return str(self.rng.choice(self.genre_ids))
+
+
+@dataclass
+class Request:
+    method: str
+    url: str
+    params: dict[str, Any] | None = None
+    json: dict[str, Any] | None = None
+
+
+@dataclass
+class Workload:
+    """
+    The same read expressed once as REST calls and once as a GraphQL operation, both return the same fields
+    """
+
+    name: str
+    rest: Callable[[Catalog, int], Request]
+    graphql: Callable[[Catalog, int], Request]
+
+
+def graphql(query: str, **variables: Any) -> Request:
+    return Request("POST", "/graphql", json={"query": query, "variables": variables})
+
+
+MOVIES_EXTENDED = """
+query MoviesExtended($limit: Int!) {
+  movies(limit: $limit) { uuid title releaseYear directorId director genre }
+}
+"""
+
+DIRECTOR_WITH_MOVIES = """
+query DirectorWithMovies($id: ID!) {
+  director(id: $id) { uuid name movies { uuid title releaseYear } }
+}
+"""
+
+GENRE_WITH_MOVIES = """
+query GenreWithMovies($id: ID!) {
+  genre(id: $id) { uuid name movies { uuid title releaseYear directorId } }
+}
+"""
+
+WORKLOADS = [
+    Workload(
+        name="movies_extended",
+        rest=lambda catalog, limit: Request("GET", "/rest/movies/", params={"extended": "true", "limit": limit}),
+        graphql=lambda catalog, limit: graphql(MOVIES_EXTENDED, limit=limit),
+    ),
+    Workload(
+        name="director_with_movies",
+        rest=lambda catalog, limit: Request("GET", "/rest/directors/director", params={"id": catalog.director_id(), "with_movies": "true"}),
+        graphql=lambda catalog, limit: graphql(DIRECTOR_WITH_MOVIES, id=catalog.director_id()),
+    ),
+    Workload(
+        name="genre_with_movies",
+        rest=lambda catalog, limit: Request("GET", "/rest/genres/genre", params={"id": catalog.genre_id(), "with_movies": "true"}),
+        graphql=lambda catalog, limit: graphql(GENRE_WITH_MOVIES, id=catalog.genre_id()),
+    ),
+]
@@ -13,6 +13,8 @@ from app.models.association_tables import MovieGenreAssociation
 from app.models.director import Director
 from app.models.genre import Genre
 from app.models.movie import Movie
+from app.rest.repository.movies import MovieCRUD
+from app.rest.repository.stats import StatsCRUD
 
 CSV_FILE_PATH = "data/dummy_data.csv"
 
@@ -100,6 +102,18 @@ async def seed_dummy_data():
         except Exception as e:
             print(f"Error for creating movies: {e}")
 
+        print("\nFilling the movie read model...")
+        try:
+            await MovieCRUD().refresh_extended(db)
+        except Exception as e:
+            print(f"Error for filling the movie read model: {e}")
+
+        print("\nCounting stats...")
+        try:
+            await StatsCRUD().refresh(db)
+        except Exception as e:
+            print(f"Error for counting stats: {e}")
+
         print(f"Total processed movies: {processed}")
         await db.commit()
 
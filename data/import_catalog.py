@@ -0,0 +1,56 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections.abc import AsyncIterator
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.cache.result_cache import result_cache
+from app.db.session import AsyncSessionLocal
+from app.rest.repository.imports import get_import_crud
+from app.rest.schemas.imports import ImportFormat, ImportReport
+from app.rest.services.imports import ImportService
+
+READ_SIZE = 1024 * 1024
+
+
+async def read_file(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as import_file:
+        while chunk := import_file.read(READ_SIZE):
+            yield chunk
+
+
+async def import_catalog(path: str, format: ImportFormat, chunk_size: int | None):
+    started = time.perf_counter()
+
+    def print_progress(report: ImportReport):
+        print(f"Chunk {report.chunks}: {report.rows} rows staged ({time.perf_counter() - started:.1f}s)")
+
+    async with AsyncSessionLocal() as db:
+        print(f"\nImporting {path}...")
+        service = ImportService(db=db, crud=get_import_crud(), cache=result_cache)
+        report = await service.import_catalog(read_file(path), format, chunk_size=chunk_size, on_progress=print_progress)
+        await db.commit()
+        await result_cache.flush_invalidations(db)
+
+    print(f"\nImported {report.rows} rows in {time.perf_counter() - started:.1f}s, skipped {report.skipped}")
+    print(f"Created {report.movies} movies, {report.directors} directors, {report.genres} genres and {report.associations} genre links")
+    for error in report.errors:
+        print(f"  {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import movies from a CSV or NDJSON file")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=[f.value for f in ImportFormat], help="defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args()
+
+    format = ImportFormat(args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv"))
+    asyncio.run(import_catalog(args.path, format, args.chunk_size))
+
+
+if __name__ == "__main__":
+    main()
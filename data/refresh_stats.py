@@ -0,0 +1,26 @@
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from app.db.routing import use_primary
+from app.db.session import AsyncSessionLocal
+from app.rest.repository.stats import get_stats_crud
+from app.rest.services.stats import StatsService
+
+
+async def refresh_stats():
+    async with AsyncSessionLocal() as db:
+        use_primary(db)
+        report = await StatsService(db=db, crud=get_stats_crud()).refresh()
+        await db.commit()
+
+    if report.refreshed:
+        print(f"\nStats refreshed at {report.refreshed_at}")
+    else:
+        print("\nStats are being refreshed by another process")
+
+
+if __name__ == "__main__":
+    asyncio.run(refresh_stats())